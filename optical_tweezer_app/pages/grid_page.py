@@ -3,7 +3,6 @@ from PySide6.QtWidgets import (
     QGraphicsScene, QSpinBox,
     QPushButton, QHBoxLayout
 )
-from PySide6.QtGui import QPen, QColor
 from PySide6.QtCore import Qt
 
 from widgets.grid_view import GridView
@@ -88,41 +87,8 @@ class GridPage(QWidget):
 
         self.scene.setSceneRect(0, 0, width, height)
 
-        box_pen = QPen(Qt.white)
-        box_pen.setWidth(2)
-        self.scene.addRect(0, 0, width, height, box_pen)
-
-        grid_spacing = 128
-        grid_pen = QPen(QColor(150, 150, 150, 80))
-
-        center_x = width / 2
-        center_y = height / 2
-
-        x = center_x
-        while x <= width:
-            self.scene.addLine(x, 0, x, height, grid_pen)
-            x += grid_spacing
-
-        x = center_x - grid_spacing
-        while x >= 0:
-            self.scene.addLine(x, 0, x, height, grid_pen)
-            x -= grid_spacing
-
-        y = center_y
-        while y <= height:
-            self.scene.addLine(0, y, width, y, grid_pen)
-            y += grid_spacing
-
-        y = center_y - grid_spacing
-        while y >= 0:
-            self.scene.addLine(0, y, width, y, grid_pen)
-            y -= grid_spacing
-
-        center_pen = QPen(Qt.red)
-        center_pen.setWidth(2)
-        self.scene.addLine(center_x, 0, center_x, height, center_pen)
-        self.scene.addLine(0, center_y, width, center_y, center_pen)
-
+        # border, grid and centre lines are the view's cached background
+        self.view.set_frame_size(width, height)
         self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
 
     def resizeEvent(self, event):
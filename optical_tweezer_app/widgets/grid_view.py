@@ -1,9 +1,11 @@
 from PySide6.QtWidgets import QGraphicsView, QGraphicsEllipseItem
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QBrush, QColor
+from PySide6.QtCore import Qt, QLineF, QRectF
+from PySide6.QtGui import QBrush, QColor, QPen, QPainter, QPixmap
 
 from utils.coordinate_utils import to_centered_coordinates
 
+GRID_SPACING = 128
+
 
 class GridView(QGraphicsView):
     def __init__(self, scene, grid_page):
@@ -11,6 +13,83 @@ class GridView(QGraphicsView):
         self.grid_page = grid_page
         self.setMouseTracking(True)
 
+        self.frame_size = None
+        self.background = None
+        self.background_key = None
+
+    def set_frame_size(self, width, height):
+        self.frame_size = (width, height)
+        self.background_key = None
+        self.viewport().update()
+
+    # Grid lines are painted from a pixmap rendered once per view
+    # transform instead of being one scene item each. Same code as
+    # v2_test/widgets/grid_view.py; the two apps are separate trees
+    # with no shared package, so keep both copies in step.
+    def drawBackground(self, painter, rect):
+        if self.frame_size is None:
+            return super().drawBackground(painter, rect)
+
+        t = self.viewportTransform()
+        ratio = self.devicePixelRatioF()
+        key = (t.m11(), t.m12(), t.m21(), t.m22(), t.dx(), t.dy(),
+               self.viewport().size().toTuple(), ratio, self.frame_size)
+        if key != self.background_key:
+            self.background = self.render_background(ratio)
+            self.background_key = key
+
+        target = QRectF(self.mapFromScene(rect).boundingRect())
+        source = QRectF(target.x() * ratio, target.y() * ratio,
+                        target.width() * ratio, target.height() * ratio)
+
+        painter.save()
+        painter.resetTransform()
+        painter.drawPixmap(target, self.background, source)
+        painter.restore()
+
+    def render_background(self, ratio):
+        viewport = self.viewport()
+        pixmap = QPixmap(viewport.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(viewport.palette().color(viewport.backgroundRole()))
+
+        width, height = self.frame_size
+        center_x = width / 2
+        center_y = height / 2
+
+        painter = QPainter(pixmap)
+        painter.setTransform(self.viewportTransform())
+
+        lines = []
+        for k in range(int(max(center_x, center_y) // GRID_SPACING) + 1):
+            d = k * GRID_SPACING
+            for x in {center_x - d, center_x + d}:
+                if 0 <= x <= width:
+                    lines.append(QLineF(x, 0, x, height))
+            for y in {center_y - d, center_y + d}:
+                if 0 <= y <= height:
+                    lines.append(QLineF(0, y, width, y))
+        grid_pen = QPen(QColor(150, 150, 150, 80))
+        grid_pen.setCosmetic(True)
+        painter.setPen(grid_pen)
+        painter.drawLines(lines)
+
+        box_pen = QPen(Qt.white)
+        box_pen.setWidth(2)
+        box_pen.setCosmetic(True)
+        painter.setPen(box_pen)
+        painter.drawRect(QRectF(0, 0, width, height))
+
+        center_pen = QPen(Qt.red)
+        center_pen.setWidth(2)
+        center_pen.setCosmetic(True)
+        painter.setPen(center_pen)
+        painter.drawLine(QLineF(center_x, 0, center_x, height))
+        painter.drawLine(QLineF(0, center_y, width, center_y))
+
+        painter.end()
+        return pixmap
+
     def mouseMoveEvent(self, event):
         pos = self.mapToScene(event.pos())
 
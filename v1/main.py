@@ -7,14 +7,41 @@ Place mainwindow.ui in the same folder as this script.
 """
 
 import sys
+import time
+
+_T_START = time.perf_counter()
+
+import hashlib
+import json
+from collections import OrderedDict
 from pathlib import Path
 import os
 import numpy as np
 from PySide6 import QtWidgets, QtGui, QtCore, QtUiTools
 
+_T_IMPORTS = time.perf_counter()
+
 BASE_DIR = Path(__file__).parent
 UI_FILE = BASE_DIR / "mainwindow.ui"
 
+# GS computation precision: "double" or "single" (float32/complex64)
+GS_PRECISION = "double"
+
+# python main.py --startup-timing (or OT_STARTUP_TIMING=1) prints the
+# time spent on imports, window construction and the first hologram
+STARTUP_TIMING = "--startup-timing" in sys.argv or bool(os.environ.get("OT_STARTUP_TIMING"))
+
+
+def startup_log(name, start=None):
+    """
+    Print `name` with the time since launch (and since `start`).
+    """
+    if not STARTUP_TIMING:
+        return
+    now = time.perf_counter()
+    took = "" if start is None else f"  ({(now - start) * 1000:.1f} ms)"
+    print(f"[startup] {(now - _T_START) * 1000:8.1f} ms  {name}{took}", file=sys.stderr)
+
 if not UI_FILE.exists():
     raise FileNotFoundError(f"UI file not found at: {UI_FILE.resolve()}")
 
@@ -101,16 +128,27 @@ class GridWidget(QtWidgets.QWidget):
 
 
 # ---------------- GS algorithm (adapted) ----------------
-def run_gs_algorithm(N=400, n_iters=200, f0=5):
+def run_gs_algorithm(N=400, n_iters=200, f0=5, callback=None, corr_every=5, tol=None,
+                     precision="double"):
     """
     Runs the Gerchberg-Saxton loop as in the user's script.
+    callback(done, n_iters) is called after each iteration; returning
+    False stops the loop early.
+    The correlation monitor reuses the forward field of the iteration and
+    runs every corr_every iterations; with tol the loop stops once the
+    correlation improves by less than tol between two samples.
+    precision "single" keeps every array float32/complex64 (numpy >= 2
+    runs the FFT in single precision too); "double" is the default.
     Returns:
       A_source: source amplitude (N x N, normalized)
       I_target: target intensity (N x N, normalized)
       phase_retrieved: retrieved phase (radians, range -pi..pi)
       I_result: final output intensity from retrieved phase (normalized)
+      corr_history: sampled correlations (one per corr_every iterations)
+      stop_reason: "converged", "max_iterations" or "cancelled"
     """
-    x = np.linspace(-1, 1, N)
+    real = np.float32 if precision == "single" else np.float64
+    x = np.linspace(-1, 1, N, dtype=real)
     X, Y = np.meshgrid(x, x)
 
     # Source amplitude
@@ -134,11 +172,28 @@ def run_gs_algorithm(N=400, n_iters=200, f0=5):
     U = A_source * np.exp(1j * phase_init)
 
     corr_history = []
+    stop_reason = "max_iterations"
+
+    # Target statistics for the correlation monitor (computed once)
+    t_dev = I_target.ravel() - I_target.mean()
+    t_norm = np.sqrt(np.dot(t_dev, t_dev))
 
     for i in range(n_iters):
         # Forward propagation
         U_f = np.fft.fftshift(np.fft.fft2(U))
 
+        # Correlation (monitor) of the current iterate, from the forward
+        # field we already have instead of an extra fft2 + corrcoef
+        if i % corr_every == 0:
+            I_test = np.abs(U_f) ** 2
+            i_dev = I_test.ravel() - I_test.mean()
+            corr = np.dot(i_dev, t_dev) / (np.sqrt(np.dot(i_dev, i_dev)) * t_norm)
+            corr_history.append(corr)
+
+            if tol is not None and len(corr_history) > 1 and corr_history[-1] - corr_history[-2] < tol:
+                stop_reason = "converged"
+                break
+
         # Enforce target amplitude (GS)
         U_f = A_target * np.exp(1j * np.angle(U_f))
 
@@ -148,13 +203,9 @@ def run_gs_algorithm(N=400, n_iters=200, f0=5):
         # Enforce source amplitude
         U = A_source * np.exp(1j * np.angle(U))
 
-        # Correlation (monitor)
-        U_test_f = np.fft.fftshift(np.fft.fft2(U))
-        I_test = np.abs(U_test_f) ** 2
-        I_test = I_test / I_test.max()
-
-        corr = np.corrcoef(I_test.ravel(), (I_target / I_target.max()).ravel())[0, 1]
-        corr_history.append(corr)
+        if callback is not None and callback(i + 1, n_iters) is False:
+            stop_reason = "cancelled"
+            break
 
     # Retrieved phase
     phase_retrieved = np.angle(U)
@@ -165,7 +216,127 @@ def run_gs_algorithm(N=400, n_iters=200, f0=5):
     I_result = np.abs(U_test_f) ** 2
     I_result = I_result / I_result.max()
 
-    return A_source, I_target, phase_retrieved, I_result, corr_history
+    return A_source, I_target, phase_retrieved, I_result, corr_history, stop_reason
+
+
+# ---------------- GS result cache ----------------
+class GSResultCache:
+    """
+    Cache of run_gs_algorithm results keyed by a hash of its parameters.
+    Keeps max_entries results in an in-memory LRU and, when cache_dir is
+    given, compressed .npz copies on disk that survive restarts.
+    """
+    def __init__(self, max_entries=8, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(params):
+        blob = json.dumps(params, sort_keys=True).encode()
+        return hashlib.sha256(blob).hexdigest()
+
+    def get(self, params):
+        key = self.make_key(params)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        result = self._load(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.disk_hits += 1
+        self._remember(key, result)
+        return result
+
+    def put(self, params, result):
+        # cancelled runs are partial, never cache them
+        if result[-1] == "cancelled":
+            return
+        key = self.make_key(params)
+        self._remember(key, result)
+        if self.cache_dir is not None:
+            A_source, I_target, phase_retrieved, I_result, corr_history, stop_reason = result
+            tmp = self.cache_dir / (key + ".tmp")
+            with open(tmp, "wb") as f:
+                np.savez_compressed(
+                    f, A_source=A_source, I_target=I_target,
+                    phase_retrieved=phase_retrieved, I_result=I_result,
+                    corr_history=np.asarray(corr_history), stop_reason=stop_reason)
+            os.replace(tmp, self.cache_dir / (key + ".npz"))
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits,
+                "misses": self.misses, "entries": len(self._memory)}
+
+    def _remember(self, key, result):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key):
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / (key + ".npz")
+        if not path.exists():
+            return None
+        try:
+            with np.load(path) as d:
+                return (d["A_source"], d["I_target"], d["phase_retrieved"], d["I_result"],
+                        list(d["corr_history"]), str(d["stop_reason"]))
+        except (OSError, KeyError, ValueError):
+            return None
+
+
+# ---------------- GS worker (runs off the GUI thread) ----------------
+class GSWorker(QtCore.QObject):
+    """
+    Runs run_gs_algorithm on a QThread.
+    Progress is emitted at most every min_interval seconds as
+    (percent, eta_seconds); cancel() stops the loop at the next iteration.
+    """
+    progress = QtCore.Signal(int, float)
+    finished = QtCore.Signal(object)
+    cancelled = QtCore.Signal()
+
+    def __init__(self, min_interval=0.1, **gs_kwargs):
+        super().__init__()
+        self.gs_kwargs = gs_kwargs
+        self.min_interval = min_interval
+        self._cancel = False
+        self._start = 0.0
+        self._last_emit = 0.0
+
+    def cancel(self):
+        self._cancel = True
+
+    @QtCore.Slot()
+    def run(self):
+        self._start = time.perf_counter()
+        result = run_gs_algorithm(callback=self._on_iteration, **self.gs_kwargs)
+        if self._cancel:
+            self.cancelled.emit()
+        else:
+            self.finished.emit(result)
+
+    def _on_iteration(self, done, total):
+        if self._cancel:
+            return False
+        now = time.perf_counter()
+        if done < total and now - self._last_emit < self.min_interval:
+            return True
+        self._last_emit = now
+        eta = (now - self._start) / done * (total - done)
+        self.progress.emit(int(done / total * 100), eta)
+        return True
 
 
 # ---------------- Helpers: convert numpy arrays to QPixmap ----------------
@@ -193,21 +364,88 @@ def array_to_qpixmap_gray(arr):
     return QtGui.QPixmap.fromImage(qimg)
 
 
+# SLM phase -> grey calibration: grey level of each of len(PHASE_LUT)
+# equal phase steps starting at -pi. Linear = ideal 8-bit SLM; replace
+# with the device LUT (e.g. np.loadtxt(...)[:, -1].astype(np.uint8)).
+PHASE_LUT = np.arange(256, dtype=np.uint8)
+
+
+def phase_to_uint8(phase_array, lut=PHASE_LUT, out=None):
+    """
+    Map phase (radians) to SLM grey levels: phase -> LUT index -> grey.
+    Phase wraps every 2*pi; the result goes into `out` (uint8) if given.
+    """
+    size = len(lut)
+    index = np.multiply(phase_array, size / (2 * np.pi), dtype=np.float32)
+    index += size / 2 + 0.5
+    index = index.astype(np.intp)
+    np.remainder(index, size, out=index)
+    return np.take(lut, index, out=out)
+
+
 def phase_to_qpixmap(phase_array):
     """
-    Convert phase (radians) to grayscale image by mapping phase to 0..1.
-    phase in [-pi, pi] -> (phase + pi) / (2*pi)
+    Convert phase (radians) to a grayscale QPixmap of the SLM grey levels.
+    phase in [-pi, pi] -> PHASE_LUT (linear: 0..255)
     """
     if phase_array is None:
         return None
-    mapped = (phase_array + np.pi) / (2 * np.pi)
-    return array_to_qpixmap_gray(mapped)
+    a8 = phase_to_uint8(phase_array)
+    h, w = a8.shape
+    # fromImage copies the pixels, so the QImage can wrap a8 directly
+    qimg = QtGui.QImage(a8.data, w, h, w, QtGui.QImage.Format_Grayscale8)
+    return QtGui.QPixmap.fromImage(qimg)
+
+
+class PixmapPyramid:
+    """
+    Preview pyramid of one full-resolution pixmap: halved copies, built
+    once per result, plus the last few smoothly scaled label-size pixmaps.
+    """
+
+    def __init__(self, pixmap, min_size=128, cached_sizes=4):
+        self.levels = [pixmap]
+        while min(pixmap.width(), pixmap.height()) >= 2 * min_size:
+            pixmap = pixmap.scaled(pixmap.width() // 2, pixmap.height() // 2,
+                                   QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+            self.levels.append(pixmap)
+        self._scaled = OrderedDict()
+        self._cached_sizes = cached_sizes
+
+    def scaled(self, size, smooth=True):
+        """
+        Pixmap fitting `size`, scaled from the smallest level that is still
+        large enough. Smooth results are cached per size.
+        """
+        key = (size.width(), size.height())
+        if key in self._scaled:
+            self._scaled.move_to_end(key)
+            return self._scaled[key]
+
+        source = self.levels[0]
+        for level in self.levels[1:]:
+            if level.width() < size.width() and level.height() < size.height():
+                break
+            source = level
+
+        mode = QtCore.Qt.SmoothTransformation if smooth else QtCore.Qt.FastTransformation
+        pm = source.scaled(size, QtCore.Qt.KeepAspectRatio, mode)
+        if smooth:
+            self._scaled[key] = pm
+            if len(self._scaled) > self._cached_sizes:
+                self._scaled.popitem(last=False)
+        return pm
+
+
+# smooth rescale of the image panels once resizing has been quiet this long
+RESIZE_SETTLE_MS = 150
 
 
 # ---------------- UI Controller ----------------
 class UIController(QtCore.QObject):
     def __init__(self, ui_path: Path):
         super().__init__()
+        t = time.perf_counter()
         loader = QtUiTools.QUiLoader()
         ui_file = QtCore.QFile(str(ui_path))
         if not ui_file.open(QtCore.QFile.ReadOnly):
@@ -227,14 +465,27 @@ class UIController(QtCore.QObject):
             self.window = QtWidgets.QMainWindow()
             self.window.setCentralWidget(self.loaded)
             self.ui = self.loaded
+        startup_log("load UI file", t)
 
+        t = time.perf_counter()
+        self._gs_cache = GSResultCache(cache_dir=BASE_DIR / "gs_cache")
         self._find_widgets()
         self._setup_grid()
-        # Run GS algorithm once at startup (can be triggered later if desired)
-        self._run_gs_and_prepare_pixmaps()
         self._setup_images()
         self._setup_start_progress()
+        # resize events rescale fast; the smooth rescale waits for the size to settle
+        self._resize_timer = QtCore.QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_SETTLE_MS)
+        self._resize_timer.timeout.connect(self.update_all_images)
         self.window.installEventFilter(self)
+        startup_log("set up widgets", t)
+
+        # Run GS algorithm once at startup, after the window is shown:
+        # a cache hit appears at once, otherwise the worker thread fills
+        # in the images while the window stays responsive
+        self._first_result = True
+        QtCore.QTimer.singleShot(0, self._run_gs_and_prepare_pixmaps)
 
     def _find_widgets(self):
         self.grid_placeholder = self.ui.findChild(QtWidgets.QWidget, "gridPlaceholder")
@@ -279,13 +530,45 @@ class UIController(QtCore.QObject):
         """
         Run the GS algorithm and prepare QPixmaps for center (target intensity)
         and right (retrieved phase). Also keep final GS output intensity if needed.
+        Cache hits show up immediately; otherwise GS runs on a worker thread.
         """
+        params = self._gs_params()
+        cached = self._gs_cache.get(params)
+        if cached is not None:
+            self._apply_gs_result(cached)
+            self.update_all_images()
+            if self.progress_bar:
+                self.progress_bar.setValue(100)
+            return
+
+        worker = GSWorker(**params)
+        self._gs_running_params = params
+        thread = QtCore.QThread(self)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_gs_progress)
+        worker.finished.connect(self._on_gs_finished)
+        worker.cancelled.connect(self._on_gs_stopped)
+        worker.finished.connect(thread.quit)
+        worker.cancelled.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.finished.connect(self._on_gs_thread_finished)
+
+        self._gs_worker = worker
+        self._gs_thread = thread
+        if self.switch_button:
+            self.switch_button.setText("Cancel")
+        if self.progress_bar:
+            self.progress_bar.setValue(0)
+        thread.start()
+
+    def _gs_params(self):
         # Parameters can be adjusted or exposed in UI
-        N = 400
-        n_iters = 200
-        f0 = 5
+        return dict(N=400, n_iters=200, f0=5, tol=1e-5, precision=GS_PRECISION)
 
-        A_source, I_target, phase_retrieved, I_result, corr_history = run_gs_algorithm(N=N, n_iters=n_iters, f0=f0)
+    def _apply_gs_result(self, result):
+        A_source, I_target, phase_retrieved, I_result, corr_history, stop_reason = result
 
         # Save arrays for potential later use
         self._A_source = A_source
@@ -293,6 +576,7 @@ class UIController(QtCore.QObject):
         self._phase_retrieved = phase_retrieved
         self._I_result = I_result
         self._corr_history = corr_history
+        self._gs_stop_reason = stop_reason
 
         # Convert to QPixmaps (grayscale)
         self._center_pixmap_full = array_to_qpixmap_gray(I_target)          # center: target intensity
@@ -300,10 +584,21 @@ class UIController(QtCore.QObject):
         # Optionally store final output intensity pixmap if needed
         self._final_output_pixmap_full = array_to_qpixmap_gray(I_result)
 
+        # downsampled previews for the panels, built once per result
+        self._center_pyramid = PixmapPyramid(self._center_pixmap_full)
+        self._right_pyramid = PixmapPyramid(self._right_pixmap_full)
+
+        if self._first_result:
+            self._first_result = False
+            startup_log("first hologram ready")
+
     def _setup_images(self):
         # Connect switch button to cycle center image through center pixmaps.
         # In this integration, center cycles through a list of target intensities if desired.
         # For now we have a single target intensity; clicking will re-run GS and update center.
+        self._gs_worker = None
+        self._gs_thread = None
+        self._switch_text = self.switch_button.text() if self.switch_button else ""
         if self.switch_button:
             self.switch_button.clicked.connect(self.on_switch)
 
@@ -350,20 +645,58 @@ class UIController(QtCore.QObject):
         (or advance through multiple prepared center images if you prepare more).
         Here we re-run GS to demonstrate updating the center image while keeping
         the right image as the retrieved phase from the latest run.
+        The run happens on a worker thread; while it runs the button cancels it.
         """
-        # Re-run GS (this is potentially heavy; consider running in a worker thread for responsiveness)
+        if self._gs_worker is not None:
+            self._gs_worker.cancel()
+            return
+
         self._run_gs_and_prepare_pixmaps()
+
+    def _on_gs_progress(self, percent, eta):
+        if self.progress_bar:
+            self.progress_bar.setValue(percent)
+            self.progress_bar.setFormat(f"%p%  ETA {eta:.1f} s")
+
+    def _on_gs_finished(self, result):
+        self._gs_cache.put(self._gs_running_params, result)
+        self._apply_gs_result(result)
         self.update_all_images()
+        self._on_gs_stopped()
+        if self.progress_bar:
+            self.progress_bar.setValue(100)
+
+    def _on_gs_thread_finished(self):
+        self._gs_thread = None
+
+    def _stop_gs_thread(self):
+        """
+        Cancel a running GS worker and wait for its thread to end, so
+        closing the window does not destroy a running QThread.
+        """
+        if self._gs_thread is None:
+            return
+        if self._gs_worker is not None:
+            self._gs_worker.cancel()
+        self._gs_thread.requestInterruption()
+        self._gs_thread.quit()
+        self._gs_thread.wait()
+        self._gs_thread = None
+
+    def _on_gs_stopped(self):
+        self._gs_worker = None
+        if self.switch_button:
+            self.switch_button.setText(self._switch_text)
+        if self.progress_bar:
+            self.progress_bar.setFormat("%p%")
 
     def update_all_images(self):
         """
         Set center and right label pixmaps. Scale pixmaps to label size to avoid distortion.
         """
         # center
-        if hasattr(self, "_center_pixmap_full") and self._center_pixmap_full is not None and self.center_label is not None:
-            pm = self._center_pixmap_full
-            scaled = pm.scaled(self.center_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            self.center_label.setPixmap(scaled)
+        if getattr(self, "_center_pyramid", None) is not None and self.center_label is not None:
+            self.center_label.setPixmap(self._center_pyramid.scaled(self.center_label.size()))
             self.center_label.setAlignment(QtCore.Qt.AlignCenter)
             self.center_label.setStyleSheet("")
         else:
@@ -373,10 +706,8 @@ class UIController(QtCore.QObject):
                 self.center_label.setAlignment(QtCore.Qt.AlignCenter)
 
         # right
-        if hasattr(self, "_right_pixmap_full") and self._right_pixmap_full is not None and self.right_label is not None:
-            pm = self._right_pixmap_full
-            scaled = pm.scaled(self.right_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-            self.right_label.setPixmap(scaled)
+        if getattr(self, "_right_pyramid", None) is not None and self.right_label is not None:
+            self.right_label.setPixmap(self._right_pyramid.scaled(self.right_label.size()))
             self.right_label.setAlignment(QtCore.Qt.AlignCenter)
             self.right_label.setStyleSheet("")
         else:
@@ -392,16 +723,16 @@ class UIController(QtCore.QObject):
             self.title_right.setText("Right: Retrieved Phase")
 
     def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Close:
+            self._stop_gs_thread()
         if event.type() == QtCore.QEvent.Resize:
-            # rescale center and right images on resize
-            if hasattr(self, "_center_pixmap_full") and self._center_pixmap_full is not None and self.center_label is not None:
-                pm = self._center_pixmap_full
-                scaled = pm.scaled(self.center_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                self.center_label.setPixmap(scaled)
-            if hasattr(self, "_right_pixmap_full") and self._right_pixmap_full is not None and self.right_label is not None:
-                pm = self._right_pixmap_full
-                scaled = pm.scaled(self.right_label.size(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                self.right_label.setPixmap(scaled)
+            # quick rescale of center and right images from the preview pyramid;
+            # the smooth one follows once resizing stops
+            if getattr(self, "_center_pyramid", None) is not None and self.center_label is not None:
+                self.center_label.setPixmap(self._center_pyramid.scaled(self.center_label.size(), smooth=False))
+            if getattr(self, "_right_pyramid", None) is not None and self.right_label is not None:
+                self.right_label.setPixmap(self._right_pyramid.scaled(self.right_label.size(), smooth=False))
+            self._resize_timer.start()
         return False
 
     def show(self):
@@ -410,11 +741,18 @@ class UIController(QtCore.QObject):
 
 # ---------------- main ----------------
 def main():
+    if STARTUP_TIMING:
+        print(f"[startup] {(_T_IMPORTS - _T_START) * 1000:8.1f} ms  imports (numpy, PySide6)",
+              file=sys.stderr)
     app = QtWidgets.QApplication(sys.argv)
     app.setOrganizationName("MyCompany")
     app.setApplicationName("GSImageApp")
+    t = time.perf_counter()
     controller = UIController(UI_FILE)
+    startup_log("UIController", t)
     controller.show()
+    # fires once the event loop has shown the window
+    QtCore.QTimer.singleShot(0, lambda: startup_log("first window shown"))
     sys.exit(app.exec())
 
 
@@ -3,24 +3,57 @@ import os
 
 
 class AppState:
-    def __init__(self):
+    def __init__(self, config_path="config.json"):
         # Camera parameters
         self.cam_res_x = 1024
         self.cam_res_y = 1024
         self.cam_pixel_size = 1.0
 
+        # Camera driver (core.camera.DRIVERS) and acquisition rate
+        self.camera_driver = "simulated"
+        self.camera_fps = 100.0
+
         # SLM parameters
         self.slm_res_x = 1024
         self.slm_res_y = 1024
         self.slm_pixel_size = 8.0
 
+        # SLM phase → grey calibration: LUT file ("" = linear LUT that
+        # reaches 2π at grey level slm_wrap) and ordered dithering
+        self.slm_lut = ""
+        self.slm_wrap = 256
+        self.slm_dither = False
+
+        # screen index of the SLM output window (-1 = last screen)
+        self.slm_screen = -1
+
         # Clicked points from grid (centered coordinates)
         self.clicked_points = []
 
         # Alias used by GS page (same list)
         self.trap_positions = self.clicked_points
 
-        self.config_path = "config.json"
+        # Gratings-and-lenses hologram of clicked_points (set by GridPage)
+        self.superposition = None
+
+        self.config_path = config_path
+
+        # On-disk tier of the hologram cache
+        self.cache_dir = "hologram_cache"
+
+        # Experiment recordings (one timestamped directory per session)
+        self.record_dir = "recordings"
+
+        # Seed for random GS starts; fixed so results are cacheable
+        self.gs_seed = 0
+
+        # Hologram computation precision: "double" or "single"
+        self.precision = "double"
+
+        # GS transform grid: zero padding factor per axis (finer trap
+        # placement than the SLM pitch) and rounding to fast FFT sizes
+        self.oversample = 1.0
+        self.fft_fast_len = True
 
         self.load_defaults()
 
@@ -29,9 +62,18 @@ class AppState:
             "cam_res_x": self.cam_res_x,
             "cam_res_y": self.cam_res_y,
             "cam_pixel_size": self.cam_pixel_size,
+            "camera_driver": self.camera_driver,
+            "camera_fps": self.camera_fps,
             "slm_res_x": self.slm_res_x,
             "slm_res_y": self.slm_res_y,
             "slm_pixel_size": self.slm_pixel_size,
+            "slm_lut": self.slm_lut,
+            "slm_wrap": self.slm_wrap,
+            "slm_dither": self.slm_dither,
+            "slm_screen": self.slm_screen,
+            "precision": self.precision,
+            "oversample": self.oversample,
+            "fft_fast_len": self.fft_fast_len,
         }
 
     def save_defaults(self):
@@ -46,7 +88,17 @@ class AppState:
             self.cam_res_x = data.get("cam_res_x", self.cam_res_x)
             self.cam_res_y = data.get("cam_res_y", self.cam_res_y)
             self.cam_pixel_size = data.get("cam_pixel_size", self.cam_pixel_size)
+            self.camera_driver = data.get("camera_driver", self.camera_driver)
+            self.camera_fps = data.get("camera_fps", self.camera_fps)
 
             self.slm_res_x = data.get("slm_res_x", self.slm_res_x)
             self.slm_res_y = data.get("slm_res_y", self.slm_res_y)
-            self.slm_pixel_size = data.get("slm_pixel_size", self.slm_pixel_size)
\ No newline at end of file
+            self.slm_pixel_size = data.get("slm_pixel_size", self.slm_pixel_size)
+            self.slm_lut = data.get("slm_lut", self.slm_lut)
+            self.slm_wrap = data.get("slm_wrap", self.slm_wrap)
+            self.slm_dither = data.get("slm_dither", self.slm_dither)
+            self.slm_screen = data.get("slm_screen", self.slm_screen)
+
+            self.precision = data.get("precision", self.precision)
+            self.oversample = data.get("oversample", self.oversample)
+            self.fft_fast_len = data.get("fft_fast_len", self.fft_fast_len)
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+Headless benchmarks for the hologram pipeline.
+
+Runs canonical scenarios (SLM size x trap count x init x precision,
+plus v1 run_gs_algorithm) without opening any window and writes the
+results as JSON; compare flags regressions against a stored baseline.
+
+    python -m core.benchmark run --out bench.json
+    python -m core.benchmark run --quick --out bench.json
+    python -m core.benchmark compare baseline.json bench.json
+
+Each scenario reports ms/iteration, total time-to-hologram (target,
+beam, init mask, iterations and result), peak traced memory of a cold
+run and the resulting trap uniformity.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from core import gs_algorithm as gs
+from core.metrics import uniformity
+
+SIZES = (512, 1024, 2048, 4096)
+TRAP_COUNTS = (1, 10, 100, 1000)
+ALGORITHMS = ("gs", "gsw", "v1")
+
+QUICK = dict(sizes=(512, 1024), traps=(1, 100), iterations=(20,))
+
+V1_MAIN = Path(__file__).resolve().parents[2] / "v1" / "main.py"
+
+
+def trap_layout(n_traps, nx, ny, seed=0):
+    """
+    Reproducible layout of distinct traps inside the central half of
+    the focal plane, in AppState.clicked_points coordinates.
+    """
+    rng = np.random.default_rng(seed)
+    w = nx // 4
+    h = ny // 4
+    cells = rng.choice((2 * w) * (2 * h), size=n_traps, replace=False)
+    xs = cells % (2 * w) - w
+    ys = cells // (2 * w) - h
+    return [(int(x), int(y)) for x, y in zip(xs, ys)]
+
+
+def scenarios(sizes=SIZES, traps=TRAP_COUNTS, inits=("grating", "random"),
+              iterations=(20,), precisions=("double",), algorithms=("gs", "v1")):
+    """
+    Scenario dicts for every combination; names are stable keys for
+    compare.
+    """
+    runs = []
+    for n in sizes:
+        for iters in iterations:
+            for precision in precisions:
+                if "gs" in algorithms:
+                    for init in inits:
+                        for k in traps:
+                            runs.append(dict(
+                                name=f"gs-{init}-{precision}-{n}px-{k}t-{iters}it",
+                                algorithm="gs", size=n, traps=k, init=init,
+                                iterations=iters, precision=precision,
+                            ))
+                if "gsw" in algorithms:
+                    for k in traps:
+                        runs.append(dict(
+                            name=f"gsw-{precision}-{n}px-{k}t-{iters}it",
+                            algorithm="gsw", size=n, traps=k, init="superposition",
+                            iterations=iters, precision=precision,
+                        ))
+                if "v1" in algorithms:
+                    runs.append(dict(
+                        name=f"v1-{precision}-{n}px-{iters}it",
+                        algorithm="v1", size=n, traps=None, init="sine",
+                        iterations=iters, precision=precision,
+                    ))
+    return runs
+
+
+_v1 = None
+
+
+def _load_v1():
+    global _v1
+    if _v1 is None:
+        spec = importlib.util.spec_from_file_location("v1_main", V1_MAIN)
+        _v1 = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_v1)
+    return _v1
+
+
+def _hologram(run):
+    """
+    One time-to-hologram; returns (iteration seconds, uniformity).
+    """
+    n = run["size"]
+    iterations = run["iterations"]
+    precision = run["precision"]
+
+    if run["algorithm"] == "v1":
+        v1 = _load_v1()
+        start = time.perf_counter()
+        v1.run_gs_algorithm(N=n, n_iters=iterations, precision=precision)
+        return time.perf_counter() - start, None
+
+    traps = trap_layout(run["traps"], n, n)
+    source = gs.gaussian_beam(n, n, precision=precision)
+    target = gs.traps_to_target(traps, n, n, precision)
+
+    if run["algorithm"] == "gsw":
+        start = time.perf_counter()
+        intensity, _ = gs.weighted_gerchberg_saxton(source, target, iterations, seed=0)
+        return time.perf_counter() - start, uniformity(intensity, target)
+
+    engine = gs.get_engine(n, n, precision)
+    mask = gs.initial_mask(run["init"], n, n, seed=0, precision=precision)
+
+    start = time.perf_counter()
+    engine.iterate(source, target, iterations, init_mask=mask)
+    elapsed = time.perf_counter() - start
+
+    intensity, _ = engine.result()
+    return elapsed, uniformity(intensity, target)
+
+
+def run_one(run, repeat=3):
+    """
+    Benchmark one scenario and return its result dict.
+
+    The first (cold) run is traced with tracemalloc for peak memory;
+    timings are the best of `repeat` untraced runs.
+    """
+    gs.clear_engines()
+    tracemalloc.start()
+    try:
+        _hologram(run)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best_total = best_iter = None
+    uni = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        iter_s, uni = _hologram(run)
+        total = time.perf_counter() - start
+
+        best_total = total if best_total is None else min(best_total, total)
+        best_iter = iter_s if best_iter is None else min(best_iter, iter_s)
+
+    gs.clear_engines()
+
+    return dict(
+        run,
+        ms_per_iter=round(1000 * best_iter / run["iterations"], 3),
+        total_s=round(best_total, 4),
+        peak_mb=round(peak / 2**20, 2),
+        uniformity=None if uni is None else round(uni, 5),
+    )
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "fft": gs.FFT_BACKEND,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_benchmarks(runs, repeat=3, output=None, progress=None):
+    """
+    Run scenarios in order; writes {"machine": ..., "results": [...]}
+    to `output` after every scenario so partial runs are kept.
+    """
+    report = {"machine": machine_info(), "results": []}
+
+    for i, run in enumerate(runs):
+        if run["algorithm"] == "v1" and importlib.util.find_spec("PySide6") is None:
+            # v1/main.py imports Qt at module level (no window is opened)
+            print(f"skipping {run['name']}: PySide6 not installed")
+            continue
+
+        report["results"].append(run_one(run, repeat))
+
+        if output is not None:
+            with open(output, "w") as f:
+                json.dump(report, f, indent=2)
+        if progress is not None:
+            progress(i + 1, len(runs), report["results"][-1])
+
+    return report
+
+
+# ---------------------
+# regressions
+# ---------------------
+
+def compare(baseline, current, time_tol=0.10, memory_tol=0.10, uniformity_tol=0.01):
+    """
+    Scenario-by-scenario comparison of two benchmark reports.
+
+    Returns a list of (name, field, old, new, regressed) rows. Times and
+    memory regress when they grow by more than the relative tolerance,
+    uniformity when it drops by more than uniformity_tol.
+    """
+    old = {r["name"]: r for r in baseline["results"]}
+    rows = []
+
+    for new in current["results"]:
+        base = old.get(new["name"])
+        if base is None:
+            continue
+
+        for field, tol in (("ms_per_iter", time_tol), ("total_s", time_tol),
+                           ("peak_mb", memory_tol)):
+            regressed = new[field] > base[field] * (1 + tol)
+            rows.append((new["name"], field, base[field], new[field], regressed))
+
+        if base["uniformity"] is not None and new["uniformity"] is not None:
+            regressed = new["uniformity"] < base["uniformity"] - uniformity_tol
+            rows.append((new["name"], "uniformity", base["uniformity"],
+                         new["uniformity"], regressed))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hologram pipeline")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run the benchmark scenarios")
+    run_p.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    run_p.add_argument("--traps", type=int, nargs="+", default=list(TRAP_COUNTS))
+    run_p.add_argument("--iterations", type=int, nargs="+", default=[20])
+    run_p.add_argument("--init", nargs="+", default=list(gs.INIT_STRATEGIES),
+                       choices=gs.INIT_STRATEGIES)
+    run_p.add_argument("--precision", nargs="+", default=["double"],
+                       choices=list(gs.PRECISIONS))
+    run_p.add_argument("--algorithms", nargs="+", default=["gs", "v1"],
+                       choices=ALGORITHMS)
+    run_p.add_argument("--repeat", type=int, default=3)
+    run_p.add_argument("--quick", action="store_true",
+                       help="small sizes and trap counts only")
+    run_p.add_argument("--out", default="benchmark.json")
+
+    cmp_p = sub.add_parser("compare", help="flag regressions against a baseline")
+    cmp_p.add_argument("baseline")
+    cmp_p.add_argument("current")
+    cmp_p.add_argument("--time-tol", type=float, default=0.10)
+    cmp_p.add_argument("--memory-tol", type=float, default=0.10)
+    cmp_p.add_argument("--uniformity-tol", type=float, default=0.01)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        if args.quick:
+            args.sizes = list(QUICK["sizes"])
+            args.traps = list(QUICK["traps"])
+            args.iterations = list(QUICK["iterations"])
+
+        runs = scenarios(args.sizes, args.traps, args.init, args.iterations,
+                         args.precision, args.algorithms)
+
+        def progress(done, total, result):
+            print(
+                f"[{done}/{total}] {result['name']}: "
+                f"{result['ms_per_iter']} ms/it, {result['total_s']} s, "
+                f"{result['peak_mb']} MB, uniformity {result['uniformity']}"
+            )
+
+        run_benchmarks(runs, args.repeat, args.out, progress)
+        print(f"→ {args.out}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.time_tol, args.memory_tol,
+                   args.uniformity_tol)
+
+    regressions = 0
+    for name, field, old, new, regressed in rows:
+        flag = "REGRESSION" if regressed else "ok"
+        print(f"{flag:10} {name:40} {field:12} {old} → {new}")
+        regressions += regressed
+
+    print(f"{regressions} regression(s) in {len(rows)} checks")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,440 @@
+"""
+Camera acquisition: drivers, a frame ring buffer and a producer thread.
+
+    camera = CameraAcquisition(make_driver("simulated", 1024, 1024, fps=120))
+    camera.start()
+    frame = camera.ring.latest()           # newest frame, for display
+    reader = camera.ring.reader()          # every frame, in order
+    frame = reader.get(timeout=1.0)
+    camera.stop()
+
+Frames are views into a preallocated ring; nothing is copied on the
+way to a consumer. The producer overwrites the oldest slot when
+consumers fall behind (they count the frames they missed), so
+acquisition never waits for display or processing.
+
+Hardware drivers subclass CameraDriver and are added with
+register_driver(name, cls).
+"""
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# consecutive driver errors before the producer gives up
+MAX_ERRORS = 10
+
+# pre-noised frames the simulated camera cycles through
+NOISE_FRAMES = 4
+
+CameraFrame = namedtuple("CameraFrame", "number image timestamp")
+
+
+# ---------------------
+# trap ↔ camera mapping
+# ---------------------
+
+class CameraCalibration:
+    """
+    Affine map from trap coordinates (AppState.clicked_points) to
+    camera pixels (column, row): pixel = matrix @ (x, y) + offset.
+    """
+
+    def __init__(self, matrix, offset):
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.offset = np.asarray(offset, dtype=float)
+
+    @classmethod
+    def default(cls, nx, ny, width, height):
+        """
+        Focal plane of an nx x ny SLM filling the camera, centered,
+        trap y pointing up.
+        """
+        s = min(width / nx, height / ny)
+        return cls([[s, 0], [0, -s]], [width / 2, height / 2])
+
+    @classmethod
+    def fit(cls, traps, pixels):
+        """
+        Least-squares calibration from >= 3 measured (trap, pixel) pairs.
+        """
+        traps = np.asarray(traps, dtype=float).reshape(-1, 2)
+        pixels = np.asarray(pixels, dtype=float).reshape(-1, 2)
+        design = np.column_stack([traps, np.ones(len(traps))])
+        solution, *_ = np.linalg.lstsq(design, pixels, rcond=None)
+        return cls(solution[:2].T, solution[2])
+
+    def to_camera(self, traps):
+        traps = np.asarray(traps, dtype=float).reshape(-1, 2)
+        return traps @ self.matrix.T + self.offset
+
+    def to_traps(self, pixels):
+        pixels = np.asarray(pixels, dtype=float).reshape(-1, 2)
+        return (pixels - self.offset) @ np.linalg.inv(self.matrix).T
+
+
+def roi_index(centers, shape, radius):
+    """
+    Flat pixel indices (N, 2r+1, 2r+1) of square windows around camera
+    positions `centers` (column, row), moved inside the image where
+    they would cross its border. Returns (index, origins), origins
+    being the (column, row) of each window's first pixel.
+
+    Camera positions are continuous, as in CameraCalibration: pixel c
+    spans [c, c + 1), its centre is c + 0.5.
+    """
+    h, w = shape
+    size = 2 * radius + 1
+    if size > min(h, w):
+        raise ValueError(f"ROI of {size} px does not fit a {w}x{h} frame")
+
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    origins = np.floor(centers).astype(np.intp) - radius
+    np.clip(origins, 0, (w - size, h - size), out=origins)
+
+    d = np.arange(size)
+    window = d[:, None] * w + d[None, :]
+    first = origins[:, 1] * w + origins[:, 0]
+    return first[:, None, None] + window, origins
+
+
+# ---------------------
+# drivers
+# ---------------------
+
+class CameraDriver:
+    """
+    Interface of a camera driver.
+
+    grab(out) fills the uint8 (height, width) array `out` with the next
+    frame, blocking until it is exposed, and returns its timestamp
+    (time.perf_counter() clock).
+    """
+
+    def __init__(self, width, height, fps=100.0):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self._next_time = None
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def grab(self, out):
+        raise NotImplementedError
+
+    def set_slm_phase(self, phase):
+        """
+        Phase now on the SLM; real cameras see it by themselves.
+        """
+
+    def pace(self):
+        """
+        Sleep until the next frame is due at fps (for software sources;
+        never sleeps to catch up on missed frames).
+        """
+        now = time.perf_counter()
+        if self._next_time is None or now - self._next_time > 1 / self.fps:
+            self._next_time = now
+        delay = self._next_time - now
+        if delay > 0:
+            time.sleep(delay)
+        self._next_time += 1 / self.fps
+
+
+class SimulatedCamera(CameraDriver):
+    """
+    Stand-in camera imaging the focal plane of the current SLM phase
+    (|FFT(beam · e^{iφ})|², as computed by the GS engine) with
+    background and noise, paced at `fps`.
+
+    The focal image is recomputed on the acquisition thread when the
+    phase changes (only the newest phase is used); every frame is then
+    one copy out of a small bank of pre-noised frames, so high frame
+    rates cost almost nothing.
+
+    Unlike the GS model, the image includes the sinc² envelope of the
+    SLM pixel aperture (traps dim away from the zero order) and, with
+    `aberration` > 0, a fixed astigmatism + coma phase error of that
+    many radians, so trap intensities come out uneven as on a real
+    setup.
+    """
+
+    def __init__(self, width, height, fps=100.0, calibration=None,
+                 background=8, noise=3.0, peak=230, aberration=0.0, seed=0):
+        super().__init__(width, height, fps)
+        self.calibration = calibration
+        self.background = background
+        self.noise = noise
+        self.peak = peak
+        self.aberration = aberration
+
+        # fixed noise patterns, added to every new focal image
+        rng = np.random.default_rng(seed)
+        self._noise = rng.normal(0, noise, (NOISE_FRAMES, height, width)).astype(np.float32)
+        self._bank = np.full((NOISE_FRAMES, height, width), background, dtype=np.uint8)
+        self._bank_index = 0
+
+        self._lock = threading.Lock()
+        self._phase = None
+        self._sampling = None
+        self._optics = None
+
+    def set_slm_phase(self, phase):
+        # picked up by the acquisition thread at its next grab
+        with self._lock:
+            self._phase = phase
+
+    def grab(self, out):
+        with self._lock:
+            phase, self._phase = self._phase, None
+        if phase is not None:
+            self._render(phase)
+
+        self.pace()
+        np.copyto(out, self._bank[self._bank_index])
+        self._bank_index = (self._bank_index + 1) % len(self._bank)
+        return time.perf_counter()
+
+    def _render(self, phase):
+        ny, nx = phase.shape
+        beam, envelope = self._optics_for(nx, ny)
+        focal = np.fft.fft2(beam * np.exp(1j * phase))
+        intensity = np.fft.fftshift(np.abs(focal) ** 2)
+        intensity *= envelope
+        intensity /= intensity.max()
+
+        image = intensity[self._sample_index(nx, ny)].astype(np.float32)
+        image *= self.peak - self.background
+        image += self.background
+
+        noisy = np.empty_like(image)
+        for frame, noise in zip(self._bank, self._noise):
+            np.add(image, noise, out=noisy)
+            np.clip(noisy, 0, 255, out=noisy)
+            np.copyto(frame, noisy, casting="unsafe")
+
+    def _optics_for(self, nx, ny):
+        # complex beam (with aberration) and focal envelope per SLM size
+        from core.gs_algorithm import gaussian_beam
+
+        if self._optics is None or self._optics[0] != (nx, ny):
+            x = np.linspace(-1, 1, nx)
+            y = np.linspace(-1, 1, ny)
+            X, Y = np.meshgrid(x, y)
+            r2 = X**2 + Y**2
+            error = self.aberration * (X**2 - Y**2 + (3 * r2 - 2) * X) / 2
+            beam = gaussian_beam(nx, ny) * np.exp(1j * error)
+
+            # focal pixel (r, c) has spatial frequency (c - nx//2) / nx
+            fx = (np.arange(nx) - nx // 2) / nx
+            fy = (np.arange(ny) - ny // 2) / ny
+            envelope = np.outer(np.sinc(fy) ** 2, np.sinc(fx) ** 2)
+            self._optics = ((nx, ny), (beam, envelope))
+        return self._optics[1]
+
+    def _sample_index(self, nx, ny):
+        # focal-plane pixel seen by every camera pixel (nearest neighbour)
+        if self._sampling is None or self._sampling[0] != (nx, ny):
+            calibration = self.calibration or CameraCalibration.default(
+                nx, ny, self.width, self.height
+            )
+            rows, cols = np.mgrid[0:self.height, 0:self.width]
+            pixels = np.column_stack([cols.ravel() + 0.5, rows.ravel() + 0.5])
+            traps = calibration.to_traps(pixels)
+
+            # trap (x, y) sits at focal pixel (nx//2 + x, ny//2 - y)
+            px = np.rint(nx // 2 + traps[:, 0]).astype(np.intp)
+            py = np.rint(ny // 2 - traps[:, 1]).astype(np.intp)
+            np.clip(px, 0, nx - 1, out=px)
+            np.clip(py, 0, ny - 1, out=py)
+            index = (py.reshape(self.height, self.width), px.reshape(self.height, self.width))
+            self._sampling = ((nx, ny), index)
+        return self._sampling[1]
+
+
+DRIVERS = {"simulated": SimulatedCamera}
+
+
+def register_driver(name, cls):
+    DRIVERS[name] = cls
+
+
+def make_driver(name, width, height, **options):
+    try:
+        cls = DRIVERS[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown camera driver {name!r}, expected one of {tuple(DRIVERS)}"
+        ) from None
+    return cls(width, height, **options)
+
+
+# ---------------------
+# ring buffer
+# ---------------------
+
+class FrameRing:
+    """
+    Preallocated ring of `capacity` frames with one writer.
+
+    Frame n lives in slot n % capacity and stays valid until frame
+    n + capacity - 1 is being written; readers only see the newest
+    capacity - 1 frames, so the slot being written is never handed out.
+    """
+
+    def __init__(self, capacity, height, width, dtype=np.uint8):
+        if capacity < 2:
+            raise ValueError("a frame ring needs at least 2 slots")
+        self.capacity = capacity
+        self.frames = np.zeros((capacity, height, width), dtype=dtype)
+        self.timestamps = np.zeros(capacity)
+        self.written = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def write_slot(self):
+        """
+        Array to fill with the next frame; publish it with commit().
+        """
+        return self.frames[self.written % self.capacity]
+
+    def commit(self, timestamp):
+        with self._cond:
+            self.timestamps[self.written % self.capacity] = timestamp
+            self.written += 1
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def frame(self, number):
+        slot = number % self.capacity
+        return CameraFrame(number, self.frames[slot], self.timestamps[slot])
+
+    def is_valid(self, number):
+        """
+        True while frame `number` has not been overwritten.
+        """
+        return self.written - (self.capacity - 1) <= number < self.written
+
+    def latest(self):
+        """
+        Newest frame, or None before the first one.
+        """
+        n = self.written
+        return self.frame(n - 1) if n else None
+
+    def reader(self):
+        return FrameReader(self)
+
+
+class FrameReader:
+    """
+    In-order consumer of a FrameRing, starting at the next frame.
+
+    When the producer laps it, the reader skips to the oldest frame
+    still available and adds the skipped ones to `dropped`.
+    """
+
+    def __init__(self, ring):
+        self.ring = ring
+        self.next = ring.written
+        self.dropped = 0
+
+    def get(self, timeout=None):
+        """
+        Next frame, or None on timeout or once the ring is closed.
+        """
+        ring = self.ring
+        with ring._cond:
+            if not ring._cond.wait_for(
+                lambda: ring.written > self.next or ring.closed, timeout
+            ):
+                return None
+            if ring.written <= self.next:
+                return None
+
+            oldest = ring.written - (ring.capacity - 1)
+            if self.next < oldest:
+                self.dropped += oldest - self.next
+                self.next = oldest
+
+            frame = ring.frame(self.next)
+            self.next += 1
+            return frame
+
+
+# ---------------------
+# acquisition
+# ---------------------
+
+class CameraAcquisition:
+    """
+    Producer thread grabbing frames from a driver into a FrameRing.
+    """
+
+    def __init__(self, driver, capacity=8):
+        self.driver = driver
+        self.ring = FrameRing(capacity, driver.height, driver.width)
+
+        self._thread = None
+        self._running = False
+
+        self.errors = 0
+
+    def start(self):
+        if self._running:
+            return
+        self.driver.open()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.driver.close()
+        self.ring.close()
+
+    def is_running(self):
+        return self._running
+
+    def fps(self):
+        """
+        Mean acquisition rate over the frames in the ring.
+        """
+        ring = self.ring
+        n = min(ring.written, ring.capacity - 1)
+        if n < 2:
+            return 0.0
+        first = ring.timestamps[(ring.written - n) % ring.capacity]
+        last = ring.timestamps[(ring.written - 1) % ring.capacity]
+        return (n - 1) / (last - first) if last > first else 0.0
+
+    def _run(self):
+        failures = 0
+        while self._running:
+            try:
+                timestamp = self.driver.grab(self.ring.write_slot())
+            except Exception as e:
+                self.errors += 1
+                failures += 1
+                print(f"Camera grab failed: {e}")
+                if failures >= MAX_ERRORS:
+                    self._running = False
+                    break
+                time.sleep(0.01)
+                continue
+
+            failures = 0
+            self.ring.commit(timestamp)
+        self.ring.close()
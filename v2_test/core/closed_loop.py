@@ -0,0 +1,199 @@
+"""
+Camera-in-the-loop hologram correction.
+
+GS and GSW equalise traps in the ideal model; aberrations and SLM
+non-idealities make the real traps uneven. Every cycle here shows
+the hologram, measures all trap intensities on camera frames and
+re-weights the trap target amplitudes, then continues GSW from the
+current field (no FFT per cycle: the trap basis of
+weighted_gerchberg_saxton is reused).
+
+    correction = CameraCorrection(traps, phase, calibration, (h, w))
+    phase, stop_reason = run_correction(correction, display, camera.ring)
+"""
+import time
+
+import numpy as np
+
+from core.camera import roi_index
+from core.gs_algorithm import (
+    array_precision,
+    gaussian_beam,
+    trap_basis,
+    _project
+)
+
+
+# ---------------------
+# spot measurement
+# ---------------------
+
+class SpotMeter:
+    """
+    Integrated intensity of square ROIs around trap spots.
+
+    centers are camera pixels (column, row), e.g. from
+    CameraCalibration.to_camera. The (2r+1)² windows are precomputed
+    as one flat index array (roi_index), so a frame is measured with a
+    single gather and sum.
+    """
+
+    def __init__(self, centers, shape, radius=3):
+        self.index, _ = roi_index(centers, shape, radius)
+        self.pixels = self.index[0].size
+        self.shape = shape
+
+    def measure(self, frame):
+        """
+        Background-corrected intensity per trap (same order as centers).
+        """
+        windows = np.take(frame.reshape(-1), self.index)
+        totals = np.sum(windows, axis=(1, 2), dtype=np.float64)
+        # background level from a sparse sample of the frame
+        background = np.median(frame[::16, ::16])
+        return totals - background * self.pixels
+
+    def measure_frames(self, frames):
+        """
+        Mean of measure() over several frames.
+        """
+        return np.mean([self.measure(f) for f in frames], axis=0)
+
+
+def spot_uniformity(intensities):
+    """
+    1 - (Imax - Imin) / (Imax + Imin), as metrics.uniformity.
+    """
+    hi = intensities.max()
+    lo = max(intensities.min(), 0.0)
+    return float(1 - (hi - lo) / (hi + lo)) if hi + lo > 0 else 0.0
+
+
+# ---------------------
+# correction
+# ---------------------
+
+class CameraCorrection:
+    """
+    Trap target amplitudes re-weighted from camera measurements.
+
+    phase is the hologram to start from (SLM sized; its dtype selects
+    the precision); traps are in AppState.clicked_points coordinates.
+    gain (0..1] damps the amplitude update; iterations is the number
+    of GSW iterations per cycle.
+    """
+
+    def __init__(self, traps, phase, calibration, frame_shape, sigma=0.45,
+                 radius=3, gain=0.7, iterations=3):
+        ny, nx = phase.shape
+        precision = array_precision(phase)
+
+        self.traps = [tuple(t) for t in traps]
+        self.gain = gain
+        self.iterations = iterations
+
+        self.meter = SpotMeter(calibration.to_camera(self.traps), frame_shape, radius)
+
+        self.source = gaussian_beam(nx, ny, sigma, precision)
+        ex, ey = trap_basis(self.traps, nx, ny, precision)
+        self._ex = ex
+        self._ey_t = ey.T
+        self._ex_conj_t = ex.conj().T
+        self._ey_conj_t = ey.conj().T
+
+        self.field = self.source * np.exp(1j * phase).astype(ex.dtype)
+        self._mag = np.empty(phase.shape, dtype=self.source.dtype)
+
+        self.amps = np.ones(len(self.traps), dtype=self.source.dtype)
+
+        # (measured uniformity, compute seconds) per camera cycle
+        self.history = []
+
+    def phase(self):
+        return np.angle(self.field)
+
+    def trap_fields(self):
+        # V_m = Σ_rc U[r, c] conj(ey[m, r] ex[m, c])
+        return np.einsum("rm,rm->m", self._ey_conj_t, self.field @ self._ex_conj_t)
+
+    def step(self, intensities):
+        """
+        Re-weight the target amplitudes from measured intensities and
+        continue GSW from the current field; returns the new phase.
+        """
+        measured = np.maximum(intensities, 1e-3 * intensities.max())
+        # amplitude ∝ sqrt(intensity): dim traps get more target amplitude
+        self.amps *= (measured.mean() / measured) ** (self.gain / 2)
+        self.amps /= self.amps.mean()
+
+        weights = np.ones_like(self.amps)
+        for _ in range(self.iterations):
+            v = self.trap_fields()
+            v_abs = np.maximum(np.abs(v), np.finfo(self.amps.dtype).tiny)
+
+            rel = v_abs / self.amps
+            weights *= rel.mean() / rel
+
+            coeffs = weights * self.amps * (v / v_abs)
+            np.matmul(self._ey_t, coeffs[:, None] * self._ex, out=self.field)
+            _project(self.field, self.source, self._mag)
+
+        return self.phase()
+
+
+def collect_frames(reader, count, skip=0, timeout=1.0):
+    """
+    `count` frames from a FrameReader after skipping `skip` (frames
+    exposed while the SLM was still settling). Frames are copied, as
+    the ring reuses their slots.
+    """
+    frames = []
+    while len(frames) < count:
+        frame = reader.get(timeout=timeout)
+        if frame is None:
+            raise TimeoutError("no camera frame")
+        if skip:
+            skip -= 1
+            continue
+        frames.append(frame.image.copy())
+    return frames
+
+
+def run_correction(correction, display, ring, cycles=10, target_uniformity=0.95,
+                   settle_frames=2, average=2, callback=None):
+    """
+    Camera correction cycles until the measured uniformity reaches
+    target_uniformity.
+
+    display(phase) must put the phase on the SLM and return once it is
+    shown. callback(done, cycles) may return False to cancel.
+
+    Returns (phase, stop_reason), stop_reason being "converged",
+    "max_cycles" or "cancelled"; correction.history has the measured
+    uniformity and compute time of every cycle.
+    """
+    phase = correction.phase()
+    history = correction.history
+    stop_reason = "max_cycles"
+
+    for cycle in range(cycles):
+        display(phase)
+        reader = ring.reader()
+        frames = collect_frames(reader, average, skip=settle_frames)
+
+        start = time.perf_counter()
+        intensities = correction.meter.measure_frames(frames)
+        uniformity = spot_uniformity(intensities)
+        if uniformity >= target_uniformity:
+            history.append((uniformity, time.perf_counter() - start))
+            stop_reason = "converged"
+            break
+
+        phase = correction.step(intensities)
+        history.append((uniformity, time.perf_counter() - start))
+
+        if callback is not None and callback(cycle + 1, cycles) is False:
+            stop_reason = "cancelled"
+            break
+
+    return phase, stop_reason
@@ -1,31 +1,76 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+from core.metrics import score
+from core.profiling import profiled, span
+
+
+# ---------------------
+# Precision
+# ---------------------
+
+# real and complex dtypes of each precision mode; "single" halves the
+# memory traffic and is plenty for an 8-bit SLM phase
+PRECISIONS = {
+    "double": (np.float64, np.complex128),
+    "single": (np.float32, np.complex64),
+}
+
+
+def precision_dtypes(precision):
+    """
+    (real, complex) dtypes of a precision mode.
+    """
+    try:
+        return PRECISIONS[precision]
+    except KeyError:
+        raise ValueError(
+            f"unknown precision {precision!r}, expected one of {tuple(PRECISIONS)}"
+        ) from None
+
 
-def gaussian_beam(nx, ny, sigma=0.45):
+def array_precision(a):
+    """
+    Precision mode of an array: "single" for float32/complex64.
+    """
+    return "single" if a.dtype in (np.float32, np.complex64) else "double"
+
+
+@profiled("gaussian_beam")
+def gaussian_beam(nx, ny, sigma=0.45, precision="double"):
     """
     Gaussian beam amplitude (laser TEM00 mode)
     """
-    x = np.linspace(-1, 1, nx)
-    y = np.linspace(-1, 1, ny)
+    real, _ = precision_dtypes(precision)
+    x = np.linspace(-1, 1, nx, dtype=real)
+    y = np.linspace(-1, 1, ny, dtype=real)
     X, Y = np.meshgrid(x, y)
 
     beam = np.exp(-(X**2 + Y**2) / (2 * sigma**2))
     return beam / beam.max()
 
 
-def traps_to_target(trap_positions, nx, ny):
+@profiled("traps_to_target")
+def traps_to_target(trap_positions, nx, ny, precision="double", scale=(1, 1)):
     """
     Create delta-function target intensity
     at selected trap positions.
+
+    scale (sx, sy) converts trap coordinates to target pixels, for a
+    focal grid finer than the SLM (see focal_target).
     """
-    target = np.zeros((ny, nx))
+    target = np.zeros((ny, nx), dtype=precision_dtypes(precision)[0])
 
     cx = nx // 2
     cy = ny // 2
+    sx, sy = scale
 
     for x, y in trap_positions:
-        px = int(cx + x)
-        py = int(cy - y)
+        px = int(round(cx + x * sx))
+        py = int(round(cy - y * sy))
 
         if 0 <= px < nx and 0 <= py < ny:
             target[py, px] = 1
@@ -34,7 +79,8 @@ def traps_to_target(trap_positions, nx, ny):
 
 
 # ✅ NEW: Binary phase grating initialization
-def binary_grating_phase(nx, ny, period=16):
+@profiled("phase_mask")
+def binary_grating_phase(nx, ny, period=16, precision="double"):
     """
     Create binary π-phase grating.
 
@@ -42,50 +88,958 @@ def binary_grating_phase(nx, ny, period=16):
     Smaller period → stronger diffraction.
     """
 
-    phase = np.zeros((ny, nx))
+    columns = (np.arange(nx) // period) % 2 == 1
+    row = np.where(columns, -1.0 + 0j, 1.0 + 0j).astype(precision_dtypes(precision)[1])
+
+    # exp(1j * π) == -1, so build the mask directly
+    return np.broadcast_to(row, (ny, nx)).copy()
+
+
+# ---------------------
+# Transform size
+# ---------------------
+
+def next_fast_len(n):
+    """
+    Smallest 2^a * 3^b * 5^c >= n.
+
+    FFTs of these 5-smooth lengths are much faster than lengths with
+    large prime factors (1272 = 2^3 * 3 * 53).
+    """
+    best = None
+    p5 = 1
+    while True:
+        p35 = p5
+        while True:
+            m = p35
+            while m < n:
+                m *= 2
+            if best is None or m < best:
+                best = m
+            if p35 >= n:
+                break
+            p35 *= 3
+        if p5 >= n:
+            break
+        p5 *= 5
+    return best
+
+
+def focal_grid(nx, ny, oversample=1, fast_len=False):
+    """
+    (fx, fy) transform size for an nx x ny SLM.
+
+    Each axis is oversampled (zero padded) by `oversample`, which makes
+    the focal grid that much finer than the SLM pixel pitch, and then
+    rounded up to a fast FFT length when fast_len is set.
+    """
+    fx = int(np.ceil(nx * oversample))
+    fy = int(np.ceil(ny * oversample))
+    if fast_len:
+        fx = next_fast_len(fx)
+        fy = next_fast_len(fy)
+    return fx, fy
+
+
+def focal_target(trap_positions, nx, ny, oversample=1, fast_len=False,
+                 precision="double"):
+    """
+    traps_to_target on the focal grid of an nx x ny SLM.
+
+    Trap coordinates stay in SLM units (AppState.clicked_points) and
+    may be fractional when oversampling.
+    """
+    fx, fy = focal_grid(nx, ny, oversample, fast_len)
+    return traps_to_target(
+        trap_positions, fx, fy, precision, scale=(fx / nx, fy / ny)
+    )
+
+
+# ---------------------
+# FFT helpers
+# ---------------------
+
+def _fft_supports_out():
+    try:
+        buf = np.zeros((1, 1), dtype=complex)
+        np.fft.fft2(buf, out=buf)
+    except TypeError:
+        return False
+    return True
+
+
+_FFT_HAS_OUT = _fft_supports_out()
+
+
+# scipy.fft is optional; when present it is used for every transform
+try:
+    import scipy.fft as _scipy_fft
+except ImportError:
+    _scipy_fft = None
+
+# np.fft.fft passes its scale factor to the pocketfft ufunc as a Python
+# int, which selects the complex128 loop even for complex64 input (a
+# hidden upcast plus two casts). Calling the ufunc with a factor of the
+# input's precision runs the matching loop in place.
+try:
+    from numpy.fft import _pocketfft_umath as _pocketfft
+except ImportError:
+    _pocketfft = None
+
+# threads per transform; run_batch already runs one start per thread
+FFT_WORKERS = 1
+
+
+def _fft2_inplace_scipy(a):
+    # with overwrite_x a complex input is transformed in its own buffer
+    out = _scipy_fft.fft2(a, overwrite_x=True, workers=FFT_WORKERS)
+    if out is not a:
+        a[...] = out
+
+
+def _fft2_inplace_pocketfft(a):
+    one = a.real.dtype.type(1)
+    for axis in (a.ndim - 1, a.ndim - 2):
+        _pocketfft.fft(a, one, axes=[(axis,), (), (axis,)], out=a)
+
+
+def _fft2_inplace_numpy(a):
+    if _FFT_HAS_OUT:
+        np.fft.fft2(a, out=a)
+    else:
+        a[...] = np.fft.fft2(a)
+
+
+def _fft2_works(fft2_inplace):
+    """
+    True if fft2_inplace transforms small complex64 and complex128
+    arrays correctly, in place.
+    """
+    try:
+        for dtype in (np.complex64, np.complex128):
+            for shape in ((3, 4), (2, 3, 4)):
+                a = (np.arange(np.prod(shape)) * (1 + 0.5j)).reshape(shape).astype(dtype)
+                expected = np.fft.fft2(a.astype(np.complex128))
+                fft2_inplace(a)
+                if a.dtype != dtype or not np.allclose(a, expected, rtol=1e-4, atol=1e-3):
+                    return False
+    except Exception:
+        return False
+    return True
+
+
+def _pick_fft2():
+    """
+    First FFT backend that passes _fft2_works: scipy, then the float32
+    aware pocketfft call, then np.fft. The first two use interfaces
+    that may change between releases, so they are checked once here
+    rather than trusted.
+    """
+    candidates = []
+    if _scipy_fft is not None:
+        candidates.append(_fft2_inplace_scipy)
+    if _pocketfft is not None and _FFT_HAS_OUT:
+        candidates.append(_fft2_inplace_pocketfft)
+
+    for fft2_inplace in candidates:
+        if _fft2_works(fft2_inplace):
+            return fft2_inplace
+    return _fft2_inplace_numpy
+
+
+_fft2_inplace = _pick_fft2()
+
+# name of the backend in use, for benchmark reports
+FFT_BACKEND = {
+    _fft2_inplace_scipy: "scipy.fft",
+    _fft2_inplace_pocketfft: "pocketfft float32",
+    _fft2_inplace_numpy: "numpy.fft",
+}[_fft2_inplace]
+
+
+def _fft2(a):
+    """
+    Out-of-place fft2 that keeps the precision of a.
+    """
+    out = a.copy()
+    _fft2_inplace(out)
+    return out
+
+
+# worker threads for run_batch; numpy releases the GIL inside the
+# FFT and large ufunc loops, so the K starts run in parallel
+BATCH_THREADS = os.cpu_count() or 1
+
+_batch_pool = None
+
+
+def _get_batch_pool():
+    global _batch_pool
+    if _batch_pool is None:
+        _batch_pool = ThreadPoolExecutor(max_workers=BATCH_THREADS)
+    return _batch_pool
+
+
+def _ifft2_unscaled_inplace(a):
+    """
+    N * ifft2(a), computed as conj(fft2(conj(a))).
+
+    The 1/N factor is dropped because the next amplitude projection
+    discards the magnitude anyway. np.fft.ifft2 is not used with out=
+    since its multi-axis pass is not safe when writing into a buffer.
+    """
+    np.conjugate(a, out=a)
+    _fft2_inplace(a)
+    np.conjugate(a, out=a)
+
+
+# ---------------------
+# GS engine
+# ---------------------
+
+# targets with fewer non-zero pixels than this fraction are projected
+# through an index list instead of a full-array pass
+SPARSE_TARGET_FRACTION = 0.05
+
+
+class GSReport:
+    """
+    How a GS run ended.
+
+    stop_reason is "converged", "max_iterations" or "cancelled";
+    history holds (iteration, metrics) pairs from the monitor.
+    """
+
+    def __init__(self):
+        self.iterations = 0
+        self.stop_reason = None
+        self.history = []
+
+    def __repr__(self):
+        return (
+            f"GSReport(iterations={self.iterations}, "
+            f"stop_reason={self.stop_reason!r})"
+        )
+
+
+class ConvergenceMonitor:
+    """
+    Convergence metrics from the focal field an iteration already has.
+
+    For sparse (trap) targets the metrics read only the trap pixels:
+    uniformity of intensity relative to the target, and efficiency
+    against the total power, which is known from Parseval because the
+    SLM amplitude is fixed. Dense targets get the intensity/target
+    correlation from one pass over the field. No extra FFT is done.
+
+    converged() is True once the chosen metric improves by less than
+    tol between two checks.
+    """
+
+    def __init__(self, target_shifted, source_amp, metric=None, tol=None):
+        self.idx = np.flatnonzero(target_shifted)
+        self.dense = self.idx.size >= SPARSE_TARGET_FRACTION * target_shifted.size
+
+        target_int = target_shifted.ravel() ** 2
+        self.trap_target = target_int[self.idx]
+
+        # Σ|fft2(U)|² = nx * ny * Σ|U|², and |U| == source_amp
+        self.total_power = source_amp.size * np.vdot(source_amp, source_amp).real
+
+        if self.dense:
+            self.target_int = target_int
+            n = target_int.size
+            self._t_sum = target_int.sum()
+            self._t_var = np.dot(target_int, target_int) - self._t_sum ** 2 / n
+
+        if metric is None:
+            metric = "correlation" if self.dense else "uniformity"
+        if metric == "correlation" and not self.dense:
+            raise ValueError("correlation needs a dense target")
+        self.metric = metric
+        self.tol = tol
+
+        self.history = []
+
+    def observe(self, iteration, focal, scratch):
+        """
+        Record metrics for the focal field of this iteration.
+
+        scratch is a real buffer shaped like focal (dense targets only).
+        """
+        flat = focal.reshape(-1)
+        vals = flat[self.idx]
+        trap_int = vals.real ** 2 + vals.imag ** 2
+
+        rel = trap_int / self.trap_target
+        hi = rel.max()
+        lo = rel.min()
+
+        metrics = {
+            "uniformity": float(1 - (hi - lo) / (hi + lo)) if hi + lo > 0 else 0.0,
+            "efficiency": float(trap_int.sum() / self.total_power),
+        }
+
+        if self.dense:
+            intensity = scratch.reshape(-1)
+            np.abs(flat, out=intensity)
+            intensity *= intensity
+
+            n = intensity.size
+            i_sum = intensity.sum()
+            i_var = np.dot(intensity, intensity) - i_sum ** 2 / n
+            cov = np.dot(intensity, self.target_int) - i_sum * self._t_sum / n
+            denom = np.sqrt(i_var * self._t_var)
+            metrics["correlation"] = float(cov / denom) if denom > 0 else 0.0
+
+        self.history.append((iteration, metrics))
+
+    def converged(self):
+        if self.tol is None or len(self.history) < 2:
+            return False
+        prev = self.history[-2][1][self.metric]
+        last = self.history[-1][1][self.metric]
+        return last - prev < self.tol
+
+
+class GSEngine:
+    """
+    Reusable Gerchberg Saxton engine for one (nx, ny) SLM size.
+
+    The engine owns its complex field and real work buffers, so a run
+    allocates nothing per iteration. The target amplitude is stored
+    pre-shifted (ifftshift) once per run, which removes the
+    fftshift/ifftshift pair from the loop; only the returned intensity
+    is shifted back.
+
+    run_batch iterates a stack of K starts held in one (K, ny, nx)
+    array; the starts share the target setup and advance together on
+    a thread pool.
+
+    precision ("double" or "single") fixes the dtype of every buffer;
+    sources, targets and masks are cast to it once per run, so the
+    loop itself never mixes precisions.
+
+    With oversample / fast_len the SLM aperture sits in the corner of a
+    larger (fy, fx) transform grid (see focal_grid). Sources and masks
+    stay SLM sized, targets and intensities are focal-grid sized, and
+    phase maps are cropped back to the aperture.
+
+    Not thread-safe: use one engine per thread (see get_engine).
+    """
+
+    def __init__(self, nx, ny, precision="double", oversample=1, fast_len=False):
+        self.nx = nx
+        self.ny = ny
+
+        self.precision = precision
+        self.real_dtype, self.complex_dtype = precision_dtypes(precision)
+
+        self.oversample = oversample
+        self.fast_len = fast_len
+        self.fx, self.fy = focal_grid(nx, ny, oversample, fast_len)
+        self.padded = (self.fx, self.fy) != (nx, ny)
+
+        # SLM field; also holds the focal field between the two FFTs
+        self.field = np.zeros((self.fy, self.fx), dtype=self.complex_dtype)
+        # real scratch buffer for |field|
+        self._mag = np.empty((self.fy, self.fx), dtype=self.real_dtype)
+        # zero-padded source amplitude
+        self._source = np.zeros((self.fy, self.fx), dtype=self.real_dtype) if self.padded else None
+
+        # (K, ny, nx) buffers for run_batch, kept for the last K used
+        self._batch_field = None
+        self._batch_mag = None
+
+        self._target = None
+        self._target_idx = None
+        self._target_vals = None
+        self._target_shifted = None
+
+        # GSReport of the last run()
+        self.report = None
+
+    @profiled("set_target")
+    def set_target(self, target_amp):
+        """
+        Store target amplitude in unshifted (FFT) order.
+
+        target_amp is (ny, nx), or (K, ny, nx) for one layout per start.
+        """
+        target_amp = np.asarray(target_amp, dtype=self.real_dtype)
+        if target_amp.shape[-2:] != (self.fy, self.fx):
+            raise ValueError(
+                f"target shape {target_amp.shape} does not match "
+                f"focal grid {(self.fy, self.fx)}"
+            )
+        shifted = np.fft.ifftshift(target_amp, axes=(-2, -1))
+        self._target_shifted = shifted
+
+        idx = np.flatnonzero(shifted) if shifted.ndim == 2 else None
+        if idx is not None and idx.size < SPARSE_TARGET_FRACTION * shifted.size:
+            self._target = None
+            self._target_idx = idx
+            self._target_vals = shifted.ravel()[idx]
+        else:
+            self._target = shifted
+            self._target_idx = None
+            self._target_vals = None
+
+    def seed(self, source_amp, init_mask):
+        """
+        Start a new run from source_amp * init_mask (both SLM sized).
+        """
+        init_mask = np.asarray(init_mask, dtype=self.complex_dtype)
+        if self.padded:
+            self.field.fill(0)
+        np.multiply(source_amp, init_mask, out=self.aperture(self.field))
+
+    def aperture(self, a):
+        """
+        View of the SLM aperture of a transform-grid array.
+        """
+        return a[..., :self.ny, :self.nx]
+
+    def target(self, trap_positions):
+        """
+        Target amplitude for trap_positions on this engine's focal grid.
+        """
+        return focal_target(
+            trap_positions, self.nx, self.ny,
+            self.oversample, self.fast_len, self.precision
+        )
+
+    def phase(self):
+        """
+        SLM phase of the current field.
+        """
+        return np.angle(self.aperture(self.field))
+
+    def run(self, source_amp, target_amp, iterations=500, init_mask=None,
+            callback=None, tol=None, check_every=None, metric=None):
+        """
+        Run GS iterations (see iterate) and return the result.
+
+        Returns
+        intensity  → focal plane traps
+        phase_map  → SLM hologram phase
+        """
+        self.iterate(
+            source_amp, target_amp, iterations, init_mask,
+            callback, tol, check_every, metric
+        )
+        return self.result()
+
+    def iterate(self, source_amp, target_amp, iterations, init_mask=None,
+                callback=None, tol=None, check_every=None, metric=None):
+        """
+        Advance self.field by up to `iterations` GS iterations.
+
+        init_mask is a unit-modulus complex array (e.g. from
+        binary_grating_phase). When omitted the engine warm-starts
+        from its current field.
+
+        callback(done, iterations) is called after every iteration;
+        returning False from it stops the run early.
+
+        With check_every (default 5 when tol is given) convergence
+        metrics are sampled every check_every iterations, and with tol
+        the run stops once `metric` improves by less than tol between
+        samples (see ConvergenceMonitor).
+
+        Returns the GSReport (also kept as self.report).
+        """
+        source_amp = self._check_source(source_amp)
+        self.set_target(target_amp)
+
+        if init_mask is not None:
+            self.seed(source_amp, init_mask)
+        source_amp = self._pad_source(source_amp)
+
+        if tol is not None and check_every is None:
+            check_every = 5
+
+        # an empty target (no traps, or all off the grid) has nothing
+        # to measure; it just runs to the iteration limit
+        monitor = None
+        empty = self._target_idx is not None and not self._target_idx.size
+        if check_every is not None and not empty:
+            monitor = ConvergenceMonitor(
+                self._target_shifted, source_amp, metric, tol
+            )
+
+        self.report = GSReport()
+        self._iterate_single(source_amp, iterations, callback, monitor, check_every)
+        if monitor is not None:
+            self.report.history = monitor.history
+
+        return self.report
+
+    def run_batch(self, source_amp, target_amp, init_masks, iterations=500,
+                  callback=None):
+        """
+        Run K independent GS starts together.
+
+        init_masks is (K, ny, nx); target_amp is a shared (ny, nx)
+        layout or (K, ny, nx) with one layout per start.
+
+        Returns (K, ny, nx) intensities and phase maps.
+        """
+        source_amp = self._check_source(source_amp)
+        self.set_target(target_amp)
+
+        init_masks = np.asarray(init_masks, dtype=self.complex_dtype)
+        field, mag = self._batch_buffers(init_masks.shape[0])
+        if self.padded:
+            field.fill(0)
+        np.multiply(source_amp, init_masks, out=self.aperture(field))
+
+        source_amp = self._pad_source(source_amp)
+        self._iterate_batch(field, mag, source_amp, iterations, callback)
+
+        return self.result(field)
+
+    def result(self, field=None):
+        """
+        Focal intensity (focal grid) and SLM phase (aperture) of the
+        current field.
+        """
+        if field is None:
+            field = self.field
+
+        with span("result_fft"):
+            focal = _fft2(field)
+
+        with span("result_intensity"):
+            intensity = np.abs(focal)
+            intensity *= intensity
+            intensity = np.fft.fftshift(intensity, axes=(-2, -1))
+            intensity /= intensity.max(axis=(-2, -1), keepdims=True)
+
+        # phase at SLM plane
+        with span("angle"):
+            phase_map = np.angle(self.aperture(field))
+
+        return intensity, phase_map
+
+    def _check_source(self, source_amp):
+        if source_amp.shape != (self.ny, self.nx):
+            raise ValueError(
+                f"source shape {source_amp.shape} does not match "
+                f"engine size {(self.ny, self.nx)}"
+            )
+        return np.asarray(source_amp, dtype=self.real_dtype)
+
+    def _pad_source(self, source_amp):
+        # zero outside the aperture, so the SLM projection keeps the
+        # padding empty
+        if not self.padded:
+            return source_amp
+        self.aperture(self._source)[...] = source_amp
+        return self._source
+
+    def _batch_buffers(self, k):
+        if self._batch_field is None or self._batch_field.shape[0] != k:
+            self._batch_field = np.zeros((k, self.fy, self.fx), dtype=self.complex_dtype)
+            self._batch_mag = np.empty((k, self.fy, self.fx), dtype=self.real_dtype)
+        return self._batch_field, self._batch_mag
+
+    def _iterate_single(self, source_amp, iterations, callback, monitor, check_every):
+        field = self.field
+        mag = self._mag
+        report = self.report
+        report.stop_reason = "max_iterations"
+
+        for i in range(iterations):
+            observe = monitor is not None and i % check_every == 0
+            self._step(field, mag, source_amp, self._target,
+                       monitor if observe else None, i)
+            report.iterations = i + 1
+
+            if observe and monitor.converged():
+                report.stop_reason = "converged"
+                return
+
+            if callback is not None and callback(i + 1, iterations) is False:
+                report.stop_reason = "cancelled"
+                return
+
+    def _iterate_batch(self, field, mag, source_amp, iterations, callback):
+        # stacked starts advance in lockstep, one start per task; each
+        # task works on its own contiguous slice, which is faster than
+        # a 3-D fft2 plus whole-stack ufuncs that overflow the cache
+        k = field.shape[0]
+        if self._target is not None and self._target.ndim == 3:
+            targets = list(self._target)
+        else:
+            targets = [self._target] * k
+
+        def step(j):
+            self._step(field[j], mag[j], source_amp, targets[j])
+
+        pool = _get_batch_pool() if BATCH_THREADS > 1 and k > 1 else None
+
+        for i in range(iterations):
+            if pool is None:
+                for j in range(k):
+                    step(j)
+            else:
+                list(pool.map(step, range(k)))
+
+            if callback is not None and callback(i + 1, iterations) is False:
+                return
+
+    def _step(self, field, mag, source_amp, target, monitor=None, iteration=0):
+        # forward propagation
+        with span("fft"):
+            _fft2_inplace(field)
+
+        if monitor is not None:
+            with span("monitor"):
+                monitor.observe(iteration, field, mag)
+
+        # enforce target amplitude
+        with span("project_target"):
+            if target is None:
+                self._project_sparse_target(field)
+            else:
+                _project(field, target, mag)
+
+        # back propagation
+        with span("ifft"):
+            _ifft2_unscaled_inplace(field)
+
+        # enforce Gaussian amplitude
+        with span("project_source"):
+            _project(field, source_amp, mag)
+
+    def _project_sparse_target(self, field):
+        # every pixel outside the traps becomes zero
+        flat = field.reshape(-1)
+        vals = flat[self._target_idx]
+        vmag = np.abs(vals)
+
+        unit = np.ones_like(vals)
+        np.divide(vals, vmag, out=unit, where=vmag > 0)
+
+        field.fill(0)
+        flat[self._target_idx] = self._target_vals * unit
+
+
+def _project(field, amp, mag):
+    """
+    field ← amp * exp(1j * angle(field)), in place.
+
+    mag is a real scratch buffer shaped like field.
+    """
+    np.abs(field, out=mag)
+
+    # angle(0) == 0, so exact zeros take the plain amplitude;
+    # they are rare outside the first iterations of a symmetric seed
+    zeros = None if mag.all() else mag == 0
 
-    for x in range(nx):
-        if (x // period) % 2 == 1:
-            phase[:, x] = np.pi
+    np.maximum(mag, np.finfo(mag.dtype).tiny, out=mag)
+    np.divide(amp, mag, out=mag)
+    np.multiply(field, mag, out=field)
 
-    return np.exp(1j * phase)
+    if zeros is not None:
+        field[zeros] = np.broadcast_to(amp, field.shape)[zeros]
 
 
-def gerchberg_saxton(source_amp, target_amp, iterations=500):
+_local = threading.local()
+
+
+def get_engine(nx, ny, precision="double", oversample=1, fast_len=False):
+    """
+    Per-thread cached GSEngine for an (nx, ny) SLM and its settings.
+    """
+    engines = getattr(_local, "engines", None)
+    if engines is None:
+        engines = _local.engines = {}
+
+    key = (nx, ny, precision, oversample, fast_len)
+    engine = engines.get(key)
+    if engine is None:
+        engine = engines[key] = GSEngine(nx, ny, precision, oversample, fast_len)
+    return engine
+
+
+def clear_engines():
+    """
+    Drop this thread's cached engines and their buffers.
+    """
+    _local.engines = {}
+
+
+INIT_STRATEGIES = ("grating", "random")
+
+
+def initial_mask(init, nx, ny, period=16, seed=None, precision="double"):
+    """
+    Starting phase mask for a GS run.
+
+    "grating" → binary π grating of the given period
+    "random"  → uniform random phase drawn from seed
+    """
+    if init == "grating":
+        return binary_grating_phase(nx, ny, period=period, precision=precision)
+    if init == "random":
+        return random_phase_masks(1, nx, ny, seed, precision)[0]
+    raise ValueError(
+        f"unknown init {init!r}, expected one of {INIT_STRATEGIES}"
+    )
+
+
+def gerchberg_saxton(source_amp, target_amp, iterations=500,
+                     init="grating", period=16, seed=None,
+                     tol=None, check_every=None, return_report=False,
+                     cache=None, oversample=1, fast_len=False):
     """
     Gerchberg Saxton algorithm.
 
+    init, period and seed choose the starting phase (see initial_mask).
+    tol/check_every enable early stopping (see GSEngine.run).
+    The dtype of source_amp selects the precision (see
+    array_precision); build it with gaussian_beam(..., precision=...).
+    oversample/fast_len pad the transform (see focal_grid); target_amp
+    must then be on the focal grid (see focal_target).
+    cache is an optional HologramCache; unseeded random starts are
+    never cached. A cache hit reports stop_reason "cached".
+
     Returns
     intensity  → focal plane traps
     phase_map  → SLM hologram phase
+    (+ GSReport when return_report is True)
     """
 
     ny, nx = source_amp.shape
 
-    # 🔹 Binary grating phase initialization
-    phase_mask = binary_grating_phase(nx, ny, period=16)
+    key = None
+    if cache is not None and not (init == "random" and seed is None):
+        key = cache.make_key(
+            algorithm="gs", source=source_amp, target=target_amp,
+            iterations=iterations, init=init, period=period, seed=seed,
+            tol=tol, check_every=check_every,
+            oversample=oversample, fast_len=fast_len
+        )
+        hit = cache.get(key)
+        if hit is not None:
+            if return_report:
+                report = GSReport()
+                report.stop_reason = "cached"
+                return hit + (report,)
+            return hit
 
-    field = source_amp * phase_mask
+    precision = array_precision(source_amp)
+    engine = get_engine(nx, ny, precision, oversample, fast_len)
 
-    for _ in range(iterations):
-        # forward propagation
-        target_field = np.fft.fftshift(np.fft.fft2(field))
+    # 🔹 Binary grating phase initialization (by default)
+    phase_mask = initial_mask(init, nx, ny, period=period, seed=seed,
+                              precision=precision)
 
-        # enforce target amplitude
-        target_field = target_amp * np.exp(1j * np.angle(target_field))
+    intensity, phase_map = engine.run(
+        source_amp, target_amp, iterations,
+        init_mask=phase_mask, tol=tol, check_every=check_every
+    )
 
-        # back propagation
-        field = np.fft.ifft2(np.fft.ifftshift(target_field))
+    if key is not None and engine.report.stop_reason != "cancelled":
+        cache.put(key, intensity, phase_map)
 
-        # enforce Gaussian amplitude
-        field = source_amp * np.exp(1j * np.angle(field))
+    if return_report:
+        return intensity, phase_map, engine.report
+    return intensity, phase_map
+
+
+@profiled("phase_mask")
+def random_phase_masks(starts, nx, ny, seed=None, precision="double"):
+    """
+    Stack of uniformly random unit-modulus phase masks, (starts, ny, nx).
+    """
+    real, cplx = precision_dtypes(precision)
+    rng = np.random.default_rng(seed)
+    phase = rng.random((starts, ny, nx), dtype=real)
+    phase *= 2 * np.pi
+
+    mask = np.empty(phase.shape, dtype=cplx)
+    np.cos(phase, out=mask.real)
+    np.sin(phase, out=mask.imag)
+    return mask
+
+
+def gerchberg_saxton_multistart(source_amp, target_amp, starts=8,
+                                iterations=500, metric="uniformity",
+                                init_masks=None, seed=None,
+                                return_all=False, callback=None,
+                                oversample=1, fast_len=False):
+    """
+    Best-of-K Gerchberg Saxton.
+
+    All starts are iterated together as one stacked array. init_masks
+    defaults to random phases; target_amp may be a single layout or
+    one layout per start (K, ny, nx). metric is a name from
+    core.metrics.METRICS and is evaluated against target_amp. The
+    dtype of source_amp selects the precision; oversample/fast_len
+    as in gerchberg_saxton.
+
+    Returns
+    intensity, phase_map          → best start
+    (+ intensities, phase_maps, scores when return_all is True)
+    """
+    ny, nx = source_amp.shape
+    precision = array_precision(source_amp)
+
+    if init_masks is None:
+        k = target_amp.shape[0] if target_amp.ndim == 3 else starts
+        init_masks = random_phase_masks(k, nx, ny, seed, precision)
+
+    engine = get_engine(nx, ny, precision, oversample, fast_len)
+    intensities, phase_maps = engine.run_batch(
+        source_amp, target_amp, init_masks, iterations, callback
+    )
+
+    targets = np.broadcast_to(target_amp, intensities.shape)
+    scores = np.array([
+        score(intensities[k], targets[k], metric)
+        for k in range(intensities.shape[0])
+    ])
+
+    best = int(np.argmax(scores))
+
+    if return_all:
+        return intensities[best], phase_maps[best], (intensities, phase_maps, scores)
+    return intensities[best], phase_maps[best]
+
+
+# ---------------------
+# Weighted GS on trap pixels only
+# ---------------------
+
+def target_traps(target_amp):
+    """
+    Trap positions (centered x, y) and amplitudes of a target image.
+
+    Inverse of traps_to_target.
+    """
+    ny, nx = target_amp.shape
+    rows, cols = np.nonzero(target_amp)
+
+    positions = np.column_stack((cols - nx // 2, ny // 2 - rows))
+    return positions, target_amp[rows, cols]
 
-    final_field = np.fft.fftshift(np.fft.fft2(field))
 
-    intensity = np.abs(final_field) ** 2
-    intensity /= intensity.max()
+def trap_basis(positions, nx, ny, precision="double"):
+    """
+    Separable trap-by-pixel phase basis.
+
+    Trap m's grating exp(i 2π (x_m c / nx - y_m r / ny)) is
+    ey[m, r] * ex[m, c]; returns ex (N, nx) and ey (N, ny).
+    The phases are always computed in double and then cast.
+    """
+    positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+
+    u = 2 * np.pi * np.arange(nx) / nx
+    v = 2 * np.pi * np.arange(ny) / ny
+
+    cplx = precision_dtypes(precision)[1]
+    ex = np.exp(1j * np.outer(positions[:, 0], u)).astype(cplx, copy=False)
+    ey = np.exp(-1j * np.outer(positions[:, 1], v)).astype(cplx, copy=False)
+    return ex, ey
+
+
+def weighted_gerchberg_saxton(source_amp, target_amp, iterations=30,
+                              init_mask=None, seed=None, callback=None,
+                              tol=None, oversample=1, fast_len=False):
+    """
+    Weighted Gerchberg Saxton (GSW) for discrete traps.
+
+    The focal field is evaluated only at the trap pixels of target_amp,
+    through the separable basis from trap_basis and two matrix
+    products per iteration (cost ∝ pixels x traps, no FFT). Per-trap
+    weights are updated every iteration to equalise trap intensities
+    relative to the target amplitudes.
+
+    callback(done, iterations) behaves as in GSEngine.run. With tol
+    the run stops once trap uniformity improves by less than tol in an
+    iteration; engine.report (from get_engine) says why it stopped.
+    The dtype of source_amp selects the precision; oversample/fast_len
+    as in gerchberg_saxton (only the returned intensity uses an FFT).
+
+    Returns
+    intensity  → focal plane traps
+    phase_map  → SLM hologram phase
+    """
+    ny, nx = source_amp.shape
+    precision = array_precision(source_amp)
+
+    engine = get_engine(nx, ny, precision, oversample, fast_len)
+
+    positions, amps = target_traps(target_amp)
+    if amps.size == 0:
+        raise ValueError("target has no traps")
+    amps = amps.astype(source_amp.dtype, copy=False)
+
+    # focal-grid pixels → SLM spatial frequencies
+    positions = positions * (nx / engine.fx, ny / engine.fy)
+
+    ex, ey = trap_basis(positions, nx, ny, precision)
+    ex_conj = ex.conj()
+    ey_conj_t = ey.conj().T
+
+    # the trap sums only touch the aperture; the padding stays zero
+    engine.field.fill(0)
+    field = engine.aperture(engine.field)
+    mag = engine.aperture(engine._mag)
+
+    weights = np.ones_like(amps)
+
+    report = engine.report = GSReport()
+    report.stop_reason = "max_iterations"
+    total_power = source_amp.size * np.vdot(source_amp, source_amp).real
+
+    if init_mask is not None:
+        engine.seed(source_amp, init_mask)
+    else:
+        # random superposition: one grating per trap, random phase
+        rng = np.random.default_rng(seed)
+        coeffs = amps * np.exp(2j * np.pi * rng.random(amps.size)).astype(ex.dtype)
+        np.matmul(ey.T, coeffs[:, None] * ex, out=field)
+        _project(field, source_amp, mag)
+
+    for i in range(iterations):
+        # focal field at the traps: V_m = Σ_rc U[r, c] conj(ey[m, r] ex[m, c])
+        with span("gsw_traps"):
+            v = np.einsum("rm,rm->m", ey_conj_t, field @ ex_conj.T)
+
+        v_abs = np.abs(v)
+        v_abs = np.maximum(v_abs, np.finfo(v_abs.dtype).tiny)
+
+        # boost traps that are dim relative to their target amplitude
+        rel = v_abs / amps
+        weights *= rel.mean() / rel
+
+        rel_int = rel * rel
+        report.history.append((i, {
+            "uniformity": float(1 - np.ptp(rel_int) / (rel_int.max() + rel_int.min())),
+            "efficiency": float(np.dot(v_abs, v_abs) / total_power),
+        }))
+        report.iterations = i + 1
+
+        # back propagation of the weighted trap fields
+        coeffs = weights * amps * (v / v_abs)
+        with span("gsw_back"):
+            np.matmul(ey.T, coeffs[:, None] * ex, out=field)
+
+        # enforce Gaussian amplitude
+        with span("project_source"):
+            _project(field, source_amp, mag)
+
+        if tol is not None and len(report.history) > 1 and \
+                report.history[-1][1]["uniformity"] - report.history[-2][1]["uniformity"] < tol:
+            report.stop_reason = "converged"
+            break
 
-    # phase at SLM plane
-    phase_map = np.angle(field)
+        if callback is not None and callback(i + 1, iterations) is False:
+            report.stop_reason = "cancelled"
+            break
 
-    return intensity, phase_map
\ No newline at end of file
+    return engine.result()
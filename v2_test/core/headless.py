@@ -0,0 +1,312 @@
+"""
+Headless hologram generator: trap lists in, phase maps out.
+
+Uses only core (numpy, no Qt), so it starts quickly enough to be
+called from scheduling scripts. SLM size and computation settings come
+from an AppState config.json; algorithm options from the command line.
+
+    python -m core.headless traps.json --out phase.npy
+    python -m core.headless run1.json run2.txt --out-dir holograms --format png --jobs 8
+
+A trap file is JSON (a layout [[x, y], ...] or a list of layouts) or
+text with one "x y" / "x,y" trap per line; coordinates are the centered
+pixels of AppState.clicked_points. Every layout gives one output file.
+
+From Python:
+
+    from core.headless import generate, generate_batch
+    phase = generate([(10, 0), (-10, 0)], config="config.json")
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from core.app_state import AppState
+from core.hologram import ALGORITHMS, BEAM_SIGMA, GS_TOL, compute_hologram
+from core.slm_output import phase_to_grey
+
+INITS = ("superposition", "random")
+FORMATS = ("npy", "png")
+
+
+# ---------------------
+# input
+# ---------------------
+
+def load_layouts(path):
+    """
+    Trap layouts of a trap file (see module docstring).
+
+    Raises ValueError naming the file and layout (or line) when the
+    file is not a trap file or a layout has no traps.
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}") from None
+
+        if not isinstance(data, list) or not data:
+            raise ValueError(f"{path}: expected a layout or a list of layouts")
+        # a layout is a list of pairs; a batch is a list of layouts
+        if isinstance(data[0], list) and data[0] and _is_number(data[0][0]):
+            return [_check_layout(data, path)]
+        return [_check_layout(layout, f"{path} layout {i}")
+                for i, layout in enumerate(data)]
+
+    layout = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.split("#")[0].strip()
+            if line:
+                values = line.replace(",", " ").split()
+                try:
+                    layout.append((float(values[0]), float(values[1])))
+                except (IndexError, ValueError):
+                    raise ValueError(f"{path}:{number}: expected 'x y', got {line!r}") from None
+    if not layout:
+        raise ValueError(f"{path}: no traps")
+    return [layout]
+
+
+def _is_number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+def _check_layout(layout, where):
+    # [[x, y], ...] with at least one trap, as (x, y) tuples
+    if not isinstance(layout, list) or not layout:
+        raise ValueError(f"{where}: expected a non-empty list of [x, y] traps")
+
+    traps = []
+    for p in layout:
+        if not (isinstance(p, list) and len(p) == 2 and all(map(_is_number, p))):
+            raise ValueError(f"{where}: expected [x, y], got {p!r}")
+        traps.append(tuple(p))
+    return traps
+
+
+def load_settings(config="config.json"):
+    """
+    SLM and computation settings from an AppState config file.
+    """
+    state = AppState(config)
+    return dict(
+        nx=state.slm_res_x,
+        ny=state.slm_res_y,
+        precision=state.precision,
+        oversample=state.oversample,
+        fast_len=state.fft_fast_len,
+        seed=state.gs_seed,
+    )
+
+
+# ---------------------
+# generation
+# ---------------------
+
+def generate(traps, config="config.json", algorithm="GS", iterations=80,
+             starts=1, init="superposition", tol=GS_TOL, sigma=BEAM_SIGMA,
+             **settings):
+    """
+    SLM phase map (radians, SLM sized) for one trap layout.
+
+    settings override the values read from config (nx, ny, precision,
+    oversample, fast_len, seed).
+    """
+    options = load_settings(config) if config is not None else {}
+    options.update(settings)
+
+    nx = options.pop("nx")
+    ny = options.pop("ny")
+
+    init_mask = None
+    if init == "superposition" and traps and not (algorithm == "GS" and starts > 1):
+        # same start as the GUI, which refines the grid page hologram
+        from core.superposition import SuperpositionEngine
+
+        hologram = SuperpositionEngine(
+            nx, ny, seed=options.get("seed"),
+            precision=options.get("precision", "double")
+        )
+        hologram.set_traps(traps)
+        init_mask = hologram.mask()
+    elif init not in INITS:
+        raise ValueError(f"unknown init {init!r}, expected one of {INITS}")
+
+    result = compute_hologram(
+        traps, nx, ny,
+        algorithm=algorithm, iterations=iterations, starts=starts,
+        tol=tol, sigma=sigma, init_mask=init_mask, **options
+    )
+    return result.phase
+
+
+def _generate_job(job):
+    # process pool entry point; writes the file in the worker so the
+    # phase map is not pickled back
+    phase = generate(job["traps"], **job["options"])
+    if job["output"] is None:
+        return phase
+    write_phase(job["output"], phase, job["format"])
+    return job["output"]
+
+
+def generate_batch(layouts, jobs=1, outputs=None, fmt="npy", **options):
+    """
+    Phase maps for many layouts, on `jobs` worker processes.
+
+    With outputs (one path per layout) the maps are written by the
+    workers and the paths returned; otherwise the maps are returned.
+    """
+    if outputs is None:
+        outputs = [None] * len(layouts)
+
+    work = [
+        {"traps": traps, "output": out, "format": fmt, "options": options}
+        for traps, out in zip(layouts, outputs)
+    ]
+
+    if jobs == 1 or len(work) == 1:
+        return [_generate_job(job) for job in work]
+
+    from core.sweep import pinned_pool
+
+    with pinned_pool(min(jobs, len(work))) as pool:
+        return list(pool.map(_generate_job, work))
+
+
+# ---------------------
+# output
+# ---------------------
+
+def phase_to_uint8(phase):
+    """
+    [-π, π] → 0..255 through the linear SLM LUT (core.slm_output).
+    """
+    return phase_to_grey(phase)
+
+
+def _write_png(path, img8):
+    # 8-bit grayscale PNG, no imaging library needed
+    h, w = img8.shape
+    rows = np.zeros((h, w + 1), dtype=np.uint8)
+    rows[:, 1:] = img8
+
+    def chunk(tag, data):
+        return (struct.pack(">I", len(data)) + tag + data
+                + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF))
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 0, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def write_phase(path, phase, fmt="npy"):
+    """
+    npy → float32 radians; png → 8-bit grayscale phase image.
+    """
+    if fmt == "npy":
+        np.save(path, phase.astype(np.float32, copy=False))
+    elif fmt == "png":
+        _write_png(path, phase_to_uint8(phase))
+    else:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+
+
+# ---------------------
+# command line
+# ---------------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate hologram phase maps")
+    parser.add_argument("inputs", nargs="+", help="trap files (.json or text)")
+    parser.add_argument("--config",
+                        help="AppState config with SLM size and settings "
+                             "(default: config.json if present)")
+    parser.add_argument("--algorithm", default="GS", choices=ALGORITHMS)
+    parser.add_argument("--iterations", type=int, default=80)
+    parser.add_argument("--starts", type=int, default=1)
+    parser.add_argument("--init", default="superposition", choices=INITS)
+    parser.add_argument("--tol", type=float, default=GS_TOL)
+    parser.add_argument("--sigma", type=float, default=BEAM_SIGMA)
+    parser.add_argument("--format", default="npy", choices=FORMATS)
+    parser.add_argument("--out", help="output file (single layout only)")
+    parser.add_argument("--out-dir", default=".",
+                        help="output directory for batches")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="worker processes (0: all cores)")
+    args = parser.parse_args(argv)
+
+    # only the default config may be absent (AppState then uses its
+    # defaults); a mistyped --config must not silently do the same
+    if args.config is None:
+        args.config = "config.json"
+    elif not os.path.isfile(args.config):
+        parser.error(f"config file not found: {args.config}")
+
+    layouts = []
+    names = []
+    sources = []
+    for path in args.inputs:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        try:
+            found = load_layouts(path)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        layouts.extend(found)
+        names.extend(
+            [stem] if len(found) == 1 else [f"{stem}_{i:04d}" for i in range(len(found))]
+        )
+        sources.extend([path] * len(found))
+
+    if args.out is not None:
+        if len(layouts) != 1:
+            parser.error("--out needs exactly one layout; use --out-dir")
+        outputs = [args.out]
+    else:
+        os.makedirs(args.out_dir, exist_ok=True)
+        outputs = [os.path.join(args.out_dir, f"{n}.{args.format}") for n in names]
+
+        # inputs sharing a stem would silently overwrite each other
+        first = {}
+        for out, src in zip(outputs, sources):
+            key = os.path.abspath(out)
+            if key in first:
+                parser.error(f"{first[key]} and {src} both write {out}; "
+                             "rename one or run them separately")
+            first[key] = src
+
+    start = time.perf_counter()
+    written = generate_batch(
+        layouts,
+        jobs=args.jobs or os.cpu_count() or 1,
+        outputs=outputs,
+        fmt=args.format,
+        config=args.config,
+        algorithm=args.algorithm,
+        iterations=args.iterations,
+        starts=args.starts,
+        init=args.init,
+        tol=args.tol,
+        sigma=args.sigma,
+    )
+
+    for path in written:
+        print(path)
+    print(f"{len(written)} hologram(s) in {time.perf_counter() - start:.2f} s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
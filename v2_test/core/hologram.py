@@ -0,0 +1,80 @@
+"""
+One hologram from a trap list: the run shared by ExperimentPage and
+the headless generator (core.headless). Imports numpy only.
+"""
+from collections import namedtuple
+
+from core.gs_algorithm import (
+    gaussian_beam,
+    focal_target,
+    get_engine,
+    gerchberg_saxton_multistart,
+    random_phase_masks,
+    weighted_gerchberg_saxton
+)
+
+ALGORITHMS = ("GS", "GSW")
+
+# stop once trap uniformity improves by less than this between checks
+GS_TOL = 1e-4
+
+# Gaussian source width passed to gaussian_beam
+BEAM_SIGMA = 0.45
+
+HologramResult = namedtuple("HologramResult", "source target intensity phase report")
+
+
+def compute_hologram(traps, nx, ny, algorithm="GS", iterations=80, starts=1,
+                     seed=0, tol=GS_TOL, sigma=BEAM_SIGMA, precision="double",
+                     oversample=1, fast_len=False, init_mask=None, callback=None):
+    """
+    Phase hologram for trap positions on an nx x ny SLM.
+
+    "GS" with starts > 1 runs best-of-N random starts (report is None);
+    otherwise GS/GSW start from init_mask, or from a random phase drawn
+    from seed. callback(done, iterations) may return False to cancel.
+    """
+    grid = dict(oversample=oversample, fast_len=fast_len)
+
+    source = gaussian_beam(nx, ny, sigma, precision)
+    target = focal_target(traps, nx, ny, precision=precision, **grid)
+
+    report = None
+    if algorithm == "GSW":
+        intensity, phase_map = weighted_gerchberg_saxton(
+            source, target,
+            iterations=iterations,
+            init_mask=init_mask,
+            seed=seed,
+            callback=callback,
+            tol=tol,
+            **grid
+        )
+        report = get_engine(nx, ny, precision, **grid).report
+    elif algorithm == "GS" and starts > 1:
+        intensity, phase_map = gerchberg_saxton_multistart(
+            source, target,
+            starts=starts,
+            iterations=iterations,
+            seed=seed,
+            callback=callback,
+            **grid
+        )
+    elif algorithm == "GS":
+        if init_mask is None:
+            init_mask = random_phase_masks(1, nx, ny, seed, precision)[0]
+
+        engine = get_engine(nx, ny, precision, **grid)
+        intensity, phase_map = engine.run(
+            source, target, iterations,
+            init_mask=init_mask,
+            callback=callback,
+            tol=tol
+        )
+        report = engine.report
+    else:
+        raise ValueError(
+            f"unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}"
+        )
+
+    return HologramResult(source, target, intensity, phase_map, report)
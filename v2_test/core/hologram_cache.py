@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class HologramCache:
+    """
+    Content-addressed cache of GS results (intensity, phase_map).
+
+    Keys are SHA-256 digests of everything that determines a result
+    (see make_key). Entries live in an in-memory LRU bounded by
+    max_bytes and, when cache_dir is set, in compressed .npz files
+    that survive restarts. Disk writes happen on a background thread
+    (see flush). Safe to share between threads.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, cache_dir=None):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+
+        self._memory = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._writer = None
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._writer = ThreadPoolExecutor(max_workers=1)
+            self._pending = []
+
+    @staticmethod
+    def make_key(**params):
+        """
+        Digest of keyword parameters; arrays are hashed by content.
+
+        Trap lists should be passed sorted when their order does not
+        matter (traps_to_target ignores it).
+        """
+        h = hashlib.sha256()
+        for name in sorted(params):
+            value = params[name]
+            h.update(name.encode())
+            if isinstance(value, np.ndarray):
+                h.update(f"{value.dtype}{value.shape}".encode())
+                h.update(np.ascontiguousarray(value).data)
+            else:
+                h.update(json.dumps(value, sort_keys=True, default=repr).encode())
+        return h.hexdigest()
+
+    def get(self, key):
+        """
+        (intensity, phase_map) for key, or None on a miss.
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._load(key)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, intensity, phase_map):
+        entry = (intensity, phase_map)
+        with self._lock:
+            self._remember(key, entry)
+            if self._writer is not None:
+                self._pending = [f for f in self._pending if not f.done()]
+                self._pending.append(self._writer.submit(self._store, key, entry))
+
+    def flush(self):
+        """
+        Wait until queued disk writes are done.
+        """
+        if self._writer is None:
+            return
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result()
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached result for key, else compute() → (intensity, phase_map).
+        """
+        entry = self.get(key)
+        if entry is None:
+            entry = compute()
+            self.put(key, *entry)
+        return entry
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+            }
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+
+        if disk and self.cache_dir is not None:
+            self.flush()
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    # ---------------------
+    # tiers
+    # ---------------------
+
+    def _remember(self, key, entry):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+
+        self._memory[key] = entry
+        self._bytes += sum(a.nbytes for a in entry)
+
+        while self._bytes > self.max_bytes and len(self._memory) > 1:
+            _, old = self._memory.popitem(last=False)
+            self._bytes -= sum(a.nbytes for a in old)
+            self.evictions += 1
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".npz")
+
+    def _load(self, key):
+        if self.cache_dir is None:
+            return None
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(path) as data:
+                # back to the dtype the entry was computed in (files
+                # written before it was recorded are double precision)
+                dtype = np.dtype(str(data["dtype"])) if "dtype" in data else np.float64
+                return (
+                    data["intensity"].astype(dtype),
+                    data["phase_map"].astype(dtype),
+                )
+        except (OSError, KeyError, ValueError, TypeError):
+            # truncated or foreign file: treat as a miss
+            return None
+
+    def _store(self, key, entry):
+        intensity, phase_map = entry
+
+        # float32 keeps ~1e-7 rad, far below any SLM's phase resolution
+        tmp = self._path(key) + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(
+                f,
+                intensity=intensity.astype(np.float32),
+                phase_map=phase_map.astype(np.float32),
+                dtype=np.array(phase_map.dtype.str),
+            )
+        os.replace(tmp, self._path(key))
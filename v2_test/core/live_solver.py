@@ -0,0 +1,133 @@
+import threading
+import time
+
+from core.gs_algorithm import gaussian_beam, get_engine, random_phase_masks
+
+
+class AnytimeSolver:
+    """
+    Background GS that keeps refining while the traps change.
+
+    Trap edits (set_traps) only swap the target; the field is kept, so
+    every frame warm-starts from the previous phase map. Each frame
+    runs at most `budget` iterations and then publishes the phase,
+    read with latest(). Once a layout has converged the thread sleeps
+    until the next edit.
+    """
+
+    def __init__(self, nx, ny, budget=4, fps=60.0, tol=1e-4, sigma=0.45,
+                 precision="double", oversample=1, fast_len=False):
+        self.nx = nx
+        self.ny = ny
+        self.precision = precision
+        self.oversample = oversample
+        self.fast_len = fast_len
+        self.budget = budget
+        self.frame_time = 1.0 / fps
+        self.tol = tol
+        self.sigma = sigma
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+        self._traps = []
+        self._traps_version = 0
+        self._init_mask = None
+
+        self._phase = None
+        self._phase_version = 0
+
+    # ---------------------
+    # GUI side
+    # ---------------------
+
+    def start(self, init_mask=None):
+        """
+        Start the solver thread; init_mask seeds the first frame.
+        """
+        if self._running:
+            return
+
+        self._init_mask = init_mask
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def set_traps(self, traps):
+        with self._lock:
+            self._traps = list(traps)
+            self._traps_version += 1
+        self._wake.set()
+
+    def latest(self):
+        """
+        (version, phase_map) of the newest frame; phase_map is None
+        before the first frame. The version increases per frame.
+        """
+        with self._lock:
+            return self._phase_version, self._phase
+
+    # ---------------------
+    # solver thread
+    # ---------------------
+
+    def _loop(self):
+        engine = get_engine(
+            self.nx, self.ny, self.precision, self.oversample, self.fast_len
+        )
+        source = gaussian_beam(self.nx, self.ny, self.sigma, self.precision)
+
+        init_mask = self._init_mask
+        if init_mask is None:
+            init_mask = random_phase_masks(1, self.nx, self.ny, precision=self.precision)[0]
+        engine.seed(source, init_mask)
+        self._init_mask = None
+
+        solved_version = None
+        seen_version = None
+        target = None
+
+        while self._running:
+            with self._lock:
+                traps = self._traps
+                version = self._traps_version
+
+            if not traps or version == solved_version:
+                # nothing to do until the next edit
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            frame_start = time.perf_counter()
+
+            if version != seen_version:
+                target = engine.target(traps)
+                seen_version = version
+
+            report = engine.iterate(
+                source, target, self.budget,
+                tol=self.tol, check_every=max(1, self.budget // 2)
+            )
+
+            phase = engine.phase()
+            with self._lock:
+                self._phase = phase
+                self._phase_version += 1
+
+            if report.stop_reason == "converged":
+                solved_version = version
+
+            # leave the rest of the frame to the GUI
+            remaining = self.frame_time - (time.perf_counter() - frame_start)
+            if remaining > 0:
+                self._wake.wait(remaining)
+                self._wake.clear()
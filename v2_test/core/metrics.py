@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def trap_intensities(intensity, target):
+    """
+    Intensity values at the non-zero pixels of target.
+    """
+    return intensity[target > 0]
+
+
+def uniformity(intensity, target):
+    """
+    Trap uniformity 1 - (Imax - Imin) / (Imax + Imin).
+
+    1.0 means all traps are equally bright.
+    """
+    vals = trap_intensities(intensity, target)
+    if vals.size == 0:
+        return 0.0
+
+    hi = vals.max()
+    lo = vals.min()
+    if hi + lo == 0:
+        return 0.0
+    return float(1 - (hi - lo) / (hi + lo))
+
+
+def efficiency(intensity, target):
+    """
+    Fraction of the focal plane power that lands in the traps.
+    """
+    total = intensity.sum()
+    if total == 0:
+        return 0.0
+    return float(trap_intensities(intensity, target).sum() / total)
+
+
+def correlation(intensity, target):
+    """
+    Pearson correlation between intensity and target over all pixels.
+    """
+    a = intensity.ravel() - intensity.mean()
+    b = target.ravel() - target.mean()
+    denom = np.sqrt(np.dot(a, a) * np.dot(b, b))
+    if denom == 0:
+        return 0.0
+    return float(np.dot(a, b) / denom)
+
+
+METRICS = {
+    "uniformity": uniformity,
+    "efficiency": efficiency,
+    "correlation": correlation,
+}
+
+
+def score(intensity, target, metric="uniformity"):
+    """
+    Evaluate a named metric (higher is better).
+    """
+    try:
+        fn = METRICS[metric]
+    except KeyError:
+        raise ValueError(
+            f"unknown metric {metric!r}, expected one of {sorted(METRICS)}"
+        ) from None
+    return fn(intensity, target)
@@ -0,0 +1,185 @@
+"""
+Named timing spans for the hologram pipeline.
+
+    from core import profiling
+
+    profiling.enable()
+    with profiling.span("fft"):
+        ...
+    profiling.stats()                       # per-span totals
+    profiling.histogram("fft")              # duration histogram (ms)
+    profiling.export_chrome_trace("trace.json")
+
+While disabled, span() returns a shared no-op context manager, so an
+instrumented call costs one function call and a flag check.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+# spans kept for the timeline; totals and histograms keep every span
+MAX_EVENTS = 200_000
+
+_enabled = False
+_durations = defaultdict(list)
+_events = deque(maxlen=MAX_EVENTS)
+_origin = time.perf_counter()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        # list.append / deque.append are atomic, no lock needed
+        _durations[self.name].append(end - self.start)
+        _events.append((self.name, self.start, end, threading.get_ident()))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """
+    Context manager timing the enclosed block as `name`.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def profiled(name):
+    """
+    Decorator form of span().
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---------------------
+# control
+# ---------------------
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """
+    Forget all recorded spans (e.g. at the start of a run).
+    """
+    _durations.clear()
+    _events.clear()
+
+
+# ---------------------
+# results
+# ---------------------
+
+def stats():
+    """
+    {name: {count, total_ms, mean_ms, min_ms, p50_ms, p95_ms, max_ms}},
+    sorted by total time, largest first.
+    """
+    out = {}
+    for name, values in list(_durations.items()):
+        ms = np.asarray(values) * 1000
+        if not ms.size:
+            continue
+        p50, p95 = np.percentile(ms, (50, 95))
+        out[name] = {
+            "count": int(ms.size),
+            "total_ms": float(ms.sum()),
+            "mean_ms": float(ms.mean()),
+            "min_ms": float(ms.min()),
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "max_ms": float(ms.max()),
+        }
+    return dict(sorted(out.items(), key=lambda kv: -kv[1]["total_ms"]))
+
+
+def histogram(name, bins=20):
+    """
+    (counts, edges_ms) of the recorded durations of one span.
+    """
+    ms = np.asarray(_durations.get(name, ())) * 1000
+    return np.histogram(ms, bins=bins)
+
+
+def format_stats(limit=None):
+    """
+    stats() as aligned text lines, for logs and the stats panel.
+    """
+    lines = []
+    for name, s in list(stats().items())[:limit]:
+        lines.append(
+            f"{name:<18} {s['count']:>6}x  {s['total_ms']:>9.1f} ms  "
+            f"mean {s['mean_ms']:.3f}  p95 {s['p95_ms']:.3f}"
+        )
+    return "\n".join(lines)
+
+
+def chrome_trace():
+    """
+    Recorded spans in the Chrome trace event format
+    (chrome://tracing, Perfetto).
+    """
+    pid = os.getpid()
+    events = [
+        {
+            "name": name,
+            "ph": "X",
+            "ts": (start - _origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": pid,
+            "tid": tid,
+        }
+        for name, start, end, tid in list(_events)
+    ]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path):
+    with open(path, "w") as f:
+        json.dump(chrome_trace(), f)
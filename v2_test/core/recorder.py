@@ -0,0 +1,553 @@
+"""
+Streaming experiment recorder.
+
+A recording is a directory of append-only streams:
+
+    session.json          shapes, chunk sizes, settings
+    camera_00000.npy …    uint8 (chunk, h, w) frame chunks (memory mapped)
+    camera.idx            one (number, timestamp) record per frame
+    phase_00000.npy …     uint8 (chunk, ny, nx) quantised phase maps
+    phase.idx             one (number, timestamp) record per phase map
+    traps.f32             (x, y) float32 pairs of every trap list
+    traps.idx             one (offset, count, timestamp) record per list
+
+Phases are quantised to PHASE_LEVELS steps over [-π, π) (level 0 at
+-π, as the linear SLM LUT), so phase = level * 2π / 256 - π.
+
+    recorder = Recorder("recordings/run1", camera_shape=(h, w), phase_shape=(ny, nx))
+    recorder.start()
+    recorder.attach_camera(camera.ring)     # every camera frame
+    recorder.record_phase(phase)            # every hologram shown
+    recorder.record_traps(traps)
+    recorder.stop()
+
+All disk writes happen on one writer thread behind a bounded queue of
+preallocated buffers: a stalled disk blocks producers for at most
+`block_timeout` seconds, after which items are dropped and counted
+(stats()). A write error (e.g. a full disk) ends the writer; from
+then on items are dropped at once and stop() raises the error.
+Chunks are written through memory maps that are flushed
+and released as they fill, so memory use stays flat however long the
+session runs. Index records are only appended after their data, so a
+recording cut short by a crash reads back up to its last index entry.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+PHASE_LEVELS = 256
+
+# target size of one data chunk file
+CHUNK_BYTES = 256 * 2**20
+
+# flush dirty pages of the open chunks this often (seconds)
+FLUSH_INTERVAL = 1.0
+
+# seconds stop() waits for the writer to empty the queue
+STOP_TIMEOUT = 30.0
+
+# chunk files a reader keeps mapped (least recently used are closed)
+MAX_OPEN_CHUNKS = 16
+
+FORMAT_VERSION = 1
+
+INDEX_DTYPE = np.dtype([("number", "<i8"), ("timestamp", "<f8")])
+TRAPS_INDEX_DTYPE = np.dtype([("offset", "<i8"), ("count", "<i8"), ("timestamp", "<f8")])
+
+
+def quantise_phase(phase, out=None):
+    """
+    Phase (radians) → uint8 levels over [-π, π), wrapped.
+    """
+    levels = np.multiply(phase, PHASE_LEVELS / (2 * np.pi), dtype=np.float32)
+    levels += PHASE_LEVELS / 2 + 0.5
+    levels = np.floor(levels, out=levels)
+    if out is None:
+        out = np.empty(phase.shape, dtype=np.uint8)
+    # uint8 wrap-around is the modulo 2π
+    np.copyto(out, levels.astype(np.int64, copy=False), casting="unsafe")
+    return out
+
+
+def dequantise_phase(levels):
+    return levels.astype(np.float32) * np.float32(2 * np.pi / PHASE_LEVELS) - np.float32(np.pi)
+
+
+def chunk_frames(shape, chunk_bytes=CHUNK_BYTES):
+    """
+    Frames per chunk file for uint8 frames of `shape`.
+    """
+    return max(1, chunk_bytes // int(np.prod(shape)))
+
+
+# ---------------------
+# streams
+# ---------------------
+
+class FrameStream:
+    """
+    Append-only uint8 frame stream: memory-mapped chunk files plus an
+    index file of (number, timestamp) records.
+    """
+
+    def __init__(self, path, name, shape, chunk):
+        self.path = path
+        self.name = name
+        self.shape = tuple(shape)
+        self.chunk = chunk
+        self.count = 0
+
+        self._map = None
+        self._index = open(os.path.join(path, f"{name}.idx"), "ab")
+
+    def chunk_path(self, i):
+        return os.path.join(self.path, f"{self.name}_{i:05d}.npy")
+
+    def slot(self):
+        """
+        Memory-mapped array to write the next frame into.
+        """
+        i, j = divmod(self.count, self.chunk)
+        if j == 0:
+            self._release()
+            self._map = np.lib.format.open_memmap(
+                self.chunk_path(i), mode="w+", dtype=np.uint8,
+                shape=(self.chunk,) + self.shape
+            )
+        return self._map[j]
+
+    def commit(self, number, timestamp):
+        record = np.array((number, timestamp), dtype=INDEX_DTYPE)
+        self._index.write(record.tobytes())
+        self.count += 1
+
+    def flush(self):
+        if self._map is not None:
+            self._map.flush()
+        self._index.flush()
+
+    def _release(self):
+        # a full chunk goes to disk and out of the address space
+        if self._map is not None:
+            self._map.flush()
+            self._map = None
+        self._index.flush()
+
+    def close(self):
+        self._release()
+        self._index.close()
+
+
+class TrapStream:
+    """
+    Append-only variable-length trap lists: float32 (x, y) pairs plus
+    (offset, count, timestamp) index records.
+    """
+
+    def __init__(self, path):
+        self._data = open(os.path.join(path, "traps.f32"), "ab")
+        self._index = open(os.path.join(path, "traps.idx"), "ab")
+        self.count = 0
+        self.points = 0
+
+    def append(self, traps, timestamp):
+        self._data.write(traps.tobytes())
+        record = np.array((self.points, len(traps), timestamp), dtype=TRAPS_INDEX_DTYPE)
+        self._index.write(record.tobytes())
+        self.points += len(traps)
+        self.count += 1
+
+    def flush(self):
+        self._data.flush()
+        self._index.flush()
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+
+# ---------------------
+# recorder
+# ---------------------
+
+class Recorder:
+    """
+    Records camera frames, phase maps and trap lists of one session
+    into the directory `path` (created; must not hold a recording).
+
+    camera_shape / phase_shape: (height, width) of the frames; None
+    disables that stream. queue_size: items buffered between producers
+    and the writer (each camera or phase item holds one preallocated
+    frame buffer). block_timeout: seconds a producer waits for queue
+    space before the item is dropped.
+    """
+
+    def __init__(self, path, camera_shape=None, phase_shape=None, queue_size=64,
+                 block_timeout=0.5, chunk_bytes=CHUNK_BYTES, metadata=None):
+        if os.path.exists(os.path.join(path, "session.json")):
+            raise ValueError(f"{path} already holds a recording")
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.block_timeout = block_timeout
+
+        self.streams = {}
+        self._free = {}
+        for name, shape in (("camera", camera_shape), ("phase", phase_shape)):
+            if shape is None:
+                continue
+            self.streams[name] = FrameStream(path, name, shape, chunk_frames(shape, chunk_bytes))
+            pool = self._free[name] = queue.Queue()
+            for _ in range(queue_size):
+                pool.put(np.empty(shape, dtype=np.uint8))
+        self.traps = TrapStream(path)
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._writer = None
+        self._feeder = None
+        self._feeding = False
+        self._abort = False
+        self._start_time = None
+
+        # exception that ended the writer thread, raised by stop()
+        self.error = None
+
+        # back-pressure statistics
+        self.dropped = {"camera": 0, "phase": 0, "traps": 0}
+        self.camera_missed = 0
+        self.max_depth = 0
+        self.blocked = 0.0
+        self.written_bytes = 0
+
+        self._write_session(metadata or {})
+
+    def _write_session(self, metadata):
+        session = {
+            "version": FORMAT_VERSION,
+            "created": time.time(),
+            "phase_levels": PHASE_LEVELS,
+            "streams": {
+                name: {"shape": list(s.shape), "chunk": s.chunk}
+                for name, s in self.streams.items()
+            },
+            "metadata": metadata,
+        }
+        with open(os.path.join(self.path, "session.json"), "w") as f:
+            json.dump(session, f, indent=4)
+
+    # ---------------------
+    # producer side
+    # ---------------------
+
+    def start(self):
+        if self._writer is not None:
+            return
+        self._start_time = time.perf_counter()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def is_recording(self):
+        return self._writer is not None
+
+    def _accepting(self, name):
+        # after a write error nothing would take items off the queue
+        if self.error is not None:
+            self.dropped[name] += 1
+            return False
+        return True
+
+    def _buffer(self, name):
+        try:
+            return self._free[name].get(timeout=self.block_timeout)
+        except queue.Empty:
+            return None
+
+    def _put(self, name, item):
+        start = time.perf_counter()
+        try:
+            self._queue.put(item, timeout=self.block_timeout)
+        except queue.Full:
+            self.dropped[name] += 1
+            return False
+        finally:
+            self.blocked += time.perf_counter() - start
+        self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _record_frame(self, name, fill, number, timestamp):
+        if self._writer is None or name not in self.streams:
+            return False
+        if not self._accepting(name):
+            return False
+        start = time.perf_counter()
+        buf = self._buffer(name)
+        self.blocked += time.perf_counter() - start
+        if buf is None:
+            self.dropped[name] += 1
+            return False
+        fill(buf)
+        if not self._put(name, (name, buf, number, timestamp)):
+            self._free[name].put(buf)
+            return False
+        return True
+
+    def record_frame(self, image, timestamp=None, number=-1):
+        """
+        Queue one camera frame (copied; the caller may reuse image).
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        return self._record_frame("camera", lambda buf: np.copyto(buf, image), number, timestamp)
+
+    def record_phase(self, phase, timestamp=None, number=-1):
+        """
+        Queue one phase map shown on the SLM, quantised to uint8.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        return self._record_frame(
+            "phase", lambda buf: quantise_phase(phase, out=buf), number, timestamp
+        )
+
+    def record_traps(self, traps, timestamp=None):
+        """
+        Queue one trap list (N x (x, y)).
+        """
+        if self._writer is None or not self._accepting("traps"):
+            return False
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        traps = np.asarray(traps, dtype=np.float32).reshape(-1, 2)
+        return self._put("traps", ("traps", traps, -1, timestamp))
+
+    def attach_camera(self, ring):
+        """
+        Record every frame of a camera FrameRing from now on (one
+        feeder thread; frames the feeder misses count in camera_missed).
+        """
+        self.detach_camera()
+        self._feeding = True
+        self._feeder = threading.Thread(target=self._feed, args=(ring,), daemon=True)
+        self._feeder.start()
+
+    def detach_camera(self):
+        self._feeding = False
+        if self._feeder is not None:
+            self._feeder.join()
+            self._feeder = None
+
+    def _feed(self, ring):
+        reader = ring.reader()
+        while self._feeding:
+            frame = reader.get(timeout=0.1)
+            if frame is None:
+                if ring.closed:
+                    break
+                continue
+            self.record_frame(frame.image, frame.timestamp, frame.number)
+            self.camera_missed = reader.dropped
+        self._feeding = False
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Write everything queued, close the files.
+
+        Raises the error that ended the writer, if any. A writer still
+        busy after `timeout` seconds drops the rest of the queue.
+        """
+        self.detach_camera()
+        if self._writer is None:
+            return
+
+        # the queue may be full, and never drain if the writer died
+        while self._writer.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+
+        self._writer.join(timeout)
+        if self._writer.is_alive():
+            self._abort = True
+            self._writer.join(timeout)
+            if self._writer.is_alive() and self.error is None:
+                self.error = TimeoutError(f"writer of {self.path} did not finish")
+        writer_done = not self._writer.is_alive()
+        self._writer = None
+
+        # items left behind by an aborted or failed writer
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item:
+                self.dropped[item[0]] += 1
+
+        # a writer stuck in a write keeps its files; closing them under it is unsafe
+        if writer_done:
+            try:
+                for stream in self.streams.values():
+                    stream.close()
+                self.traps.close()
+            except OSError as e:
+                if self.error is None:
+                    self.error = e
+
+        if self.error is not None:
+            raise self.error
+
+    # ---------------------
+    # writer
+    # ---------------------
+
+    def _write_loop(self):
+        try:
+            self._write_items()
+        except Exception as e:
+            self.error = e
+
+    def _write_items(self):
+        last_flush = time.perf_counter()
+        while not self._abort:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                item = False
+
+            if item:
+                name, data, number, timestamp = item
+                if name == "traps":
+                    self.traps.append(data, timestamp)
+                else:
+                    stream = self.streams[name]
+                    np.copyto(stream.slot(), data)
+                    stream.commit(number, timestamp)
+                    self._free[name].put(data)
+                self.written_bytes += data.nbytes
+
+            now = time.perf_counter()
+            if item is None or now - last_flush >= FLUSH_INTERVAL:
+                for stream in self.streams.values():
+                    stream.flush()
+                self.traps.flush()
+                last_flush = now
+            if item is None:
+                break
+
+    def stats(self):
+        """
+        {written, dropped, camera_missed, queue, max_queue, blocked_s,
+        mb_per_s} so far.
+        """
+        written = {name: s.count for name, s in self.streams.items()}
+        written["traps"] = self.traps.count
+        elapsed = time.perf_counter() - self._start_time if self._start_time else 0.0
+        return {
+            "written": written,
+            "dropped": dict(self.dropped),
+            "camera_missed": self.camera_missed,
+            "queue": self._queue.qsize(),
+            "max_queue": self.max_depth,
+            "blocked_s": self.blocked,
+            "mb_per_s": self.written_bytes / 2**20 / elapsed if elapsed else 0.0,
+        }
+
+    def format(self):
+        if self.error is not None:
+            return f"REC failed: {self.error}"
+        s = self.stats()
+        dropped = sum(s["dropped"].values()) + s["camera_missed"]
+        return (
+            f"REC {s['written'].get('camera', 0)} frames, "
+            f"{s['written'].get('phase', 0)} holograms  "
+            f"queue {s['queue']}/{self._queue.maxsize}  "
+            f"{s['mb_per_s']:.0f} MB/s  {dropped} dropped"
+        )
+
+
+# ---------------------
+# reading
+# ---------------------
+
+class Recording:
+    """
+    Read-only view of a recording directory (also of one still being
+    written or cut short: only indexed entries are visible).
+
+    recording.camera / recording.phase are FrameStreamReaders (None if
+    not recorded); trap_list(i) returns the i-th recorded trap list.
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, "session.json")) as f:
+            self.session = json.load(f)
+        self.path = path
+
+        streams = self.session["streams"]
+        self.camera = FrameStreamReader(path, "camera", **streams["camera"]) \
+            if "camera" in streams else None
+        self.phase = FrameStreamReader(path, "phase", **streams["phase"]) \
+            if "phase" in streams else None
+
+        self.trap_index = _read_index(os.path.join(path, "traps.idx"), TRAPS_INDEX_DTYPE)
+        data_path = os.path.join(path, "traps.f32")
+        points = os.path.getsize(data_path) // 8 if os.path.exists(data_path) else 0
+        self._trap_points = np.memmap(data_path, dtype=np.float32, mode="r",
+                                      shape=(points, 2)) if points else np.zeros((0, 2), np.float32)
+
+    def trap_list(self, i):
+        offset, count, _ = self.trap_index[i]
+        return np.asarray(self._trap_points[offset:offset + count])
+
+
+class FrameStreamReader:
+    """
+    Frames of one stream, memory mapped chunk by chunk on access;
+    indexing returns a read-only view, so only frames actually used
+    are read from disk.
+    """
+
+    def __init__(self, path, name, shape, chunk):
+        self.path = path
+        self.name = name
+        self.shape = tuple(shape)
+        self.chunk = chunk
+        self.index = _read_index(os.path.join(path, f"{name}.idx"), INDEX_DTYPE)
+        self.timestamps = self.index["timestamp"]
+        self.numbers = self.index["number"]
+        self._maps = OrderedDict()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"{self.name} frame {i} of {len(self)}")
+        c, j = divmod(i % len(self), self.chunk)
+        chunk = self._maps.get(c)
+        if chunk is None:
+            chunk = self._maps[c] = np.load(
+                os.path.join(self.path, f"{self.name}_{c:05d}.npy"), mmap_mode="r"
+            )
+            if len(self._maps) > MAX_OPEN_CHUNKS:
+                self._maps.popitem(last=False)
+        else:
+            self._maps.move_to_end(c)
+        return chunk[j]
+
+
+def _read_index(path, dtype):
+    if not os.path.exists(path):
+        return np.zeros(0, dtype=dtype)
+    # a partly written last record (crash) is ignored
+    count = os.path.getsize(path) // dtype.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
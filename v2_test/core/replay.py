@@ -0,0 +1,149 @@
+"""
+Replay of recorded sessions (core.recorder).
+
+SessionReplay puts the camera, phase and trap streams of a Recording
+on one timeline (seconds from the first recorded entry) and finds the
+entry shown at any time with a binary search over the memory-mapped
+indexes; frames are read from their chunk maps only when asked for,
+so seeking costs the same in a 50 GB recording as in a small one.
+
+ReplayCamera is a CameraDriver playing the camera stream back at the
+recorded rate, so a replay runs through CameraAcquisition, the live
+view, tracking and closed-loop code exactly like a camera:
+
+    replay = SessionReplay(Recording(path))
+    camera = CameraAcquisition(ReplayCamera(replay))
+    camera.start()
+    camera.driver.seek(12.5)
+"""
+import threading
+import time
+
+import numpy as np
+
+from core.camera import CameraDriver
+from core.recorder import dequantise_phase
+
+
+class SessionReplay:
+    """
+    Random access to a Recording by time.
+    """
+
+    def __init__(self, recording):
+        self.recording = recording
+        # streams with at least one entry, else None
+        self.camera = recording.camera if recording.camera is not None and \
+            len(recording.camera) else None
+        self.phases = recording.phase if recording.phase is not None and \
+            len(recording.phase) else None
+
+        starts = [s.timestamps[0] for s in (self.camera, self.phases) if s is not None]
+        ends = [s.timestamps[-1] for s in (self.camera, self.phases) if s is not None]
+        if not starts:
+            raise ValueError(f"{recording.path} has no frames")
+        self.start = min(starts)
+        self.duration = max(ends) - self.start
+
+        # timelines relative to the start (8 bytes per entry)
+        self._times = {
+            "camera": None if self.camera is None else self.camera.timestamps - self.start,
+            "phase": None if self.phases is None else self.phases.timestamps - self.start,
+            "traps": recording.trap_index["timestamp"] - self.start,
+        }
+
+    def index_at(self, stream, t):
+        """
+        Index of the last `stream` entry recorded at or before time t
+        ("camera", "phase" or "traps"), or -1 if none yet / not recorded.
+        """
+        times = self._times[stream]
+        if times is None or not len(times):
+            return -1
+        return int(np.searchsorted(times, t, side="right")) - 1
+
+    def time_of(self, stream, i):
+        return float(self._times[stream][i])
+
+    def camera_frame(self, i):
+        """
+        uint8 camera frame i (a read-only view of the chunk map).
+        """
+        return self.camera[i]
+
+    def phase_levels(self, i):
+        """
+        Quantised phase map i: uint8 levels over [-π, π), i.e. grey
+        levels of a linear SLM LUT.
+        """
+        return self.phases[i]
+
+    def phase(self, i):
+        return dequantise_phase(self.phases[i])
+
+    def traps(self, i):
+        return self.recording.trap_list(i)
+
+    def traps_at(self, t):
+        """
+        Trap list in effect at time t (the first one before it was
+        recorded; empty if the session has none).
+        """
+        if not len(self.recording.trap_index):
+            return np.zeros((0, 2), dtype=np.float32)
+        return self.traps(max(self.index_at("traps", t), 0))
+
+    def frame_rate(self):
+        """
+        Mean recorded camera rate.
+        """
+        times = self._times["camera"]
+        if times is None or len(times) < 2 or times[-1] <= times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+
+class ReplayCamera(CameraDriver):
+    """
+    Camera driver playing back the camera stream of a SessionReplay,
+    paced at the recorded frame rate times `speed`.
+
+    position (seconds on the replay timeline) advances with every
+    grabbed frame unless paused; seek() jumps anywhere. index is the
+    recorded frame the last grab delivered.
+    """
+
+    def __init__(self, replay, speed=1.0, loop=True):
+        if replay.camera is None:
+            raise ValueError("the recording has no camera frames")
+        height, width = replay.camera.shape
+        super().__init__(width, height, replay.frame_rate() or 100.0)
+        self.replay = replay
+        self.speed = speed
+        self.loop = loop
+
+        self.position = replay.time_of("camera", 0)
+        self.index = -1
+        self.paused = False
+
+        self._lock = threading.Lock()
+
+    def seek(self, t):
+        with self._lock:
+            self.position = min(max(t, 0.0), self.replay.duration)
+
+    def set_paused(self, paused):
+        self.paused = paused
+
+    def grab(self, out):
+        self.pace()
+        with self._lock:
+            index = max(self.replay.index_at("camera", self.position), 0)
+            if not self.paused:
+                self.position += self.speed / self.fps
+                if self.position > self.replay.duration:
+                    self.position = 0.0 if self.loop else self.replay.duration
+
+        np.copyto(out, self.replay.camera_frame(index))
+        self.index = index
+        return time.perf_counter()
@@ -0,0 +1,295 @@
+"""
+Hologram sequences for moving traps.
+
+A trajectory is any iterable of trap layouts, each a list of (x, y)
+in the centered coordinates of AppState.clicked_points; linear_path,
+waypoint_path and rotation_path build the common ones lazily.
+
+hologram_frames turns layouts into phase maps, warm-starting every
+frame from the previous one, and HologramSequencer computes frames
+ahead of playback on worker threads into a bounded queue.
+"""
+import itertools
+import queue
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core.gs_algorithm import gaussian_beam, get_engine
+from core.superposition import SuperpositionEngine
+
+
+Frame = namedtuple("Frame", "index traps phase report")
+
+
+# ---------------------
+# trajectories
+# ---------------------
+
+def linear_path(start, end, steps):
+    """
+    Every trap moves in a straight line from start to end.
+
+    Yields steps + 1 layouts, both ends included.
+    """
+    start = np.asarray(start, dtype=float).reshape(-1, 2)
+    end = np.asarray(end, dtype=float).reshape(-1, 2)
+    if start.shape != end.shape:
+        raise ValueError("start and end need the same number of traps")
+
+    delta = end - start
+    for i in range(steps + 1):
+        t = i / steps if steps else 1.0
+        yield [tuple(p) for p in (start + t * delta).tolist()]
+
+
+def waypoint_path(waypoints, steps):
+    """
+    Piecewise linear path through a list of layouts, `steps` frames
+    per segment.
+    """
+    for i, (a, b) in enumerate(zip(waypoints, waypoints[1:])):
+        path = linear_path(a, b, steps)
+        if i:
+            # first layout of a segment is the last of the previous one
+            next(path)
+        yield from path
+
+
+def rotation_path(layout, angle, steps, center=(0, 0)):
+    """
+    Rotate a layout by `angle` radians about center in `steps` steps.
+    """
+    pts = np.asarray(layout, dtype=float).reshape(-1, 2) - center
+    for i in range(steps + 1):
+        a = angle * i / steps if steps else angle
+        c, s = np.cos(a), np.sin(a)
+        rotated = pts @ np.array([[c, s], [-s, c]]) + center
+        yield [tuple(p) for p in rotated.tolist()]
+
+
+def assign_targets(start, end):
+    """
+    Reorder `end` so trap i of start travels to end[i].
+
+    Greedy shortest-distance matching, for sorting particles into a
+    new pattern without long crossing moves.
+    """
+    start = np.asarray(start, dtype=float).reshape(-1, 2)
+    end = np.asarray(end, dtype=float).reshape(-1, 2)
+    if start.shape != end.shape:
+        raise ValueError("start and end need the same number of traps")
+
+    dist = np.linalg.norm(start[:, None, :] - end[None, :, :], axis=-1)
+    order = np.argsort(dist, axis=None)
+    points = end.tolist()
+
+    assigned = [None] * len(start)
+    used_start = set()
+    used_end = set()
+    for flat in order:
+        i, j = divmod(int(flat), len(end))
+        if i in used_start or j in used_end:
+            continue
+        assigned[i] = tuple(points[j])
+        used_start.add(i)
+        used_end.add(j)
+    return assigned
+
+
+# ---------------------
+# frames
+# ---------------------
+
+def hologram_frames(layouts, nx, ny, iterations=20, tol=1e-4, sigma=0.45,
+                    precision="double", oversample=1, fast_len=False,
+                    start_index=0, warm=False):
+    """
+    Generator of Frames, one per layout.
+
+    The first frame starts from the gratings-and-lenses hologram of
+    its layout (or from the engine's current field when warm is True);
+    every later frame warm-starts from the previous phase, so a small
+    trap step needs only a few iterations.
+    """
+    engine = get_engine(nx, ny, precision, oversample, fast_len)
+    source = gaussian_beam(nx, ny, sigma, precision)
+
+    for index, traps in enumerate(layouts, start_index):
+        init_mask = None
+        if index == start_index and not warm:
+            seed_hologram = SuperpositionEngine(nx, ny, seed=0, precision=precision)
+            seed_hologram.set_traps(traps)
+            init_mask = seed_hologram.mask()
+
+        report = engine.iterate(
+            source, engine.target(traps), iterations,
+            init_mask=init_mask, tol=tol
+        )
+        yield Frame(index, traps, engine.phase(), report)
+
+
+_DONE = object()
+
+
+class HologramSequencer:
+    """
+    Computes hologram frames ahead of playback.
+
+    Layouts are cut into chunks of `chunk` frames and solved on
+    `workers` threads; up to `depth` chunks wait, in order, in a
+    bounded queue, so the producer never runs further ahead than that.
+    With one worker every chunk continues from the previous field;
+    with more, each chunk starts from its own gratings-and-lenses
+    seed so chunks can be solved in parallel.
+
+    solver keyword arguments are passed to hologram_frames.
+    """
+
+    def __init__(self, layouts, nx, ny, workers=1, depth=4, chunk=8, **solver):
+        self.nx = nx
+        self.ny = ny
+        self.workers = workers
+        self.chunk = chunk
+        self.solver = solver
+
+        self._layouts = iter(layouts)
+        self._chunks = queue.Queue(maxsize=depth)
+        self._pending = None
+        self._frames = iter(())
+
+        self._running = False
+        self._pool = None
+        self._feeder = None
+        # set by stop(); the running chunk checks it between frames
+        self._cancel = None
+
+        # frames handed out / times a frame was not ready yet
+        self.played = 0
+        self.stalls = 0
+        self.finished = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._cancel = threading.Event()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers)
+        self._feeder = threading.Thread(target=self._feed, daemon=True)
+        self._feeder.start()
+
+    def stop(self):
+        self._running = False
+        if self._cancel is not None:
+            self._cancel.set()
+
+        # unblock the feeder and drop work that has not started
+        while True:
+            try:
+                item = self._chunks.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _DONE:
+                item.cancel()
+
+        if self._feeder is not None:
+            self._feeder.join()
+            self._feeder = None
+        if self._pool is not None:
+            # a chunk being solved ends after its current frame; it is
+            # not waited for, so stop() returns at once
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def ready(self):
+        """
+        True once the queue holds `depth` computed chunks (or the whole
+        sequence), so playback can start without stalling.
+        """
+        with self._chunks.mutex:
+            items = list(self._chunks.queue)
+
+        done = all(item is _DONE or item.done() for item in items)
+        return done and (len(items) >= self._chunks.maxsize or _DONE in items)
+
+    def next_frame(self, block=True):
+        """
+        Next Frame in order.
+
+        Returns None at the end of the sequence (finished is then set),
+        or, with block=False, when the frame is not computed yet; that
+        is counted in stalls.
+        """
+        while True:
+            frame = next(self._frames, None)
+            if frame is not None:
+                self.played += 1
+                return frame
+
+            if self.finished:
+                return None
+
+            if self._pending is None:
+                try:
+                    self._pending = self._chunks.get(block=block)
+                except queue.Empty:
+                    self.stalls += 1
+                    return None
+
+            if self._pending is _DONE:
+                self._pending = None
+                self.finished = True
+                return None
+
+            if not block and not self._pending.done():
+                self.stalls += 1
+                return None
+
+            self._frames = iter(self._pending.result())
+            self._pending = None
+
+    def __iter__(self):
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                return
+            yield frame
+
+    def _feed(self):
+        index = 0
+        while self._running:
+            layouts = list(itertools.islice(self._layouts, self.chunk))
+            if not layouts:
+                break
+
+            warm = self.workers == 1 and index > 0
+            future = self._pool.submit(self._solve, layouts, index, warm, self._cancel)
+            index += len(layouts)
+
+            if not self._put(future):
+                future.cancel()
+                return
+
+        self._put(_DONE)
+
+    def _put(self, item):
+        # bounded put that gives up once the sequencer is stopped
+        while self._running:
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _solve(self, layouts, index, warm, cancel):
+        frames = []
+        for frame in hologram_frames(
+                layouts, self.nx, self.ny,
+                start_index=index, warm=warm, **self.solver):
+            if cancel.is_set():
+                break
+            frames.append(frame)
+        return frames
@@ -0,0 +1,217 @@
+"""
+SLM output stage: phase map → calibrated 8-bit grey levels.
+
+A LUT holds the grey level of each of `size` equal phase steps over
+one 2π cycle, starting at -π (index 0). Devices calibrated per region
+use one LUT per region and a label map saying which pixel uses which.
+
+    output = SLMOutput(nx, ny, lut=load_lut("slm.lut"), dither=True)
+    frame = output.render(phase)        # uint8 (ny, nx), reused buffer
+    QImage(frame.data, nx, ny, nx, QImage.Format_Grayscale8)
+
+render() works in row blocks with preallocated scratch arrays, so a
+frame costs no allocation; the returned buffer stays valid until
+`buffers` more frames have been rendered, so it can be handed to a
+QImage or a display window without copying.
+"""
+import os
+
+import numpy as np
+
+# grey levels of an 8-bit SLM
+GREY_LEVELS = 256
+
+# phase cycles covered by the tiled LUT: phases within ±5π map
+# exactly, anything further out is clipped to the end levels
+WRAP_CYCLES = 5
+
+# rows per block: a few hundred kB of scratch, stays in cache
+BLOCK_ROWS = 64
+
+
+# ---------------------
+# LUTs
+# ---------------------
+
+def linear_lut(size=GREY_LEVELS, wrap=GREY_LEVELS):
+    """
+    Linear LUT reaching 2π at grey level `wrap` (256 for an ideal
+    8-bit SLM, less for devices that wrap early).
+    """
+    grey = np.arange(size) * (wrap / size)
+    return np.minimum(grey, GREY_LEVELS - 1).astype(np.uint8)
+
+
+def load_lut(path):
+    """
+    Calibration LUT from a file.
+
+    .npy: (size,) or (regions, size) array. Text/CSV: one grey level
+    per line, or "index value" pairs (the last column is used).
+    """
+    if os.path.splitext(path)[1] == ".npy":
+        lut = np.load(path)
+    else:
+        with open(path) as f:
+            rows = [
+                line.replace(",", " ").split()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+        lut = np.array([float(row[-1]) for row in rows])
+    return check_lut(lut)
+
+
+def check_lut(lut):
+    """
+    LUT as a (regions, size) uint8 array; raises ValueError for grey
+    levels outside 0..255.
+    """
+    lut = np.asarray(lut)
+    if lut.ndim == 1:
+        lut = lut[None, :]
+    if lut.ndim != 2 or lut.shape[1] == 0:
+        raise ValueError(f"LUT must be (size,) or (regions, size), got {lut.shape}")
+    if lut.min() < 0 or lut.max() > GREY_LEVELS - 1:
+        raise ValueError("LUT grey levels must be within 0..255")
+    return np.ascontiguousarray(np.rint(lut), dtype=np.uint8)
+
+
+def tile_regions(nx, ny, rows, cols):
+    """
+    Label map splitting the SLM into rows x cols rectangular regions,
+    numbered row by row.
+    """
+    r = np.arange(ny) * rows // ny
+    c = np.arange(nx) * cols // nx
+    return (r[:, None] * cols + c[None, :]).astype(np.intp)
+
+
+def bayer_matrix(n=8):
+    """
+    n x n ordered dither thresholds in [0, 1); n a power of two.
+    """
+    m = np.zeros((1, 1))
+    while m.shape[0] < n:
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m / m.size
+
+
+# ---------------------
+# output
+# ---------------------
+
+class SLMOutput:
+    """
+    Renders phase maps into persistent uint8 frames for an nx x ny SLM.
+
+    lut: (size,) or (regions, size) grey levels, default linear_lut().
+    regions: (ny, nx) integer label map choosing the LUT row per pixel.
+    dither: spread the quantisation error with an ordered (Bayer)
+    pattern instead of rounding every pixel to the nearest LUT step.
+    buffers: frames kept alive (2 = double buffering).
+    """
+
+    def __init__(self, nx, ny, lut=None, regions=None, dither=False, buffers=2):
+        self.nx = nx
+        self.ny = ny
+        self.dither = dither
+
+        self._frames = [np.zeros((ny, nx), dtype=np.uint8) for _ in range(buffers)]
+        self._next = 0
+        self.frame = self._frames[-1]
+
+        rows = min(BLOCK_ROWS, ny)
+        self._scaled = np.empty((rows, nx), dtype=np.float32)
+        self._index = np.empty((rows, nx), dtype=np.intp)
+
+        # threshold added before truncation: 0.5 rounds, Bayer dithers
+        # (BLOCK_ROWS is a multiple of 8, so one block pattern fits all)
+        if dither:
+            reps = (-(-rows // 8), -(-nx // 8))
+            self._threshold = np.tile(bayer_matrix(8), reps)[:rows, :nx].astype(np.float32)
+        else:
+            self._threshold = None
+
+        self.set_lut(linear_lut() if lut is None else lut, regions)
+
+    def set_lut(self, lut, regions=None):
+        lut = check_lut(lut)
+        regions_needed = lut.shape[0] > 1
+
+        if regions_needed != (regions is not None):
+            raise ValueError("a LUT per region needs a region map, and only then")
+        if regions is not None:
+            regions = np.asarray(regions)
+            if regions.shape != (self.ny, self.nx):
+                raise ValueError(
+                    f"region map is {regions.shape}, SLM is {(self.ny, self.nx)}"
+                )
+            if regions.min() < 0 or regions.max() >= lut.shape[0]:
+                raise ValueError("region labels must index the LUT rows")
+
+        self.lut = lut
+        self.size = lut.shape[1]
+
+        # each LUT repeated over WRAP_CYCLES phase cycles so any phase
+        # within range indexes it directly, without a modulo pass
+        self._flat_lut = np.tile(lut, WRAP_CYCLES).ravel()
+        # offset into the flattened LUT per pixel
+        span = self.size * WRAP_CYCLES
+        self._region_offset = None if regions is None else (regions * span).astype(np.intp)
+
+        # phase → LUT index: -π lands on index 0 of the middle cycle
+        self._scale = np.float32(self.size / (2 * np.pi))
+        self._offset = np.float32(
+            self.size * (WRAP_CYCLES // 2 + 0.5) + (0 if self.dither else 0.5)
+        )
+
+    def render(self, phase):
+        """
+        Grey-level frame of `phase` (radians, within ±5π) in the next
+        buffer; returns that buffer.
+        """
+        if phase.shape != (self.ny, self.nx):
+            raise ValueError(f"phase is {phase.shape}, SLM is {(self.ny, self.nx)}")
+
+        out = self._frames[self._next]
+        self._next = (self._next + 1) % len(self._frames)
+
+        rows = self._scaled.shape[0]
+        for r in range(0, self.ny, rows):
+            n = min(rows, self.ny - r)
+            scaled = self._scaled[:n]
+            index = self._index[:n]
+
+            np.multiply(phase[r:r + n], self._scale, out=scaled)
+            np.add(scaled, self._offset, out=scaled)
+            if self._threshold is not None:
+                np.add(scaled, self._threshold[:n], out=scaled)
+
+            np.copyto(index, scaled, casting="unsafe")
+            if self._region_offset is not None:
+                np.add(index, self._region_offset[r:r + n], out=index)
+
+            np.take(self._flat_lut, index, out=out[r:r + n], mode="clip")
+
+        self.frame = out
+        return out
+
+
+def output_for(nx, ny, lut_path="", wrap=GREY_LEVELS, dither=False):
+    """
+    SLMOutput from AppState-style settings (LUT file or linear LUT
+    wrapping at grey level `wrap`).
+    """
+    lut = load_lut(lut_path) if lut_path else linear_lut(wrap=wrap)
+    return SLMOutput(nx, ny, lut, dither=dither)
+
+
+def phase_to_grey(phase, lut=None, regions=None, dither=False):
+    """
+    One-off render into a new array (for files; use SLMOutput for
+    repeated frames).
+    """
+    ny, nx = phase.shape
+    output = SLMOutput(nx, ny, lut, regions, dither, buffers=1)
+    return output.render(phase)
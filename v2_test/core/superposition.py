@@ -0,0 +1,155 @@
+import numpy as np
+
+from core.gs_algorithm import precision_dtypes
+
+
+class SuperpositionEngine:
+    """
+    Gratings-and-lenses hologram for point traps.
+
+    The SLM field is the sum of one linear phase grating per trap,
+    each with a random constant phase to avoid symmetric ghost traps;
+    the hologram is its argument. The complex sum is kept, so adding,
+    moving or removing one trap is a single O(pixels) update.
+
+    Trap coordinates are the centered pixel offsets used by
+    traps_to_target, so the result is a valid GS starting phase.
+    Grating phases are evaluated in double and stored at `precision`.
+    """
+
+    def __init__(self, nx, ny, seed=None, precision="double"):
+        self.nx = nx
+        self.ny = ny
+
+        self.precision = precision
+        cplx = precision_dtypes(precision)[1]
+        self.field = np.zeros((ny, nx), dtype=cplx)
+        self._scratch = np.empty((16, nx), dtype=cplx)
+
+        # per-trap state, same order as AppState.clicked_points
+        self.positions = []
+        self.offsets = []
+
+        self._rng = np.random.default_rng(seed)
+
+        # 2π * pixel / N along each axis
+        self._u = 2 * np.pi * np.arange(nx) / nx
+        self._v = 2 * np.pi * np.arange(ny) / ny
+
+    def __len__(self):
+        return len(self.positions)
+
+    # ---------------------
+    # incremental edits
+    # ---------------------
+
+    def append(self, x, y):
+        offset = self._rng.uniform(0, 2 * np.pi)
+        self.positions.append((x, y))
+        self.offsets.append(offset)
+        self._accumulate((x, y, offset, 1))
+
+    def pop(self):
+        x, y = self.positions.pop()
+        offset = self.offsets.pop()
+        self._accumulate((x, y, offset, -1))
+
+    def update(self, index, x, y):
+        old_x, old_y = self.positions[index]
+        if (old_x, old_y) == (x, y):
+            return
+
+        offset = self.offsets[index]
+        self._accumulate((old_x, old_y, offset, -1), (x, y, offset, 1))
+        self.positions[index] = (x, y)
+
+    def clear(self):
+        self.positions.clear()
+        self.offsets.clear()
+        self.field.fill(0)
+
+    def set_traps(self, positions):
+        """
+        Replace all traps, rebuilding the field in one vectorised pass.
+        """
+        positions = [tuple(p) for p in positions]
+
+        # keep the phase offsets of traps that stay in the same slot
+        keep = min(len(self.offsets), len(positions))
+        extra = self._rng.uniform(0, 2 * np.pi, len(positions) - keep)
+
+        self.positions = positions
+        self.offsets = self.offsets[:keep] + list(extra)
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Recompute the field from scratch (also clears rounding drift).
+        """
+        if not self.positions:
+            self.field.fill(0)
+            return
+
+        pos = np.asarray(self.positions, dtype=float)
+        offsets = np.asarray(self.offsets)
+
+        # separable gratings: exp(i(x u - y v + offset)) = ex[c] * ey[r]
+        ex = np.exp(1j * (np.outer(pos[:, 0], self._u) + offsets[:, None]))
+        ey = np.exp(-1j * np.outer(pos[:, 1], self._v))
+        ex = ex.astype(self.field.dtype, copy=False)
+        ey = ey.astype(self.field.dtype, copy=False)
+
+        # sum over traps as a (ny, N) @ (N, nx) product
+        np.matmul(ey.T, ex, out=self.field)
+
+    # ---------------------
+    # output
+    # ---------------------
+
+    def phase(self):
+        """
+        SLM hologram phase in [-π, π].
+        """
+        return np.angle(self.field)
+
+    def mask(self):
+        """
+        Unit-modulus mask exp(1j * phase), usable as a GS init_mask.
+        """
+        mag = np.abs(self.field)
+        mask = np.ones_like(self.field)
+        np.divide(self.field, mag, out=mask, where=mag > 0)
+        return mask
+
+    def preview(self, step):
+        """
+        Phase of every step-th pixel, for cheap thumbnails.
+        """
+        return np.angle(self.field[::step, ::step])
+
+    def _accumulate(self, *terms):
+        """
+        field += sum of sign * grating(x, y, offset) over terms.
+
+        Works a few rows at a time so the scratch block stays in cache
+        and the field is swept once, however many terms there are.
+        """
+        gratings = []
+        for x, y, offset, sign in terms:
+            ex = np.exp(1j * (x * self._u + offset))
+            ey = np.exp(-1j * y * self._v)
+            if sign < 0:
+                ex = -ex
+            gratings.append((
+                ex.astype(self.field.dtype, copy=False),
+                ey.astype(self.field.dtype, copy=False),
+            ))
+
+        scratch = self._scratch
+        rows = scratch.shape[0]
+        for r0 in range(0, self.ny, rows):
+            block = self.field[r0:r0 + rows]
+            tmp = scratch[:block.shape[0]]
+            for ex, ey in gratings:
+                np.multiply(ey[r0:r0 + rows, None], ex, out=tmp)
+                np.add(block, tmp, out=block)
@@ -0,0 +1,212 @@
+"""
+Parameter sweep for GS settings.
+
+Runs every combination of iterations, Gaussian sigma, grating period
+and init strategy over a list of trap layouts on a process pool and
+writes one CSV row per run.
+
+    python -m core.sweep layouts.json --iterations 40 80 \\
+        --sigma 0.3 0.45 --period 8 16 --init grating random --jobs 32
+
+layouts.json holds a list of layouts, each a list of [x, y] traps in
+the centered coordinates used by AppState.clicked_points.
+"""
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# native thread pools read these when numpy loads, so workers must be
+# spawned (not forked) with them already set
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+RESULT_FIELDS = [
+    "layout", "n_traps", "nx", "ny",
+    "iterations", "sigma", "period", "init", "seed", "precision",
+    "runtime_s", "uniformity", "efficiency",
+]
+
+
+def sweep_grid(layouts, iterations=(80,), sigmas=(0.45,), periods=(16,),
+               inits=("grating",), seed=0):
+    """
+    All run configurations as a list of dicts (without nx/ny).
+
+    Random inits get a distinct, reproducible seed per run.
+    """
+    runs = []
+    combos = itertools.product(
+        range(len(layouts)), iterations, sigmas, periods, inits
+    )
+    for i, (layout, iters, sigma, period, init) in enumerate(combos):
+        runs.append({
+            "layout": layout,
+            "traps": [tuple(p) for p in layouts[layout]],
+            "iterations": iters,
+            "sigma": sigma,
+            "period": period,
+            "init": init,
+            "seed": seed + i if init == "random" else None,
+        })
+    return runs
+
+
+def run_one(run):
+    """
+    Execute one sweep configuration and return its result row.
+    """
+    from core.gs_algorithm import gaussian_beam, traps_to_target, gerchberg_saxton
+    from core.metrics import uniformity, efficiency
+
+    nx = run["nx"]
+    ny = run["ny"]
+    precision = run.get("precision", "double")
+
+    source = gaussian_beam(nx, ny, sigma=run["sigma"], precision=precision)
+    target = traps_to_target(run["traps"], nx, ny, precision)
+
+    start = time.perf_counter()
+    intensity, _ = gerchberg_saxton(
+        source, target, run["iterations"],
+        init=run["init"], period=run["period"], seed=run["seed"]
+    )
+    runtime = time.perf_counter() - start
+
+    return {
+        "layout": run["layout"],
+        "n_traps": len(run["traps"]),
+        "nx": nx,
+        "ny": ny,
+        "iterations": run["iterations"],
+        "sigma": run["sigma"],
+        "period": run["period"],
+        "init": run["init"],
+        "seed": run["seed"],
+        "precision": precision,
+        "runtime_s": round(runtime, 6),
+        "uniformity": uniformity(intensity, target),
+        "efficiency": efficiency(intensity, target),
+    }
+
+
+def _init_worker(threads):
+    import core.gs_algorithm as gs
+    gs.BATCH_THREADS = threads
+
+
+def pinned_pool(jobs=None, threads=1):
+    """
+    ProcessPoolExecutor whose workers use `threads` native threads each.
+    """
+    jobs = jobs or os.cpu_count() or 1
+
+    saved = {k: os.environ.get(k) for k in THREAD_ENV_VARS}
+    for k in THREAD_ENV_VARS:
+        os.environ[k] = str(threads)
+
+    try:
+        pool = ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(threads,),
+        )
+        # start the workers now, while the pinned environment is set
+        list(pool.map(int, range(jobs)))
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+    return pool
+
+
+def run_sweep(runs, nx, ny, jobs=None, output=None, progress=None,
+              precision="double"):
+    """
+    Run all configurations on a pinned process pool.
+
+    Rows are written to the CSV file `output` as they complete (in
+    completion order) and returned sorted in grid order.
+    """
+    runs = [dict(run, nx=nx, ny=ny, precision=precision) for run in runs]
+
+    writer = None
+    out = None
+    if output is not None:
+        out = open(output, "w", newline="")
+        writer = csv.DictWriter(out, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+
+    rows = [None] * len(runs)
+    try:
+        with pinned_pool(jobs) as pool:
+            futures = {pool.submit(run_one, run): i for i, run in enumerate(runs)}
+            for done, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                rows[futures[future]] = row
+                if writer is not None:
+                    writer.writerow(row)
+                    out.flush()
+                if progress is not None:
+                    progress(done, len(runs))
+    finally:
+        if out is not None:
+            out.close()
+
+    return rows
+
+
+def main(argv=None):
+    from core.app_state import AppState
+    from core.gs_algorithm import INIT_STRATEGIES, PRECISIONS
+
+    state = AppState()
+
+    parser = argparse.ArgumentParser(description="Sweep GS settings")
+    parser.add_argument("layouts", help="JSON file with a list of trap layouts")
+    parser.add_argument("--iterations", type=int, nargs="+", default=[80])
+    parser.add_argument("--sigma", type=float, nargs="+", default=[0.45])
+    parser.add_argument("--period", type=int, nargs="+", default=[16])
+    parser.add_argument("--init", nargs="+", default=["grating"],
+                        choices=INIT_STRATEGIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--nx", type=int, default=state.slm_res_x)
+    parser.add_argument("--ny", type=int, default=state.slm_res_y)
+    parser.add_argument("--precision", default=state.precision,
+                        choices=list(PRECISIONS))
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="sweep_results.csv")
+    args = parser.parse_args(argv)
+
+    with open(args.layouts) as f:
+        layouts = json.load(f)
+
+    runs = sweep_grid(
+        layouts, args.iterations, args.sigma, args.period, args.init, args.seed
+    )
+
+    def progress(done, total):
+        print(f"\r{done}/{total} runs", end="", flush=True)
+
+    start = time.perf_counter()
+    run_sweep(runs, args.nx, args.ny, args.jobs, args.out, progress,
+              args.precision)
+    print(f"\n{len(runs)} runs in {time.perf_counter() - start:.1f} s → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
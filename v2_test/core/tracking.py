@@ -0,0 +1,245 @@
+"""
+Particle tracking on camera frames.
+
+Work is restricted to one square window per trap, started at the
+trap's camera position and following its particle from frame to
+frame. All windows are gathered into one (N, k, k) stack and located
+together: background from the window borders, threshold, then a
+sub-pixel centroid or 3-point Gaussian fit, all as array operations.
+
+    tracker = ParticleTracker(calibration.to_camera(traps), (h, w))
+    tracking = ParticleTracking(camera.ring, tracker)
+    tracking.start()
+    frames, timestamps, positions = tracker.store.arrays()
+    tracking.stop()
+
+Window i always belongs to track i, so linking a detection to its
+track is the window itself; a detection further than max_step from
+the track's last position (or sharing a particle with a brighter
+track) is counted as lost for that frame.
+"""
+import threading
+
+import numpy as np
+
+from core.camera import roi_index
+
+METHODS = ("centroid", "gaussian")
+
+
+class TrackStore:
+    """
+    Track positions of the last `capacity` frames, (frames, N, 2)
+    camera positions, NaN where a particle was not found.
+    """
+
+    def __init__(self, capacity, count):
+        self.capacity = capacity
+        self.positions = np.full((capacity, count, 2), np.nan, dtype=np.float32)
+        self.frames = np.zeros(capacity, dtype=np.int64)
+        self.timestamps = np.zeros(capacity)
+        self.written = 0
+        self._lock = threading.Lock()
+
+    def append(self, number, timestamp, positions):
+        with self._lock:
+            slot = self.written % self.capacity
+            self.positions[slot] = positions
+            self.frames[slot] = number
+            self.timestamps[slot] = timestamp
+            self.written += 1
+
+    def arrays(self, last=None):
+        """
+        (frames, timestamps, positions) of the stored frames, oldest
+        first, as copies; `last` limits them to the newest ones.
+        """
+        with self._lock:
+            n = min(self.written, self.capacity)
+            if last is not None:
+                n = min(n, last)
+            order = np.arange(self.written - n, self.written) % self.capacity
+            return self.frames[order], self.timestamps[order], self.positions[order]
+
+    def latest(self):
+        """
+        Positions of the newest frame (a copy), or None.
+        """
+        with self._lock:
+            if not self.written:
+                return None
+            return self.positions[(self.written - 1) % self.capacity].copy()
+
+    def rate(self):
+        """
+        Frames per second over the stored frames.
+        """
+        _, timestamps, _ = self.arrays()
+        if len(timestamps) < 2 or timestamps[-1] <= timestamps[0]:
+            return 0.0
+        return (len(timestamps) - 1) / (timestamps[-1] - timestamps[0])
+
+
+class ParticleTracker:
+    """
+    Locates one particle per window in uint8 frames of `shape`.
+
+    centers: start positions, camera pixels (column, row), continuous
+    as in CameraCalibration (pixel c spans [c, c + 1)); positions are
+    reported the same way.
+    radius: window half size; a particle moving further than that
+    between frames is lost.
+    threshold: fraction of each window's peak (above background)
+    ignored by the centroid.
+    min_signal: peak grey levels above background to count as found.
+    method: "centroid" (thresholded centre of mass) or "gaussian"
+    (3-point Gaussian fit through the brightest pixel).
+    """
+
+    def __init__(self, centers, shape, radius=8, threshold=0.3, min_signal=20,
+                 max_step=None, method="centroid", history=4096):
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+
+        self.positions = np.asarray(centers, dtype=float).reshape(-1, 2).copy()
+        self.found = np.zeros(len(self.positions), dtype=bool)
+        self.peaks = np.zeros(len(self.positions))
+
+        self.shape = shape
+        self.radius = radius
+        self.threshold = threshold
+        self.min_signal = min_signal
+        self.max_step = radius if max_step is None else max_step
+        self.method = method
+
+        # window offsets and the flat indices of its border pixels
+        size = 2 * radius + 1
+        self._offsets = np.arange(size, dtype=np.float32)
+        edge = np.ones((size, size), dtype=bool)
+        edge[1:-1, 1:-1] = False
+        self._border = np.flatnonzero(edge)
+
+        self.store = TrackStore(history, len(self.positions))
+        self.frames = 0
+
+    def locate(self, frame):
+        """
+        Sub-pixel particle position in every window (camera pixels)
+        and the peak signal above background; does not update tracks.
+        """
+        index, origins = roi_index(self.positions, self.shape, self.radius)
+        n, size, _ = index.shape
+
+        windows = np.take(frame.reshape(-1), index).astype(np.float32)
+        flat = windows.reshape(n, -1)
+
+        background = np.median(flat[:, self._border], axis=1)
+        flat -= background[:, None]
+        peaks = flat.max(axis=1)
+
+        if self.method == "centroid":
+            offsets = self._centroid(windows, peaks)
+        else:
+            offsets = self._gaussian(flat, size)
+        # offsets are pixel indices; + 0.5 moves them to pixel centres
+        return origins + offsets + 0.5, peaks
+
+    def _centroid(self, windows, peaks):
+        # mass above threshold * peak, projected on the two axes
+        cut = (self.threshold * peaks)[:, None, None]
+        mass = np.maximum(windows - cut, 0)
+        cols = mass.sum(axis=1)
+        rows = mass.sum(axis=2)
+        total = np.maximum(cols.sum(axis=1), np.finfo(np.float32).tiny)
+        return np.column_stack([cols @ self._offsets, rows @ self._offsets]) / total[:, None]
+
+    def _gaussian(self, flat, size):
+        # parabola through the logs of the brightest pixel and its
+        # neighbours on each axis (kept off the window edge)
+        brightest = flat.argmax(axis=1)
+        r = np.clip(brightest // size, 1, size - 2)
+        c = np.clip(brightest % size, 1, size - 2)
+        centre = r * size + c
+
+        near = centre[:, None] + np.array([-1, 0, 1, -size, size])
+        logs = np.log(np.maximum(np.take_along_axis(flat, near, axis=1), 1e-3))
+        left, mid, right, up, down = logs.T
+
+        dx = 0.5 * (left - right) / np.minimum(left - 2 * mid + right, -1e-6)
+        dy = 0.5 * (up - down) / np.minimum(up - 2 * mid + down, -1e-6)
+        return np.column_stack([c + np.clip(dx, -1, 1), r + np.clip(dy, -1, 1)])
+
+    def process(self, frame, timestamp=0.0, number=None):
+        """
+        Locate all particles in `frame`, link them to their tracks and
+        store the result; returns (positions, found).
+        """
+        located, peaks = self.locate(frame)
+
+        found = peaks >= self.min_signal
+        step = np.hypot(*(located - self.positions).T)
+        found &= step <= self.max_step
+
+        # two windows on one particle: keep the brighter track
+        if len(located) > 1:
+            gap = located[:, None, :] - located[None, :, :]
+            close = np.triu(np.hypot(gap[..., 0], gap[..., 1]) < self.radius / 2, k=1)
+            close &= found[:, None] & found[None, :]
+            i, j = np.nonzero(close)
+            found[np.where(peaks[i] < peaks[j], i, j)] = False
+
+        # lost particles keep their window at the last known position
+        self.positions[found] = located[found]
+        self.found = found
+        self.peaks = peaks
+
+        published = np.where(found[:, None], self.positions, np.nan)
+        self.store.append(self.frames if number is None else number, timestamp, published)
+        self.frames += 1
+        return published, found
+
+
+class ParticleTracking:
+    """
+    Thread feeding every frame of a camera FrameRing to a tracker.
+    """
+
+    def __init__(self, ring, tracker):
+        self.ring = ring
+        self.tracker = tracker
+        self.reader = None
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self.reader = self.ring.reader()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def is_running(self):
+        return self._running
+
+    def dropped(self):
+        """
+        Camera frames the tracker fell too far behind to process.
+        """
+        return self.reader.dropped if self.reader is not None else 0
+
+    def _run(self):
+        while self._running:
+            frame = self.reader.get(timeout=0.1)
+            if frame is None:
+                if self.ring.closed:
+                    break
+                continue
+            self.tracker.process(frame.image, frame.timestamp, frame.number)
+        self._running = False
@@ -1,10 +1,17 @@
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget
+import threading
 
-from core.app_state import AppState
-from pages.parameter_page import ParameterPage
-from pages.grid_page import GridPage
-from pages.experiment_page import ExperimentPage
+from utils import startup_timing
+
+with startup_timing.measure("import PySide6"):
+    from PySide6.QtWidgets import QApplication, QMainWindow, QStackedWidget
+    from PySide6.QtCore import QTimer
+
+with startup_timing.measure("import core.app_state"):
+    from core.app_state import AppState
+
+# page modules pulled in behind the first window (numpy, GS engine)
+PRELOAD_MODULES = ("pages.grid_page", "pages.experiment_page")
 
 
 class MainWindow(QMainWindow):
@@ -15,44 +22,104 @@ class MainWindow(QMainWindow):
         self.state = AppState()
 
         self.stack = QStackedWidget()
+        self.setCentralWidget(self.stack)
 
-        self.parameter_page = ParameterPage(
-            self.state,
-            self.go_to_grid
-        )
+        # pages are built on first navigation; only the first one is
+        # needed before the window appears
+        self.parameter_page = None
+        self.grid_page = None
+        self.experiment_page = None
 
-        # ✅ pass BOTH callbacks
-        self.grid_page = GridPage(
-            self.state,
-            self.go_to_experiment,
-            self.go_to_parameter
-        )
+        self.go_to_parameter()
 
-        self.experiment_page = ExperimentPage(
-            self.state,
-            self.go_to_grid
-        )
+    # ---------------------
+    # lazy pages
+    # ---------------------
 
-        self.stack.addWidget(self.parameter_page)
-        self.stack.addWidget(self.grid_page)
-        self.stack.addWidget(self.experiment_page)
+    def _show_page(self, page):
+        if self.stack.indexOf(page) < 0:
+            self.stack.addWidget(page)
+        self.stack.setCurrentWidget(page)
 
-        self.setCentralWidget(self.stack)
+    def get_parameter_page(self):
+        if self.parameter_page is None:
+            with startup_timing.measure("import pages.parameter_page"):
+                from pages.parameter_page import ParameterPage
+            with startup_timing.measure("build ParameterPage"):
+                self.parameter_page = ParameterPage(self.state, self.go_to_grid)
+        return self.parameter_page
+
+    def get_grid_page(self):
+        if self.grid_page is None:
+            with startup_timing.measure("import pages.grid_page"):
+                from pages.grid_page import GridPage
+            # ✅ pass BOTH callbacks
+            with startup_timing.measure("build GridPage"):
+                self.grid_page = GridPage(
+                    self.state,
+                    self.go_to_experiment,
+                    self.go_to_parameter
+                )
+        return self.grid_page
+
+    def get_experiment_page(self):
+        if self.experiment_page is None:
+            with startup_timing.measure("import pages.experiment_page"):
+                from pages.experiment_page import ExperimentPage
+            with startup_timing.measure("build ExperimentPage"):
+                self.experiment_page = ExperimentPage(
+                    self.state,
+                    self.go_to_grid
+                )
+        return self.experiment_page
+
+    # ---------------------
+    # navigation
+    # ---------------------
 
     def go_to_parameter(self):
-        self.stack.setCurrentIndex(0)
+        self._show_page(self.get_parameter_page())
 
     def go_to_grid(self):
-        self.grid_page.initialize_grid()
-        self.stack.setCurrentIndex(1)
+        page = self.get_grid_page()
+        page.initialize_grid()
+        self._show_page(page)
+        startup_timing.report("grid page")
 
     def go_to_experiment(self):
-        self.stack.setCurrentIndex(2)
+        self._show_page(self.get_experiment_page())
+        startup_timing.report("experiment page")
+
+
+def preload_modules():
+    """
+    Import the later pages' modules (numpy, GS engine) on a background
+    thread once the window is up, so the first navigation does not
+    pay for them. Widgets are still only created on the GUI thread.
+    """
+    def run():
+        import importlib
+
+        for name in PRELOAD_MODULES:
+            with startup_timing.measure(f"preload {name}"):
+                importlib.import_module(name)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def first_window_shown():
+    startup_timing.mark("first window shown")
+    startup_timing.report()
+    preload_modules()
 
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MainWindow()
+    with startup_timing.measure("QApplication"):
+        app = QApplication(sys.argv)
+    with startup_timing.measure("build MainWindow"):
+        window = MainWindow()
     window.resize(1200, 800)
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    # runs once the event loop has painted the window
+    QTimer.singleShot(0, first_window_shown)
+    sys.exit(app.exec())
@@ -1,20 +1,52 @@
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout,
-    QLabel, QPushButton, QFrame, QProgressBar
+    QLabel, QPushButton, QFrame, QProgressBar, QSpinBox, QComboBox,
+    QDoubleSpinBox, QCheckBox, QFileDialog, QSlider
 )
-from PySide6.QtCore import Qt, QCoreApplication
-from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtGui import QFontDatabase
+
+import os
+import threading
+import time
 
 import numpy as np
 
-from core.gs_algorithm import (
-    gaussian_beam,
-    traps_to_target,
-    gerchberg_saxton
-)
+from core.gs_algorithm import GSReport, gaussian_beam, focal_target
+from core.hologram import GS_TOL, BEAM_SIGMA, compute_hologram
+from core import profiling
+from core.hologram_cache import HologramCache
+from core.camera import CameraAcquisition, CameraCalibration, make_driver
+from core.closed_loop import CameraCorrection, run_correction
+from core.tracking import ParticleTracker, ParticleTracking
+from core.recorder import Recorder, Recording
+from core.replay import ReplayCamera, SessionReplay
+from core.slm_output import output_for
+from core.sequencer import HologramSequencer, rotation_path
+from workers.gs_worker import HologramWorker, start_worker
+from widgets.image_panel import ImagePanel, ImagePyramid, to_uint8
+from widgets.slm_window import SLMWindow
+
+
+# sequence playback rate (SLM refresh) and per-frame GS iterations
+SLM_REFRESH_HZ = 60
+SEQUENCE_ITERATIONS = 10
+
+# live camera view refresh (the camera itself may run faster)
+LIVE_VIEW_HZ = 60
+
+# camera correction: cycle limit, frames skipped while the SLM settles,
+# frames averaged per measurement
+CLOSED_LOOP_CYCLES = 10
+SETTLE_FRAMES = 2
+AVERAGE_FRAMES = 2
 
 
 class ExperimentPage(QWidget):
+    # camera correction thread → GUI: phase to display, cycle status
+    loop_display = Signal(object)
+    loop_status = Signal(str)
+
     def __init__(self, state, go_back_callback):
         super().__init__()
         self.state = state
@@ -28,9 +60,8 @@ class ExperimentPage(QWidget):
         self.left_box.setFrameShape(QFrame.Box)
         left_layout = QVBoxLayout()
 
-        self.left_label = QLabel("Source Intensity")
-        self.left_label.setAlignment(Qt.AlignCenter)
-        left_layout.addWidget(self.left_label)
+        self.left_label = ImagePanel("Source Intensity")
+        left_layout.addWidget(self.left_label, 1)
 
         left_layout.addStretch()
 
@@ -38,6 +69,43 @@ class ExperimentPage(QWidget):
         self.switch_button.clicked.connect(self.switch_view)
         left_layout.addWidget(self.switch_button)
 
+        # live camera view in the left panel
+        self.camera_button = QPushButton("Live Camera")
+        self.camera_button.setCheckable(True)
+        self.camera_button.toggled.connect(self.toggle_camera)
+        left_layout.addWidget(self.camera_button)
+
+        # particles followed in every camera frame, circled in the view
+        self.track_button = QPushButton("Track Particles")
+        self.track_button.setCheckable(True)
+        self.track_button.toggled.connect(self.toggle_tracking)
+        left_layout.addWidget(self.track_button)
+
+        # replay of a recorded session in place of the camera
+        self.replay_row = QFrame()
+        replay_layout = QHBoxLayout()
+        replay_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.replay_pause_button = QPushButton("Pause")
+        self.replay_pause_button.setCheckable(True)
+        self.replay_pause_button.toggled.connect(self.pause_replay)
+        replay_layout.addWidget(self.replay_pause_button)
+
+        self.replay_slider = QSlider(Qt.Horizontal)
+        self.replay_slider.valueChanged.connect(self.seek_replay)
+        replay_layout.addWidget(self.replay_slider, 1)
+
+        self.replay_time_label = QLabel()
+        replay_layout.addWidget(self.replay_time_label)
+
+        self.replay_close_button = QPushButton("Close Replay")
+        self.replay_close_button.clicked.connect(self.close_replay)
+        replay_layout.addWidget(self.replay_close_button)
+
+        self.replay_row.setLayout(replay_layout)
+        self.replay_row.setVisible(False)
+        left_layout.addWidget(self.replay_row)
+
         self.left_box.setLayout(left_layout)
 
         # RIGHT PANEL
@@ -45,14 +113,74 @@ class ExperimentPage(QWidget):
         self.right_box.setFrameShape(QFrame.Box)
         right_layout = QVBoxLayout()
 
-        self.phase_label = QLabel("Phase Map (SLM)")
-        self.phase_label.setAlignment(Qt.AlignCenter)
-        right_layout.addWidget(self.phase_label)
+        self.phase_label = ImagePanel("Phase Map (SLM)")
+        right_layout.addWidget(self.phase_label, 1)
 
         self.run_button = QPushButton("Run GS Algorithm")
         self.run_button.clicked.connect(self.run_gs)
         right_layout.addWidget(self.run_button)
 
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_gs)
+        right_layout.addWidget(self.cancel_button)
+
+        # rotate the current layout, streaming one hologram per step
+        sequence_row = QHBoxLayout()
+        sequence_row.addWidget(QLabel("Rotate:"))
+        self.rotate_spin = QDoubleSpinBox()
+        self.rotate_spin.setRange(-360.0, 360.0)
+        self.rotate_spin.setValue(90.0)
+        self.rotate_spin.setSuffix(" °")
+        sequence_row.addWidget(self.rotate_spin)
+
+        sequence_row.addWidget(QLabel("Frames:"))
+        self.frames_spin = QSpinBox()
+        self.frames_spin.setRange(1, 10000)
+        self.frames_spin.setValue(120)
+        sequence_row.addWidget(self.frames_spin)
+        right_layout.addLayout(sequence_row)
+
+        self.play_button = QPushButton("Play Sequence")
+        self.play_button.clicked.connect(self.toggle_sequence)
+        right_layout.addWidget(self.play_button)
+
+        # camera-in-the-loop equalisation of the current hologram
+        loop_row = QHBoxLayout()
+        self.loop_button = QPushButton("Closed Loop")
+        self.loop_button.clicked.connect(self.run_closed_loop)
+        loop_row.addWidget(self.loop_button)
+
+        loop_row.addWidget(QLabel("Target uniformity:"))
+        self.uniformity_spin = QDoubleSpinBox()
+        self.uniformity_spin.setRange(0.5, 0.999)
+        self.uniformity_spin.setDecimals(3)
+        self.uniformity_spin.setSingleStep(0.01)
+        self.uniformity_spin.setValue(0.95)
+        loop_row.addWidget(self.uniformity_spin)
+        right_layout.addLayout(loop_row)
+
+        # full-screen output on the SLM's screen
+        self.slm_button = QPushButton("SLM Window")
+        self.slm_button.setCheckable(True)
+        self.slm_button.toggled.connect(self.toggle_slm_window)
+        right_layout.addWidget(self.slm_button)
+
+        self.slm_stats_label = QLabel()
+        self.slm_stats_label.setVisible(False)
+        right_layout.addWidget(self.slm_stats_label)
+
+        # per-stage timings of the last run (when profiling is on)
+        self.stats_label = QLabel()
+        self.stats_label.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.stats_label.setVisible(False)
+        right_layout.addWidget(self.stats_label)
+
+        self.trace_button = QPushButton("Export Trace…")
+        self.trace_button.clicked.connect(self.export_trace)
+        self.trace_button.setVisible(False)
+        right_layout.addWidget(self.trace_button)
+
         self.right_box.setLayout(right_layout)
 
         main_layout.addWidget(self.left_box)
@@ -67,6 +195,40 @@ class ExperimentPage(QWidget):
 
         bottom_layout.addStretch()
 
+        # GS: full-field FFT iterations; GSW: weighted, trap pixels only
+        bottom_layout.addWidget(QLabel("Algorithm:"))
+        self.algorithm_combo = QComboBox()
+        self.algorithm_combo.addItems(["GS", "GSW"])
+        self.algorithm_combo.currentTextChanged.connect(self.update_algorithm)
+        bottom_layout.addWidget(self.algorithm_combo)
+
+        # best-of-N random starts, iterated together
+        bottom_layout.addWidget(QLabel("Starts:"))
+        self.starts_spin = QSpinBox()
+        self.starts_spin.setRange(1, 32)
+        self.starts_spin.setValue(1)
+        bottom_layout.addWidget(self.starts_spin)
+
+        self.profile_check = QCheckBox("Profile")
+        self.profile_check.toggled.connect(self.set_profiling)
+        bottom_layout.addWidget(self.profile_check)
+
+        self.cache_label = QLabel()
+        bottom_layout.addWidget(self.cache_label)
+
+        # camera frames, holograms and trap lists to state.record_dir
+        self.record_button = QPushButton("Record")
+        self.record_button.setCheckable(True)
+        self.record_button.toggled.connect(self.toggle_recording)
+        bottom_layout.addWidget(self.record_button)
+
+        self.record_label = QLabel()
+        bottom_layout.addWidget(self.record_label)
+
+        self.replay_button = QPushButton("Open Recording…")
+        self.replay_button.clicked.connect(self.open_replay_dialog)
+        bottom_layout.addWidget(self.replay_button)
+
         self.progress = QProgressBar()
         self.progress.setValue(0)
         bottom_layout.addWidget(self.progress)
@@ -79,24 +241,81 @@ class ExperimentPage(QWidget):
 
         self.source_img = None
         self.target_img = None
+        # preview pyramids of source / target, built once per result
+        self.previews = {}
+
+        self.gs_worker = None
+
+        self.sequencer = None
+        self.sequence_timer = QTimer(self)
+        self.sequence_timer.setInterval(int(1000 / SLM_REFRESH_HZ))
+        self.sequence_timer.timeout.connect(self.play_next_frame)
+
+        self.cache = HologramCache(cache_dir=self.state.cache_dir)
+        self.update_cache_label()
+
+        # phase → grey stage, rebuilt when the SLM settings change
+        self.slm_output = None
+        self.slm_output_key = None
+
+        self.camera = None
+        self.camera_shown = None
+        self.tracking = None
+        self.last_phase = None
+        self.last_frame = None
+        self.last_traps = None
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(int(1000 / LIVE_VIEW_HZ))
+        self.live_timer.timeout.connect(self.update_live_view)
+
+        # hologram of the last GS run / closed loop, for the traps shown
+        self.result_phase = None
+        self.loop_shown = threading.Event()
+        self.loop_display.connect(self.show_loop_phase)
+        self.loop_status.connect(self.progress.setFormat)
+
+        self.replay = None
+        self.replay_phase_shown = -1
+
+        self.recorder = None
+        self.record_timer = QTimer(self)
+        self.record_timer.setInterval(1000)
+        self.record_timer.timeout.connect(self.update_record_stats)
+
+        self.slm_window = None
+        self.slm_stats_timer = QTimer(self)
+        self.slm_stats_timer.setInterval(1000)
+        self.slm_stats_timer.timeout.connect(self.update_slm_stats)
 
     def switch_view(self):
         if self.current_view == "source":
             self.current_view = "target"
             self.left_label.setText("Target Intensity")
             self.switch_button.setText("Switch to Source")
-            if self.target_img is not None:
-                self.show_image(self.target_img, self.left_label)
+            self.show_view()
         else:
             self.current_view = "source"
             self.left_label.setText("Source Intensity")
             self.switch_button.setText("Switch to Target")
-            if self.source_img is not None:
-                self.show_image(self.source_img, self.left_label)
+            self.show_view()
+
+    def update_algorithm(self, name):
+        self.starts_spin.setEnabled(name == "GS")
 
     def go_back_and_clear(self):
+        self.cancel_gs()
+        self.stop_sequence()
+        self.record_button.setChecked(False)
+        self.close_replay()
+        self.slm_button.setChecked(False)
+        self.camera_button.setChecked(False)
         self.source_img = None
         self.target_img = None
+        self.result_phase = None
+        self.last_phase = None
+        self.last_frame = None
+        self.last_traps = None
+        self.previews = {}
         self.left_label.clear()
         self.phase_label.clear()
         self.progress.setValue(0)
@@ -104,57 +323,700 @@ class ExperimentPage(QWidget):
 
     def run_gs(self):
 
+        if self.gs_worker is not None:
+            return
+
         nx = self.state.slm_res_x
         ny = self.state.slm_res_y
 
-        source = gaussian_beam(nx, ny)
-        traps = self.state.clicked_points
+        traps = list(self.state.clicked_points)
 
         if not traps:
             print("No traps selected!")
             return
 
-        target = traps_to_target(traps, nx, ny)
-
         iterations = 80
+        starts = self.starts_spin.value()
+        algorithm = self.algorithm_combo.currentText()
+
+        seed = self.state.gs_seed
+        precision = self.state.precision
+
+        # transform grid: padded / oversampled around the SLM aperture
+        grid = dict(oversample=self.state.oversample, fast_len=self.state.fft_fast_len)
+
+        # GS refines the gratings-and-lenses hologram from the grid page
+        hologram = self.state.superposition
+        init_mask = None
+        if (algorithm == "GSW" or starts == 1) and hologram is not None and \
+                len(hologram) and (hologram.nx, hologram.ny) == (nx, ny) and \
+                hologram.precision == precision:
+            init_mask = hologram.mask()
+
+        key = self.cache.make_key(
+            algorithm=algorithm, traps=sorted(traps), nx=nx, ny=ny,
+            sigma=BEAM_SIGMA, iterations=iterations, starts=starts,
+            seed=seed, tol=GS_TOL, init=init_mask, precision=precision, **grid
+        )
+
+        # stats panel shows this run only
+        if profiling.is_enabled():
+            profiling.reset()
+
+        hit = self.cache.get(key)
+        if hit is not None:
+            report = GSReport()
+            report.stop_reason = "cached"
+            self.on_gs_finished((
+                gaussian_beam(nx, ny, BEAM_SIGMA, precision),
+                focal_target(traps, nx, ny, precision=precision, **grid),
+                hit[1],
+                report
+            ))
+            return
+
+        def job(callback):
+            result = compute_hologram(
+                traps, nx, ny,
+                algorithm=algorithm,
+                iterations=iterations,
+                starts=starts,
+                seed=seed,
+                tol=GS_TOL,
+                sigma=BEAM_SIGMA,
+                precision=precision,
+                init_mask=init_mask,
+                callback=callback,
+                **grid
+            )
+
+            if not worker.is_cancelled():
+                self.cache.put(key, result.intensity, result.phase)
+
+            return result.source, result.target, result.phase, result.report
+
+        worker = HologramWorker(job)
+        self.gs_worker = worker
+        self.gs_worker.progress.connect(self.on_gs_progress)
+        self.gs_worker.finished.connect(self.on_gs_finished)
+        self.gs_worker.cancelled.connect(self.on_gs_stopped)
+        self.gs_worker.failed.connect(self.on_gs_failed)
+
         self.progress.setValue(0)
+        self.progress.setFormat("%p%")
+        self.run_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
 
-        phase = np.exp(1j * 2 * np.pi * np.random.rand(ny, nx))
-        field = source * phase
+        start_worker(self.gs_worker, self)
 
-        for i in range(iterations):
-            target_field = np.fft.fftshift(np.fft.fft2(field))
-            target_field = target * np.exp(1j * np.angle(target_field))
-            field = np.fft.ifft2(np.fft.ifftshift(target_field))
-            field = source * np.exp(1j * np.angle(field))
+    def cancel_gs(self):
+        if self.gs_worker is not None:
+            self.gs_worker.cancel()
 
-            percent = int((i + 1) / iterations * 100)
-            self.progress.setValue(percent)
-            QCoreApplication.processEvents()
+    def on_gs_progress(self, percent, eta):
+        self.progress.setValue(percent)
+        self.progress.setFormat(f"%p%  ETA {eta:.1f} s")
 
-        phase_map = np.angle(field)
+    def on_gs_finished(self, result):
+        source, target, phase_map, report = result
 
         self.source_img = source
         self.target_img = target
+        self.previews = {}
 
-        if self.current_view == "source":
-            self.show_image(source, self.left_label)
-        else:
-            self.show_image(target, self.left_label)
+        self.show_view()
 
         self.show_phase(phase_map, self.phase_label)
+        self.result_phase = phase_map
+
+        self.on_gs_stopped()
+        self.progress.setValue(100)
+        self.update_cache_label()
+        self.update_stats()
+        if report is not None:
+            self.progress.setFormat(
+                f"{report.stop_reason} after {report.iterations} it"
+            )
+
+    def on_gs_failed(self, message):
+        print(f"GS failed: {message}")
+        self.on_gs_stopped()
+
+    def on_gs_stopped(self):
+        self.gs_worker = None
+        self.run_button.setEnabled(True)
+        self.loop_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.progress.setFormat("%p%")
+
+    # ---------------------
+    # closed loop
+    # ---------------------
+
+    def run_closed_loop(self):
+        if self.gs_worker is not None or self.sequencer is not None:
+            return
+        if self.replay is not None:
+            print("Close the replay first: the closed loop needs a live camera")
+            return
+
+        phase = self.result_phase
+        traps = list(self.state.clicked_points)
+        if phase is None or not traps:
+            print("Run GS first: the closed loop starts from its hologram")
+            return
+
+        if self.camera is None:
+            self.camera_button.setChecked(True)
+            if self.camera is None:
+                return
+        camera = self.camera
+
+        driver = camera.driver
+        correction = CameraCorrection(
+            traps, phase, self.camera_calibration(),
+            (driver.height, driver.width), sigma=BEAM_SIGMA
+        )
+        target = self.uniformity_spin.value()
+
+        def display(phase):
+            # shown by the GUI thread; returns once it is on the SLM
+            self.loop_shown.clear()
+            self.loop_display.emit(phase)
+            self.loop_shown.wait(1.0)
+
+        def job(callback):
+            def on_cycle(done, total):
+                uniformity, compute = correction.history[-1]
+                self.loop_status.emit(
+                    f"cycle {done}: uniformity {uniformity:.3f} ({compute * 1000:.0f} ms)"
+                )
+                return callback(done, total)
+
+            try:
+                phase, stop_reason = run_correction(
+                    correction, display, camera.ring,
+                    cycles=CLOSED_LOOP_CYCLES,
+                    target_uniformity=target,
+                    settle_frames=SETTLE_FRAMES,
+                    average=AVERAGE_FRAMES,
+                    callback=on_cycle
+                )
+            except TimeoutError:
+                # camera stopped while leaving the page: just a cancel
+                if worker.is_cancelled():
+                    return None
+                raise
+            return phase, stop_reason, correction.history
+
+        worker = HologramWorker(job)
+        self.gs_worker = worker
+        self.gs_worker.progress.connect(self.progress.setValue)
+        self.gs_worker.finished.connect(self.on_loop_finished)
+        self.gs_worker.cancelled.connect(self.on_gs_stopped)
+        self.gs_worker.failed.connect(self.on_loop_failed)
+
+        self.progress.setValue(0)
+        self.progress.setFormat("camera cycle…")
+        self.run_button.setEnabled(False)
+        self.loop_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+
+        start_worker(self.gs_worker, self)
+
+    def show_loop_phase(self, phase):
+        self.show_phase(phase, self.phase_label)
+        self.loop_shown.set()
+
+    def on_loop_finished(self, result):
+        phase, stop_reason, history = result
 
+        self.show_phase(phase, self.phase_label)
+        self.result_phase = phase
+
+        self.on_gs_stopped()
         self.progress.setValue(100)
+        first, last = history[0][0], history[-1][0]
+        self.progress.setFormat(
+            f"uniformity {first:.3f} → {last:.3f}, {stop_reason} "
+            f"after {len(history)} cycles"
+        )
+
+    def on_loop_failed(self, message):
+        print(f"Closed loop failed: {message}")
+        self.on_gs_stopped()
+
+    # ---------------------
+    # sequence playback
+    # ---------------------
+
+    def toggle_sequence(self):
+        if self.sequencer is not None:
+            self.stop_sequence()
+            return
+
+        if self.gs_worker is not None:
+            return
+
+        traps = list(self.state.clicked_points)
+        if not traps:
+            print("No traps selected!")
+            return
+
+        nx = self.state.slm_res_x
+        ny = self.state.slm_res_y
+        frames = self.frames_spin.value()
+
+        layouts = rotation_path(traps, np.radians(self.rotate_spin.value()), frames)
+
+        self.sequencer = HologramSequencer(
+            layouts, nx, ny,
+            iterations=SEQUENCE_ITERATIONS,
+            tol=GS_TOL,
+            sigma=BEAM_SIGMA,
+            precision=self.state.precision,
+            oversample=self.state.oversample,
+            fast_len=self.state.fft_fast_len
+        )
+        self.sequencer.start()
+
+        self.sequence_total = frames + 1
+        self.play_button.setText("Stop Sequence")
+        self.run_button.setEnabled(False)
+        self.loop_button.setEnabled(False)
+        self.sequence_timer.start()
+
+    def play_next_frame(self):
+        if not self.sequencer.played and not self.sequencer.ready():
+            # still filling the queue ahead of playback
+            self.progress.setFormat("buffering…")
+            return
+
+        frame = self.sequencer.next_frame(block=False)
+
+        if frame is not None:
+            self.show_phase(frame.phase, self.phase_label, frame.traps, stream=True)
+            self.progress.setValue(int(100 * self.sequencer.played / self.sequence_total))
+            self.progress.setFormat(
+                f"frame {self.sequencer.played}/{self.sequence_total}, "
+                f"{self.sequencer.stalls} stalls"
+            )
+        elif self.sequencer.finished:
+            self.stop_sequence()
+
+    def stop_sequence(self):
+        if self.sequencer is None:
+            return
+        self.sequence_timer.stop()
+        self.sequencer.stop()
+        self.sequencer = None
+        if self.result_phase is not None:
+            # back to the solved layout, so the SLM and camera show the
+            # traps tracking and the closed loop look for
+            self.show_phase(self.result_phase, self.phase_label)
+        elif self.last_frame is not None:
+            # the last streamed frame becomes a still image again (rescaled on resize)
+            self.phase_label.set_image(self.last_frame)
+        self.play_button.setText("Play Sequence")
+        self.run_button.setEnabled(self.gs_worker is None)
+        self.loop_button.setEnabled(self.gs_worker is None)
+
+    # ---------------------
+    # profiling
+    # ---------------------
+
+    def set_profiling(self, enabled):
+        if enabled:
+            profiling.reset()
+            profiling.enable()
+        else:
+            profiling.disable()
+        self.stats_label.setVisible(enabled)
+        self.trace_button.setVisible(enabled)
+        self.update_stats()
+
+    def update_stats(self):
+        if self.profile_check.isChecked():
+            self.stats_label.setText(profiling.format_stats(limit=12) or "no spans yet")
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", "gs_trace.json", "Chrome trace (*.json)"
+        )
+        if path:
+            profiling.export_chrome_trace(path)
+
+    def update_cache_label(self):
+        stats = self.cache.stats()
+        self.cache_label.setText(
+            f"Cache: {stats['hits']} hit / {stats['misses']} miss"
+        )
+
+    def show_view(self):
+        """
+        Source or target intensity (current_view) in the left panel.
+        """
+        name = self.current_view
+        img = self.source_img if name == "source" else self.target_img
+        if img is None or self.camera is not None:
+            return
+
+        with profiling.span("show_image"):
+            pyramid = self.previews.get(name)
+            if pyramid is None:
+                pyramid = self.previews[name] = ImagePyramid(to_uint8(img))
+            self.left_label.set_pyramid(pyramid)
+
+    def get_slm_output(self, shape):
+        s = self.state
+        key = (shape, s.slm_lut, s.slm_wrap, s.slm_dither)
+        if key != self.slm_output_key:
+            ny, nx = shape
+            try:
+                self.slm_output = output_for(nx, ny, s.slm_lut, s.slm_wrap, s.slm_dither)
+            except (OSError, ValueError) as e:
+                print(f"SLM LUT {s.slm_lut!r} not usable ({e}), using linear LUT")
+                self.slm_output = output_for(nx, ny, "", s.slm_wrap, s.slm_dither)
+            self.slm_output_key = key
+        return self.slm_output
+
+    def show_phase(self, phase, label, traps=None, stream=False):
+        """
+        Display a hologram (panel, SLM window, camera); traps it
+        was computed for default to the clicked points. stream is for
+        frames shown at frame rate (sequence playback): the panel
+        scales them straight from the output buffer instead of
+        building a preview pyramid per frame.
+        """
+        with profiling.span("show_phase"):
+            # SLM grey levels, rendered into the output stage's buffer
+            frame = self.get_slm_output(phase.shape).render(phase)
+            if self.slm_window is not None:
+                self.slm_window.present(frame)
+            if stream:
+                label.show_frame(frame)
+            else:
+                label.set_image(frame)
+
+        self.last_phase = phase
+        self.last_frame = frame
+        self.last_traps = list(self.state.clicked_points) if traps is None else traps
+        if self.camera is not None:
+            self.camera.driver.set_slm_phase(phase)
+        if self.recorder is not None:
+            self.record_hologram()
+
+    # ---------------------
+    # recording
+    # ---------------------
+
+    def toggle_recording(self, checked):
+        if checked:
+            self.start_recording()
+        else:
+            self.stop_recording()
+
+    def start_recording(self):
+        if self.recorder is not None:
+            return
+        s = self.state
+        path = os.path.join(s.record_dir, time.strftime("%Y%m%d-%H%M%S"))
+        try:
+            self.recorder = Recorder(
+                path,
+                camera_shape=(s.cam_res_y, s.cam_res_x),
+                phase_shape=(s.slm_res_y, s.slm_res_x),
+                metadata=s.to_dict()
+            )
+        except (OSError, ValueError) as e:
+            print(f"Cannot record to {path}: {e}")
+            self.record_button.setChecked(False)
+            return
+
+        self.recorder.start()
+        if self.camera is not None:
+            self.recorder.attach_camera(self.camera.ring)
+        # what is on the SLM when recording starts
+        if self.last_phase is not None:
+            self.record_hologram()
+
+        self.record_timer.start()
+        self.update_record_stats()
+
+    def record_hologram(self):
+        phase = self.last_phase
+        if phase.shape != self.recorder.streams["phase"].shape:
+            return
+        # trap list i belongs to phase map i
+        self.recorder.record_phase(phase)
+        self.recorder.record_traps(self.last_traps)
+
+    def stop_recording(self):
+        if self.recorder is None:
+            return
+        self.record_timer.stop()
+        # writes out the queue and closes the files
+        try:
+            self.recorder.stop()
+        except Exception as e:
+            print(f"Recording to {self.recorder.path} failed: {e}")
+            self.record_label.setText(f"Recording failed: {e}")
+        else:
+            self.record_label.setText(
+                f"{self.recorder.format().replace('REC', 'Saved')} → {self.recorder.path}"
+            )
+        self.recorder = None
+
+    def update_record_stats(self):
+        if self.recorder is None:
+            return
+        if self.recorder.error is not None:
+            # the writer stopped; stop_recording reports why
+            self.record_button.setChecked(False)
+            return
+        self.record_label.setText(self.recorder.format())
+
+    # ---------------------
+    # camera
+    # ---------------------
+
+    def toggle_camera(self, checked):
+        if checked:
+            self.start_camera()
+        else:
+            self.stop_camera()
+
+    def start_camera(self):
+        if self.camera is not None:
+            return
+        s = self.state
+        try:
+            driver = make_driver(s.camera_driver, s.cam_res_x, s.cam_res_y, fps=s.camera_fps)
+        except ValueError as e:
+            print(e)
+            self.camera_button.setChecked(False)
+            return
+
+        self.camera = CameraAcquisition(driver)
+        # the solved layout, else whatever was shown last
+        phase = self.result_phase if self.result_phase is not None else self.last_phase
+        if phase is not None:
+            driver.set_slm_phase(phase)
+        self.camera.start()
+        if self.recorder is not None:
+            self.recorder.attach_camera(self.camera.ring)
+
+        self.camera_shown = None
+        self.left_label.setText("Camera")
+        self.live_timer.start()
+
+    def stop_camera(self):
+        if self.camera is None:
+            return
+        self.track_button.setChecked(False)
+        self.live_timer.stop()
+        if self.recorder is not None:
+            self.recorder.detach_camera()
+        self.camera.stop()
+        self.camera = None
+        self.camera_button.setText("Live Camera")
+
+        self.left_label.setText(
+            "Source Intensity" if self.current_view == "source" else "Target Intensity"
+        )
+        self.show_view()
+
+    def camera_calibration(self):
+        """
+        Trap → camera pixel map: the SLM focal plane filling the camera.
+        """
+        driver = self.camera.driver
+        nx, ny = self.state.slm_res_x, self.state.slm_res_y
+        if self.replay is not None and self.replay.phases is not None:
+            ny, nx = self.replay.phases.shape
+        return CameraCalibration.default(nx, ny, driver.width, driver.height)
+
+    def update_live_view(self):
+        frame = self.camera.ring.latest()
+        if frame is None or frame.number == self.camera_shown:
+            return
+        self.camera_shown = frame.number
+
+        markers = None
+        if self.tracking is not None:
+            markers = self.tracking.tracker.store.latest()
+            tracker = self.tracking.tracker
+            self.track_button.setText(
+                f"Track Particles ({tracker.found.sum()}/{len(tracker.found)}, "
+                f"{tracker.store.rate():.0f} fps)"
+            )
+
+        with profiling.span("show_camera"):
+            self.left_label.show_frame(frame.image, markers)
+
+        if self.replay is not None:
+            self.update_replay_view()
+        else:
+            self.camera_button.setText(f"Live Camera ({self.camera.fps():.0f} fps)")
+
+    # ---------------------
+    # particle tracking
+    # ---------------------
+
+    def toggle_tracking(self, checked):
+        if checked:
+            self.start_tracking()
+        else:
+            self.stop_tracking()
+
+    def start_tracking(self):
+        if self.tracking is not None:
+            return
+
+        traps = list(self.state.clicked_points)
+        if self.replay is not None:
+            # the traps recorded at the current replay time
+            traps = list(self.replay.traps_at(self.camera.driver.position))
+        if not traps:
+            print("No traps selected!")
+            self.track_button.setChecked(False)
+            return
+
+        if self.camera is None:
+            self.camera_button.setChecked(True)
+            if self.camera is None:
+                self.track_button.setChecked(False)
+                return
+
+        driver = self.camera.driver
+        tracker = ParticleTracker(
+            self.camera_calibration().to_camera(traps), (driver.height, driver.width)
+        )
+        self.tracking = ParticleTracking(self.camera.ring, tracker)
+        self.tracking.start()
+
+    def stop_tracking(self):
+        if self.tracking is None:
+            return
+        self.tracking.stop()
+        self.tracking = None
+        self.track_button.setText("Track Particles")
+
+    # ---------------------
+    # replay
+    # ---------------------
+
+    def open_replay_dialog(self):
+        path = QFileDialog.getExistingDirectory(self, "Open Recording", self.state.record_dir)
+        if path:
+            self.open_replay(path)
+
+    def open_replay(self, path):
+        """
+        Play a recorded session back through the camera path: the
+        left panel shows its frames, the right one its holograms.
+        """
+        try:
+            replay = SessionReplay(Recording(path))
+            driver = ReplayCamera(replay)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Cannot replay {path}: {e}")
+            return
+
+        self.close_replay()
+        self.stop_sequence()
+        self.camera_button.setChecked(False)
+
+        self.replay = replay
+        self.replay_phase_shown = -1
+        self.camera = CameraAcquisition(driver)
+        self.camera.start()
+        if self.recorder is not None:
+            self.recorder.attach_camera(self.camera.ring)
+
+        self.camera_shown = None
+        self.left_label.setText("Replay")
+        self.live_timer.start()
+
+        self.camera_button.setEnabled(False)
+        self.replay_slider.blockSignals(True)
+        self.replay_slider.setRange(0, int(replay.duration * 1000))
+        self.replay_slider.setValue(0)
+        self.replay_slider.blockSignals(False)
+        self.replay_pause_button.setChecked(False)
+        self.replay_row.setVisible(True)
+
+    def close_replay(self):
+        if self.replay is None:
+            return
+        self.stop_camera()
+        self.replay = None
+        self.replay_row.setVisible(False)
+        self.camera_button.setEnabled(True)
+
+    def pause_replay(self, paused):
+        if self.replay is not None:
+            self.camera.driver.set_paused(paused)
+            if paused and self.replay_phase_shown >= 0:
+                # still image while paused, so resizing rescales it
+                self.phase_label.set_image(self.replay.phase_levels(self.replay_phase_shown))
+        self.replay_pause_button.setText("Play" if paused else "Pause")
+
+    def seek_replay(self, value):
+        # slider in ms of the replay timeline
+        if self.replay is not None:
+            self.camera.driver.seek(value / 1000)
+
+    def update_replay_view(self):
+        t = self.camera.driver.position
+
+        if not self.replay_slider.isSliderDown():
+            self.replay_slider.blockSignals(True)
+            self.replay_slider.setValue(int(t * 1000))
+            self.replay_slider.blockSignals(False)
+        self.replay_time_label.setText(f"{t:.2f} / {self.replay.duration:.2f} s")
+
+        # hologram on the SLM at that time, read only when it changes
+        i = self.replay.index_at("phase", t)
+        if i >= 0 and i != self.replay_phase_shown:
+            self.replay_phase_shown = i
+            if self.camera.driver.paused:
+                self.phase_label.set_image(self.replay.phase_levels(i))
+            else:
+                self.phase_label.show_frame(self.replay.phase_levels(i))
+
+    # ---------------------
+    # SLM window
+    # ---------------------
+
+    def toggle_slm_window(self, checked):
+        if checked:
+            self.open_slm_window()
+        elif self.slm_window is not None:
+            self.slm_window.close()
+
+    def open_slm_window(self):
+        if self.slm_window is not None:
+            return
+
+        self.slm_window = SLMWindow(screen=self.state.slm_screen)
+        self.slm_window.closed.connect(self.on_slm_window_closed)
+        self.slm_window.open()
+
+        # current hologram, if any, right away
+        if self.slm_output is not None and self.phase_label.pyramid is not None:
+            self.slm_window.present(self.slm_output.frame)
+
+        self.slm_stats_label.setVisible(True)
+        self.slm_stats_timer.start()
+        self.update_slm_stats()
+
+    def on_slm_window_closed(self):
+        self.slm_window = None
+        self.slm_stats_timer.stop()
+        self.slm_stats_label.setVisible(False)
+        self.slm_button.setChecked(False)
 
-    def show_image(self, img, label):
-        img8 = (img * 255).astype(np.uint8)
-        h, w = img8.shape
-        qimg = QImage(img8.data, w, h, w, QImage.Format_Grayscale8)
-        label.setPixmap(QPixmap.fromImage(qimg).scaled(420, 420, Qt.KeepAspectRatio))
-
-    def show_phase(self, phase, label):
-        phase_norm = (phase + np.pi) / (2 * np.pi)
-        img8 = (phase_norm * 255).astype(np.uint8)
-        h, w = img8.shape
-        qimg = QImage(img8.data, w, h, w, QImage.Format_Grayscale8)
-        label.setPixmap(QPixmap.fromImage(qimg).scaled(420, 420, Qt.KeepAspectRatio))
\ No newline at end of file
+    def update_slm_stats(self):
+        if self.slm_window is not None:
+            self.slm_stats_label.setText(self.slm_window.stats.format())
\ No newline at end of file
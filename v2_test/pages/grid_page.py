@@ -1,13 +1,25 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel,
     QGraphicsScene, QSpinBox,
-    QPushButton, QHBoxLayout, QLineEdit
+    QPushButton, QHBoxLayout, QLineEdit, QCheckBox
 )
-from PySide6.QtGui import QPen, QColor
-from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtCore import Qt, QTimer
 
+import numpy as np
+
+from core.live_solver import AnytimeSolver
+from core.superposition import SuperpositionEngine
 from widgets.grid_view import GridView
 
+PREVIEW_SIZE = 160
+
+# how often the live preview picks up the newest solver frame
+LIVE_POLL_MS = 16
+
+# characters of the editable point list
+POINTS_MAX_LENGTH = 1 << 24
+
 
 class GridPage(QWidget):
     def __init__(self, state, go_next_callback, go_back_callback):
@@ -22,7 +34,7 @@ class GridPage(QWidget):
         main_layout.addWidget(QLabel("Number of Clicks:"))
 
         self.click_selector = QSpinBox()
-        self.click_selector.setRange(1, 100)
+        self.click_selector.setRange(1, 10000)
         self.click_selector.setValue(1)
         self.click_selector.valueChanged.connect(self.update_click_limit)
         main_layout.addWidget(self.click_selector)
@@ -38,10 +50,27 @@ class GridPage(QWidget):
         self.clear_button.clicked.connect(self.clear_points)
         btn_row.addWidget(self.clear_button)
 
+        # warm-started GS that follows the traps while they are dragged
+        self.live_check = QCheckBox("Live hologram")
+        self.live_check.toggled.connect(self.set_live)
+        btn_row.addWidget(self.live_check)
+
         main_layout.addLayout(btn_row)
 
+        info_row = QHBoxLayout()
+
         self.coord_label = QLabel("Hover: (-, -)")
-        main_layout.addWidget(self.coord_label)
+        info_row.addWidget(self.coord_label)
+
+        info_row.addStretch()
+
+        # instant gratings-and-lenses hologram of the current traps
+        self.preview_label = QLabel("Hologram preview")
+        self.preview_label.setFixedSize(PREVIEW_SIZE, PREVIEW_SIZE)
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        info_row.addWidget(self.preview_label)
+
+        main_layout.addLayout(info_row)
 
         self.scene = QGraphicsScene()
         self.view = GridView(self.scene, self)
@@ -52,6 +81,8 @@ class GridPage(QWidget):
         main_layout.addWidget(QLabel("Clicked Points (Editable):"))
 
         self.points_edit = QLineEdit()
+        # the default 32767 characters cut off layouts of a few thousand traps
+        self.points_edit.setMaxLength(POINTS_MAX_LENGTH)
         self.points_edit.returnPressed.connect(self.apply_manual_points)
         main_layout.addWidget(self.points_edit)
 
@@ -65,12 +96,19 @@ class GridPage(QWidget):
         nav.addStretch()
 
         self.next_button = QPushButton("Next →")
-        self.next_button.clicked.connect(self.go_next)
+        self.next_button.clicked.connect(self.go_next_and_stop_live)
         nav.addWidget(self.next_button)
 
         main_layout.addLayout(nav)
 
         self.setLayout(main_layout)
+
+        self.live_solver = None
+        self.live_version = 0
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(LIVE_POLL_MS)
+        self.live_timer.timeout.connect(self.poll_live_solver)
+
         self.initialize_grid()
 
     # ---------------------
@@ -86,16 +124,131 @@ class GridPage(QWidget):
     def undo_last_point(self):
         if self.state.clicked_points:
             self.state.clicked_points.pop()
+            self.hologram.pop()
+            self.update_hologram_preview()
             self.redraw_points()
 
     def clear_points(self):
         self.state.clicked_points.clear()
+        self.hologram.clear()
+        self.update_hologram_preview()
         self.redraw_points()
 
+    def go_next_and_stop_live(self):
+        # the live solver only serves this page
+        self.live_check.setChecked(False)
+        self.go_next()
+
     def go_back_and_clear(self):
+        self.live_check.setChecked(False)
         self.state.clicked_points.clear()
+        self.hologram.clear()
         self.go_back()
 
+    # ---------------------
+    # hologram preview
+    # ---------------------
+
+    @property
+    def hologram(self):
+        return self.state.superposition
+
+    def sync_hologram(self):
+        nx = self.state.slm_res_x
+        ny = self.state.slm_res_y
+
+        precision = self.state.precision
+
+        engine = self.state.superposition
+        if engine is None or (engine.nx, engine.ny, engine.precision) != (nx, ny, precision):
+            engine = self.state.superposition = SuperpositionEngine(
+                nx, ny, precision=precision
+            )
+
+        # a running live solver is set up for the old SLM / settings
+        solver = self.live_solver
+        if solver is not None and \
+                (solver.nx, solver.ny, solver.precision,
+                 solver.oversample, solver.fast_len) != \
+                (nx, ny, precision, self.state.oversample, self.state.fft_fast_len):
+            self.live_check.setChecked(False)
+
+        engine.set_traps(self.state.clicked_points)
+        self.update_hologram_preview()
+
+    def on_trap_added(self, x, y):
+        self.hologram.append(x, y)
+        self.update_hologram_preview()
+
+    def on_trap_moved(self, index, x, y):
+        self.hologram.update(index, x, y)
+        self.update_hologram_preview()
+
+    def on_trap_dragged(self, index, x, y):
+        # only the live solver follows a drag; the rest waits for release
+        if self.live_solver is not None:
+            traps = list(self.state.clicked_points)
+            traps[index] = (x, y)
+            self.live_solver.set_traps(traps)
+
+    def update_hologram_preview(self):
+        if self.live_solver is not None:
+            # every edit lands here, so forward it to the solver;
+            # the preview itself follows the solver frames
+            self.live_solver.set_traps(self.state.clicked_points)
+            return
+
+        engine = self.hologram
+        if not len(engine):
+            self.preview_label.clear()
+            self.preview_label.setText("Hologram preview")
+            return
+
+        step = max(1, max(engine.nx, engine.ny) // PREVIEW_SIZE)
+        self.show_preview_phase(engine.preview(step))
+
+    # ---------------------
+    # live mode
+    # ---------------------
+
+    def set_live(self, enabled):
+        if enabled and self.live_solver is None:
+            engine = self.hologram
+            init_mask = engine.mask() if len(engine) else None
+
+            self.live_solver = AnytimeSolver(
+                engine.nx, engine.ny, precision=engine.precision,
+                oversample=self.state.oversample,
+                fast_len=self.state.fft_fast_len
+            )
+            self.live_solver.start(init_mask)
+            self.live_solver.set_traps(self.state.clicked_points)
+            self.live_version = 0
+            self.live_timer.start()
+
+        elif not enabled and self.live_solver is not None:
+            self.live_timer.stop()
+            self.live_solver.stop()
+            self.live_solver = None
+            self.update_hologram_preview()
+
+    def poll_live_solver(self):
+        version, phase = self.live_solver.latest()
+        if phase is None or version == self.live_version:
+            return
+
+        self.live_version = version
+        step = max(1, max(phase.shape) // PREVIEW_SIZE)
+        self.show_preview_phase(phase[::step, ::step])
+
+    def show_preview_phase(self, phase):
+        img8 = ((phase + np.pi) * (255 / (2 * np.pi))).astype(np.uint8)
+        h, w = img8.shape
+        qimg = QImage(img8.data, w, h, w, QImage.Format_Grayscale8)
+        self.preview_label.setPixmap(
+            QPixmap.fromImage(qimg).scaled(PREVIEW_SIZE, PREVIEW_SIZE, Qt.KeepAspectRatio)
+        )
+
     def apply_manual_points(self):
         text = self.points_edit.text().strip()
         try:
@@ -105,6 +258,8 @@ class GridPage(QWidget):
                 if isinstance(p, (list, tuple)) and len(p) == 2:
                     validated.append((int(p[0]), int(p[1])))
             self.state.clicked_points = validated
+            self.hologram.set_traps(validated)
+            self.update_hologram_preview()
             self.redraw_points()
         except:
             print("Invalid format: use [(x1,y1),(x2,y2)]")
@@ -114,35 +269,10 @@ class GridPage(QWidget):
     # ---------------------
 
     def initialize_grid(self):
+        self.sync_hologram()
         self.redraw_points()
 
     def redraw_points(self):
-        self.scene.clear()
-
-        w = self.state.cam_res_x
-        h = self.state.cam_res_y
-        self.scene.setSceneRect(0, 0, w, h)
-
-        # border
-        pen = QPen(Qt.white)
-        pen.setWidth(2)
-        self.scene.addRect(0, 0, w, h, pen)
-
-        cx, cy = w/2, h/2
-
-        # center lines
-        red = QPen(Qt.red)
-        red.setWidth(2)
-        self.scene.addLine(cx, 0, cx, h, red)
-        self.scene.addLine(0, cy, w, cy, red)
-
-        # draw stored points
-        for gx, gy in self.state.clicked_points:
-            px = cx + gx
-            py = cy - gy
-            r = 5
-            self.scene.addEllipse(px-r, py-r, 2*r, 2*r,
-                                  QPen(Qt.green), QColor(0,255,0))
-
-        self.update_point_list()
-        self.view.fitInView(self.scene.sceneRect(), Qt.KeepAspectRatio)
\ No newline at end of file
+        # markers are moved in place on the next frame, no scene rebuild
+        self.view.set_frame_size(self.state.cam_res_x, self.state.cam_res_y)
+        self.view.request_sync()
@@ -1,8 +1,13 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QFormLayout,
-    QSpinBox, QDoubleSpinBox, QPushButton, QLabel
+    QSpinBox, QDoubleSpinBox, QPushButton, QLabel, QComboBox, QCheckBox,
+    QLineEdit
 )
 
+# gs_algorithm.PRECISIONS; listed here so the first page does not
+# import numpy and the engine
+PRECISIONS = ("double", "single")
+
 
 class ParameterPage(QWidget):
     def __init__(self, state, go_next_callback):
@@ -24,6 +29,10 @@ class ParameterPage(QWidget):
         self.cam_px.setDecimals(6)
         self.cam_px.setSuffix(" µm")
 
+        self.cam_fps = QDoubleSpinBox()
+        self.cam_fps.setRange(1.0, 1000.0)
+        self.cam_fps.setSuffix(" fps")
+
         # SLM
         self.slm_x = QSpinBox()
         self.slm_x.setRange(1, 10000)
@@ -35,15 +44,48 @@ class ParameterPage(QWidget):
         self.slm_px.setDecimals(6)
         self.slm_px.setSuffix(" µm")
 
+        self.slm_wrap = QSpinBox()
+        self.slm_wrap.setRange(1, 256)
+
+        self.slm_lut = QLineEdit()
+        self.slm_lut.setPlaceholderText("linear")
+
+        self.slm_dither = QCheckBox("Dither grey levels")
+
+        self.slm_screen = QSpinBox()
+        self.slm_screen.setRange(-1, 16)
+        self.slm_screen.setSpecialValueText("last")
+
         form.addRow(QLabel("Camera Parameters"))
         form.addRow("Resolution X:", self.cam_x)
         form.addRow("Resolution Y:", self.cam_y)
         form.addRow("Pixel Size:", self.cam_px)
+        form.addRow("Frame Rate:", self.cam_fps)
 
         form.addRow(QLabel("SLM Parameters"))
         form.addRow("Resolution X:", self.slm_x)
         form.addRow("Resolution Y:", self.slm_y)
         form.addRow("Pixel Size:", self.slm_px)
+        form.addRow("2π Grey Level:", self.slm_wrap)
+        form.addRow("Calibration LUT:", self.slm_lut)
+        form.addRow("", self.slm_dither)
+        form.addRow("Output Screen:", self.slm_screen)
+
+        # Computation
+        self.precision = QComboBox()
+        self.precision.addItems(list(PRECISIONS))
+
+        self.oversample = QDoubleSpinBox()
+        self.oversample.setRange(1.0, 4.0)
+        self.oversample.setSingleStep(0.5)
+        self.oversample.setSuffix(" x")
+
+        self.fast_len = QCheckBox("Pad FFT to a fast size")
+
+        form.addRow(QLabel("Computation"))
+        form.addRow("Precision:", self.precision)
+        form.addRow("Oversampling:", self.oversample)
+        form.addRow("", self.fast_len)
 
         layout.addLayout(form)
 
@@ -65,10 +107,19 @@ class ParameterPage(QWidget):
         self.cam_x.setValue(self.state.cam_res_x)
         self.cam_y.setValue(self.state.cam_res_y)
         self.cam_px.setValue(self.state.cam_pixel_size)
+        self.cam_fps.setValue(self.state.camera_fps)
 
         self.slm_x.setValue(self.state.slm_res_x)
         self.slm_y.setValue(self.state.slm_res_y)
         self.slm_px.setValue(self.state.slm_pixel_size)
+        self.slm_wrap.setValue(self.state.slm_wrap)
+        self.slm_lut.setText(self.state.slm_lut)
+        self.slm_dither.setChecked(self.state.slm_dither)
+        self.slm_screen.setValue(self.state.slm_screen)
+
+        self.precision.setCurrentText(self.state.precision)
+        self.oversample.setValue(self.state.oversample)
+        self.fast_len.setChecked(self.state.fft_fast_len)
 
     def save_and_continue(self):
         self.update_state()
@@ -83,7 +134,16 @@ class ParameterPage(QWidget):
         self.state.cam_res_x = self.cam_x.value()
         self.state.cam_res_y = self.cam_y.value()
         self.state.cam_pixel_size = self.cam_px.value()
+        self.state.camera_fps = self.cam_fps.value()
 
         self.state.slm_res_x = self.slm_x.value()
         self.state.slm_res_y = self.slm_y.value()
-        self.state.slm_pixel_size = self.slm_px.value()
\ No newline at end of file
+        self.state.slm_pixel_size = self.slm_px.value()
+        self.state.slm_wrap = self.slm_wrap.value()
+        self.state.slm_lut = self.slm_lut.text().strip()
+        self.state.slm_dither = self.slm_dither.isChecked()
+        self.state.slm_screen = self.slm_screen.value()
+
+        self.state.precision = self.precision.currentText()
+        self.state.oversample = self.oversample.value()
+        self.state.fft_fast_len = self.fast_len.isChecked()
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Startup time measurement.
+
+    python main.py --startup-timing      (or OT_STARTUP_TIMING=1)
+
+Records how long each import and page construction takes and when
+the first window appeared, and prints the table to stderr. Import
+this module first so its clock starts with the application.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+ENABLED = "--startup-timing" in sys.argv or bool(os.environ.get("OT_STARTUP_TIMING"))
+
+_origin = time.perf_counter()
+_rows = []
+
+
+@contextmanager
+def measure(name):
+    """
+    Time the enclosed block (an import, a constructor) as `name`.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if ENABLED:
+            _rows.append((name, start - _origin, time.perf_counter() - start))
+
+
+def mark(name):
+    """
+    Record a point in time, e.g. "first window shown".
+    """
+    if ENABLED:
+        _rows.append((name, time.perf_counter() - _origin, None))
+
+
+def report(title="startup"):
+    """
+    Print the recorded rows (offset from start, duration) and forget them.
+    """
+    if not ENABLED or not _rows:
+        return
+
+    lines = [f"--- {title} ---"]
+    for name, at, duration in sorted(_rows, key=lambda row: row[1]):
+        took = "" if duration is None else f"{duration * 1000:8.1f} ms"
+        lines.append(f"{at * 1000:8.1f} ms  {name:<32} {took}")
+    print("\n".join(lines), file=sys.stderr)
+    _rows.clear()
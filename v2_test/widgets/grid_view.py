@@ -1,11 +1,26 @@
 from PySide6.QtWidgets import QGraphicsView, QGraphicsEllipseItem
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QBrush, QColor
+from PySide6.QtCore import Qt, QTimer, QLineF, QRectF
+from PySide6.QtGui import QBrush, QColor, QPen, QPainter, QPixmap
 
 from utils.coordinate_utils import to_centered_coordinates
 
+# grid line spacing from the centre, camera pixels
+GRID_SPACING = 128
+
+# edits are applied to the markers at most once per frame
+SYNC_MS = 16
+
 
 class GridView(QGraphicsView):
+    """
+    Camera frame with one marker per trap.
+
+    Border, grid and centre lines are painted by drawBackground from a
+    pixmap rendered once per view transform, so the scene only holds
+    the trap markers. Markers are kept between edits and moved in
+    place; edits request a sync, which is applied once per frame.
+    """
+
     def __init__(self, scene, grid_page):
         super().__init__(scene)
         self.grid_page = grid_page
@@ -14,6 +29,180 @@ class GridView(QGraphicsView):
         self.dragging_point = None
         self.drag_index = None
 
+        # marker items and the trap coordinates they show
+        self.markers = []
+        self.marker_points = []
+        self.marker_radius = 5
+
+        self.frame_size = None
+        self.background = None
+        self.background_key = None
+
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(SYNC_MS)
+        self.sync_timer.timeout.connect(self.sync_markers)
+
+    # ------------------------
+    # Frame size
+    # ------------------------
+    def set_frame_size(self, width, height):
+        if self.frame_size != (width, height):
+            self.frame_size = (width, height)
+            self.scene().setSceneRect(0, 0, width, height)
+
+            # marker size follows the frame size
+            self.clear_markers()
+            self.marker_radius = max(5, max(width, height) * 0.005)
+            self.background_key = None
+
+            self.fitInView(self.sceneRect(), Qt.KeepAspectRatio)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.frame_size is not None:
+            self.fitInView(self.sceneRect(), Qt.KeepAspectRatio)
+
+    # ------------------------
+    # Cached background
+    # ------------------------
+    def drawBackground(self, painter, rect):
+        if self.frame_size is None:
+            return super().drawBackground(painter, rect)
+
+        t = self.viewportTransform()
+        ratio = self.devicePixelRatioF()
+        key = (t.m11(), t.m12(), t.m21(), t.m22(), t.dx(), t.dy(),
+               self.viewport().size().toTuple(), ratio, self.frame_size)
+        if key != self.background_key:
+            self.background = self.render_background(ratio)
+            self.background_key = key
+
+        # copy only the exposed part, in viewport pixels
+        target = QRectF(self.mapFromScene(rect).boundingRect())
+        source = QRectF(target.x() * ratio, target.y() * ratio,
+                        target.width() * ratio, target.height() * ratio)
+
+        painter.save()
+        painter.resetTransform()
+        painter.drawPixmap(target, self.background, source)
+        painter.restore()
+
+    def render_background(self, ratio):
+        viewport = self.viewport()
+        pixmap = QPixmap(viewport.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(viewport.palette().color(viewport.backgroundRole()))
+
+        w, h = self.frame_size
+        cx, cy = w / 2, h / 2
+
+        painter = QPainter(pixmap)
+        painter.setTransform(self.viewportTransform())
+
+        # grid lines every GRID_SPACING from the centre
+        lines = []
+        for k in range(1, int(max(cx, cy) // GRID_SPACING) + 1):
+            d = k * GRID_SPACING
+            for x in (cx - d, cx + d):
+                if 0 <= x <= w:
+                    lines.append(QLineF(x, 0, x, h))
+            for y in (cy - d, cy + d):
+                if 0 <= y <= h:
+                    lines.append(QLineF(0, y, w, y))
+        grid = QPen(QColor(150, 150, 150, 80))
+        grid.setCosmetic(True)
+        painter.setPen(grid)
+        painter.drawLines(lines)
+
+        # border
+        pen = QPen(Qt.white)
+        pen.setWidth(2)
+        pen.setCosmetic(True)
+        painter.setPen(pen)
+        painter.drawRect(QRectF(0, 0, w, h))
+
+        # center lines
+        red = QPen(Qt.red)
+        red.setWidth(2)
+        red.setCosmetic(True)
+        painter.setPen(red)
+        painter.drawLine(QLineF(cx, 0, cx, h))
+        painter.drawLine(QLineF(0, cy, w, cy))
+
+        painter.end()
+        return pixmap
+
+    # ------------------------
+    # Trap markers
+    # ------------------------
+    def request_sync(self):
+        if not self.sync_timer.isActive():
+            self.sync_timer.start()
+
+    def sync_markers(self):
+        """
+        Bring the markers in line with state.clicked_points: moved
+        traps are moved, new ones added and surplus markers removed.
+        """
+        self.sync_timer.stop()
+        if self.frame_size is None:
+            return
+
+        points = self.grid_page.state.clicked_points
+        shown = self.marker_points
+        w, h = self.frame_size
+        cx, cy = w / 2, h / 2
+
+        # move the markers of changed traps
+        kept = min(len(points), len(shown))
+        for i in range(kept):
+            if shown[i] != points[i]:
+                gx, gy = shown[i] = points[i]
+                self.markers[i].setPos(cx + gx, cy - gy)
+
+        for i in range(kept, len(points)):
+            item = self.new_marker(i)
+            gx, gy = points[i]
+            item.setPos(cx + gx, cy - gy)
+            self.markers.append(item)
+            shown.append(points[i])
+
+        if len(self.markers) > len(points):
+            scene = self.scene()
+            for item in self.markers[len(points):]:
+                if item is self.dragging_point:
+                    self.dragging_point = None
+                    self.drag_index = None
+                scene.removeItem(item)
+            del self.markers[len(points):]
+            del shown[len(points):]
+
+        self.grid_page.update_point_list()
+
+    def new_marker(self, index):
+        r = self.marker_radius
+        point = QGraphicsEllipseItem(-r, -r, 2 * r, 2 * r)
+
+        point.setPen(QPen(Qt.green))
+        point.setBrush(QBrush(QColor(0, 255, 0)))
+        point.setZValue(10)
+
+        # store index for editing
+        point.setData(0, index)
+
+        self.scene().addItem(point)
+        return point
+
+    def clear_markers(self):
+        scene = self.scene()
+        for item in self.markers:
+            scene.removeItem(item)
+        self.markers = []
+        self.marker_points = []
+        self.dragging_point = None
+        self.drag_index = None
+
     # ------------------------
     # Hover coordinates
     # ------------------------
@@ -35,7 +224,10 @@ class GridView(QGraphicsView):
 
         # drag selected point
         if self.dragging_point is not None:
-            self.dragging_point.setPos(pos.x() - 5, pos.y() - 5)
+            self.dragging_point.setPos(pos)
+
+            if self.drag_index is not None:
+                self.grid_page.on_trap_dragged(self.drag_index, x, y)
 
         super().mouseMoveEvent(event)
 
@@ -72,8 +264,8 @@ class GridView(QGraphicsView):
 
         self.grid_page.state.clicked_points.append((x, y))
 
-        self.draw_marker_from_center(x, y)
-        self.grid_page.update_point_list()
+        self.request_sync()
+        self.grid_page.on_trap_added(x, y)
 
         super().mousePressEvent(event)
 
@@ -91,41 +283,13 @@ class GridView(QGraphicsView):
                 pos.x(), pos.y(), width, height
             )
 
-            # update stored coordinate
+            # update stored coordinate; the sync snaps the marker to it
             self.grid_page.state.clicked_points[self.drag_index] = (x, y)
-            self.grid_page.update_point_list()
+            self.marker_points[self.drag_index] = None
+            self.request_sync()
+            self.grid_page.on_trap_moved(self.drag_index, x, y)
 
             self.dragging_point = None
             self.drag_index = None
 
         super().mouseReleaseEvent(event)
-
-    # ------------------------
-    # Draw marker from centered coords
-    # ------------------------
-    def draw_marker_from_center(self, x, y):
-        width = self.grid_page.state.cam_res_x
-        height = self.grid_page.state.cam_res_y
-
-        cx = width / 2
-        cy = height / 2
-
-        scene_x = cx + x
-        scene_y = cy - y
-
-        radius = max(width, height) * 0.005
-
-        point = QGraphicsEllipseItem(
-            scene_x - radius,
-            scene_y - radius,
-            radius * 2,
-            radius * 2
-        )
-
-        point.setBrush(QBrush(QColor(0, 255, 0)))
-        point.setZValue(10)
-
-        # store index for editing
-        point.setData(0, len(self.grid_page.state.clicked_points) - 1)
-
-        self.scene().addItem(point)
\ No newline at end of file
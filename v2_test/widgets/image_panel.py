@@ -0,0 +1,194 @@
+from collections import OrderedDict
+
+import numpy as np
+from PySide6.QtWidgets import QLabel, QSizePolicy
+from PySide6.QtCore import Qt, QPointF, QSize, QTimer
+from PySide6.QtGui import QColor, QImage, QPainter, QPen, QPixmap
+
+# smooth rescale once resizing has been quiet this long
+RESIZE_SETTLE_MS = 150
+
+# scaled pixmaps kept per image (panel sizes seen recently)
+CACHED_SIZES = 4
+
+# tracked-particle markers drawn over live frames
+MARKER_RADIUS = 6
+MARKER_COLOR = QColor(0, 220, 90)
+
+
+def to_uint8(img):
+    """
+    [0, 1] intensity image → uint8 (values outside are clipped).
+    """
+    return (np.clip(img, 0, 1) * 255).astype(np.uint8)
+
+
+def _half(a):
+    # 2x2 box filter on uint8 (odd last row / column dropped)
+    h = a.shape[0] // 2 * 2
+    w = a.shape[1] // 2 * 2
+    s = a[0:h:2, 0:w:2].astype(np.uint16)
+    s += a[1:h:2, 0:w:2]
+    s += a[0:h:2, 1:w:2]
+    s += a[1:h:2, 1:w:2]
+    s += 2
+    s >>= 2
+    return s.astype(np.uint8)
+
+
+class ImagePyramid:
+    """
+    Downsampled copies of one uint8 image, halving per level, built
+    only as far down as requested sizes need; plus a small cache of
+    pixmaps smoothly scaled to exact panel sizes.
+    """
+
+    def __init__(self, img8):
+        # own copy: img8 may be a reused output buffer
+        self.levels = [np.array(img8, dtype=np.uint8)]
+        self._level_pixmaps = {}
+        self._scaled = OrderedDict()
+
+    def level(self, width, height):
+        """
+        Index of the smallest level still at least width x height.
+        """
+        i = 0
+        while True:
+            if i + 1 == len(self.levels):
+                h, w = self.levels[i].shape
+                if w // 2 < width or h // 2 < height or min(w, h) < 2:
+                    return i
+                self.levels.append(_half(self.levels[i]))
+
+            h, w = self.levels[i + 1].shape
+            if w < width or h < height:
+                return i
+            i += 1
+
+    def level_pixmap(self, i):
+        pixmap = self._level_pixmaps.get(i)
+        if pixmap is None:
+            a = self.levels[i]
+            h, w = a.shape
+            qimg = QImage(a.data, w, h, w, QImage.Format_Grayscale8)
+            # fromImage copies, a may be reused afterwards
+            pixmap = self._level_pixmaps[i] = QPixmap.fromImage(qimg)
+        return pixmap
+
+    def pixmap(self, size, smooth=True):
+        """
+        Pixmap fitting `size` (aspect ratio kept). Smooth results are
+        cached per size; fast ones are for use while resizing.
+        """
+        key = (size.width(), size.height())
+        pixmap = self._scaled.get(key)
+        if pixmap is not None:
+            self._scaled.move_to_end(key)
+            return pixmap
+
+        h, w = self.levels[0].shape
+        scale = min(size.width() / w, size.height() / h)
+        source = self.level_pixmap(self.level(int(w * scale), int(h * scale)))
+
+        mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        pixmap = source.scaled(size, Qt.KeepAspectRatio, mode)
+
+        if smooth:
+            self._scaled[key] = pixmap
+            if len(self._scaled) > CACHED_SIZES:
+                self._scaled.popitem(last=False)
+        return pixmap
+
+
+class ImagePanel(QLabel):
+    """
+    Label showing an ImagePyramid scaled to its own size.
+
+    Resize storms get a fast rescale per event; the smooth one runs
+    once the size has settled for RESIZE_SETTLE_MS.
+    """
+
+    def __init__(self, text="", preferred=420):
+        super().__init__(text)
+        self.preferred = preferred
+        self.pyramid = None
+
+        self.setAlignment(Qt.AlignCenter)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+        self._settle = QTimer(self)
+        self._settle.setSingleShot(True)
+        self._settle.setInterval(RESIZE_SETTLE_MS)
+        self._settle.timeout.connect(lambda: self.refresh(smooth=True))
+
+    def sizeHint(self):
+        # not the pixmap size, so a large image does not grow the layout
+        return QSize(self.preferred, self.preferred)
+
+    def minimumSizeHint(self):
+        return QSize(64, 64)
+
+    def setText(self, text):
+        self.pyramid = None
+        super().setText(text)
+
+    def clear(self):
+        self.pyramid = None
+        super().clear()
+
+    def set_image(self, img8):
+        """
+        Show a uint8 image; returns its pyramid for reuse.
+        """
+        pyramid = ImagePyramid(img8)
+        self.set_pyramid(pyramid)
+        return pyramid
+
+    def show_frame(self, frame, markers=None):
+        """
+        Live uint8 frame (e.g. a camera ring slot): scaled straight
+        from the caller's buffer, which is not kept. markers: (N, 2)
+        frame positions (column, row; pixel c spans [c, c + 1)) to
+        circle; NaN rows are skipped.
+        """
+        self.pyramid = None
+        self._settle.stop()
+        size = self.contentsRect().size()
+        if size.width() < 1 or size.height() < 1:
+            return
+        h, w = frame.shape
+        qimg = QImage(frame.data, w, h, frame.strides[0], QImage.Format_Grayscale8)
+        pixmap = QPixmap.fromImage(qimg.scaled(size, Qt.KeepAspectRatio))
+
+        if markers is not None and len(markers):
+            scale = pixmap.width() / w
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(QPen(MARKER_COLOR, 1.5))
+            for x, y in markers[np.isfinite(markers).all(axis=1)]:
+                center = QPointF(x * scale, y * scale)
+                painter.drawEllipse(center, MARKER_RADIUS, MARKER_RADIUS)
+            painter.end()
+
+        self.setPixmap(pixmap)
+
+    def set_pyramid(self, pyramid):
+        self.pyramid = pyramid
+        self._settle.stop()
+        self.refresh(smooth=True)
+
+    def refresh(self, smooth=True):
+        if self.pyramid is None:
+            return
+        size = self.contentsRect().size()
+        if size.width() < 1 or size.height() < 1:
+            return
+        self.setPixmap(self.pyramid.pixmap(size, smooth))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.pyramid is None:
+            return
+        self.refresh(smooth=False)
+        self._settle.start()
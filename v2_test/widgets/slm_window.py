@@ -0,0 +1,223 @@
+import time
+from collections import deque
+
+import numpy as np
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import (
+    QColor, QGuiApplication, QImage, QOpenGLContext, QPainter, QSurfaceFormat
+)
+
+# presentation intervals kept for the timing statistics
+TIMING_WINDOW = 240
+
+
+_opengl = None
+
+
+def opengl_available():
+    """
+    True if an OpenGL context can be created (not on the offscreen
+    platform or headless machines without a GL driver).
+    """
+    global _opengl
+    if _opengl is None:
+        context = QOpenGLContext()
+        _opengl = bool(context.create())
+    return _opengl
+
+
+class FrameStats:
+    """
+    Presentation timing of an output window.
+
+    dropped: frames replaced by a newer one before they were shown.
+    late: frames shown more than one refresh period after submission.
+    """
+
+    def __init__(self, refresh_hz=60.0):
+        self.refresh_hz = refresh_hz
+        self.submitted = 0
+        self.presented = 0
+        self.dropped = 0
+        self.late = 0
+        self._intervals = deque(maxlen=TIMING_WINDOW)
+        self._latencies = deque(maxlen=TIMING_WINDOW)
+        self._last = None
+
+    def submit(self, replaced):
+        self.submitted += 1
+        self.dropped += replaced
+
+    def present(self, now, latency):
+        self.presented += 1
+        if self._last is not None:
+            self._intervals.append(now - self._last)
+        self._last = now
+
+        self._latencies.append(latency)
+        # half a period of slack for timer and compositor jitter
+        if latency > 1.5 / self.refresh_hz:
+            self.late += 1
+
+    def summary(self):
+        """
+        {fps, interval_ms, interval_p95_ms, latency_ms, presented,
+        dropped, late} over the last TIMING_WINDOW frames.
+        """
+        intervals = np.asarray(self._intervals) * 1000
+        latencies = np.asarray(self._latencies) * 1000
+        mean = float(intervals.mean()) if intervals.size else 0.0
+        return {
+            "fps": 1000 / mean if mean else 0.0,
+            "interval_ms": mean,
+            "interval_p95_ms": float(np.percentile(intervals, 95)) if intervals.size else 0.0,
+            "latency_ms": float(latencies.mean()) if latencies.size else 0.0,
+            "presented": self.presented,
+            "dropped": self.dropped,
+            "late": self.late,
+        }
+
+    def format(self):
+        s = self.summary()
+        return (
+            f"SLM {s['fps']:.1f} Hz  frame {s['interval_ms']:.1f} ms "
+            f"(p95 {s['interval_p95_ms']:.1f})  latency {s['latency_ms']:.1f} ms  "
+            f"{s['presented']} shown, {s['dropped']} dropped, {s['late']} late"
+        )
+
+
+# ---------------------
+# frame views
+# ---------------------
+
+class _RasterView(QWidget):
+    # QPainter on the backing store; double buffered by Qt
+    def __init__(self, owner):
+        super().__init__()
+        self.owner = owner
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.owner.paint(painter)
+        painter.end()
+        self.owner.frame_shown()
+
+
+def _gl_view(owner):
+    # imported here so the raster path works without QtOpenGLWidgets
+    from PySide6.QtOpenGLWidgets import QOpenGLWidget
+
+    class GLView(QOpenGLWidget):
+        # frames go up as a texture (QPainter's GL engine) into the
+        # widget's framebuffer, swapped on vsync
+        def __init__(self):
+            super().__init__()
+            fmt = QSurfaceFormat.defaultFormat()
+            fmt.setSwapBehavior(QSurfaceFormat.DoubleBuffer)
+            fmt.setSwapInterval(1)
+            self.setFormat(fmt)
+            self.setUpdateBehavior(QOpenGLWidget.NoPartialUpdate)
+            self.frameSwapped.connect(owner.frame_shown)
+
+        def paintGL(self):
+            painter = QPainter(self)
+            owner.paint(painter)
+            painter.end()
+
+    return GLView()
+
+
+# ---------------------
+# window
+# ---------------------
+
+class SLMWindow(QWidget):
+    """
+    Frameless full-screen window on the SLM's screen showing uint8
+    phase frames pixel for pixel.
+
+    present(frame) hands over the newest frame (an SLMOutput buffer,
+    which must stay untouched until the next present); only the latest
+    one is drawn at the next repaint, earlier undrawn ones count as
+    dropped. Esc closes the window.
+    """
+
+    closed = Signal()
+
+    def __init__(self, screen=-1, refresh_hz=None, use_opengl=None):
+        super().__init__(None, Qt.Window | Qt.FramelessWindowHint)
+        self.setWindowTitle("SLM")
+        self.setCursor(Qt.BlankCursor)
+
+        screens = QGuiApplication.screens()
+        self.target_screen = screens[screen if -len(screens) <= screen < len(screens) else -1]
+
+        if refresh_hz is None:
+            refresh_hz = self.target_screen.refreshRate() or 60.0
+        self.stats = FrameStats(refresh_hz)
+
+        if use_opengl is None:
+            use_opengl = opengl_available()
+        self.uses_opengl = use_opengl
+        self.view = _gl_view(self) if use_opengl else _RasterView(self)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.view)
+        self.setLayout(layout)
+
+        self.frame = None
+        self._submitted_at = None
+
+    def open(self):
+        """
+        Show full screen on the target screen at its native geometry.
+        """
+        self.setScreen(self.target_screen)
+        self.setGeometry(self.target_screen.geometry())
+        self.showFullScreen()
+
+    def present(self, frame):
+        """
+        Show `frame` (uint8, SLM sized) at the next refresh.
+        """
+        replaced = self._submitted_at is not None
+        self.stats.submit(replaced)
+
+        self.frame = frame
+        self._submitted_at = time.perf_counter()
+        self.view.update()
+
+    def paint(self, painter):
+        painter.fillRect(self.view.rect(), QColor(0, 0, 0))
+        frame = self.frame
+        if frame is None:
+            return
+
+        h, w = frame.shape
+        qimg = QImage(frame.data, w, h, w, QImage.Format_Grayscale8)
+        # one frame pixel per device pixel, centered
+        ratio = self.view.devicePixelRatioF()
+        qimg.setDevicePixelRatio(ratio)
+        x = (self.view.width() - w / ratio) / 2
+        y = (self.view.height() - h / ratio) / 2
+        painter.drawImage(int(x), int(y), qimg)
+
+    def frame_shown(self):
+        if self._submitted_at is None:
+            return
+        now = time.perf_counter()
+        self.stats.present(now, now - self._submitted_at)
+        self._submitted_at = None
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.close()
+        else:
+            super().keyPressEvent(event)
+
+    def closeEvent(self, event):
+        super().closeEvent(event)
+        self.closed.emit()
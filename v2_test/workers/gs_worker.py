@@ -0,0 +1,86 @@
+import time
+
+from PySide6.QtCore import QObject, QThread, Signal, Slot
+
+
+class HologramWorker(QObject):
+    """
+    Runs a hologram job off the GUI thread.
+
+    job(callback) must call callback(done, total) as it iterates and
+    stop early when the callback returns False (GSEngine.run does).
+    Progress is emitted at most every min_interval seconds.
+    """
+
+    progress = Signal(int, float)       # percent, eta seconds
+    finished = Signal(object)           # job result
+    cancelled = Signal()
+    failed = Signal(str)
+
+    def __init__(self, job, min_interval=0.1):
+        super().__init__()
+        self.job = job
+        self.min_interval = min_interval
+        self._cancel = False
+
+        self._start = 0.0
+        self._last_emit = 0.0
+
+    def cancel(self):
+        # plain bool write, read by the worker thread between iterations
+        self._cancel = True
+
+    def is_cancelled(self):
+        return self._cancel
+
+    @Slot()
+    def run(self):
+        self._start = time.perf_counter()
+        self._last_emit = 0.0
+
+        try:
+            result = self.job(self._on_iteration)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+
+        if self._cancel:
+            self.cancelled.emit()
+        else:
+            self.progress.emit(100, 0.0)
+            self.finished.emit(result)
+
+    def _on_iteration(self, done, total):
+        if self._cancel:
+            return False
+
+        now = time.perf_counter()
+        if done < total and now - self._last_emit < self.min_interval:
+            return True
+
+        self._last_emit = now
+        elapsed = now - self._start
+        eta = elapsed / done * (total - done)
+        self.progress.emit(int(done / total * 100), eta)
+        return True
+
+
+def start_worker(worker, parent=None):
+    """
+    Move worker to a new QThread and start it.
+
+    The thread quits and both objects are deleted once the worker
+    reports finished, cancelled or failed. Returns the thread.
+    """
+    thread = QThread(parent)
+    worker.moveToThread(thread)
+
+    thread.started.connect(worker.run)
+    for signal in (worker.finished, worker.cancelled, worker.failed):
+        signal.connect(thread.quit)
+
+    thread.finished.connect(worker.deleteLater)
+    thread.finished.connect(thread.deleteLater)
+
+    thread.start()
+    return thread